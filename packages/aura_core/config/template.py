@@ -4,8 +4,18 @@
 `TemplateRenderer` 负责解析和渲染在任务定义（YAML 文件）中使用的
 Jinja2 模板字符串。它能够递归地处理字符串、字典和列表中的模板，
 并将它们替换为从多层上下文中获取的实际数据。
+
+所有渲染器共享同一个进程级 `NativeEnvironment`，并通过一个按模板源字符串
+索引的 LRU 缓存复用已编译的模板，避免每次渲染都重新解析和编译 Jinja2。
+
+`state` 在作用域中是 `StateReadView` 只读视图；共享环境保证它在模板里的
+表现与普通 dict 一致：整体渲染时得到 dict、`tojson` 可直接序列化、下划线
+属性按键查找而不会暴露视图内部。
 """
-from typing import Any, Dict, Optional, TYPE_CHECKING
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, TYPE_CHECKING
 
 try:
     from jinja2 import BaseLoader, UndefinedError
@@ -18,12 +28,129 @@ except ImportError:
     NativeEnvironment = None  # type: ignore
 
 from ..context import ExecutionContext
+from ..context.persistence.store_service import StateReadView
+from .loader import get_config_value
 from packages.aura_core.observability.logging.core_logger import logger
 
 if TYPE_CHECKING:
     from packages.aura_core.context.persistence.store_service import StateStoreService
 
 
+class CompiledTemplateCache:
+    """线程安全的已编译模板 LRU 缓存，以模板源字符串为键。"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = max(0, int(maxsize))
+        self._templates: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compile(self, env: Any, source: str) -> Any:
+        """返回 `source` 对应的已编译模板，未命中时编译并放入缓存。
+
+        编译失败时异常会直接抛出，且不会写入缓存。
+        """
+        with self._lock:
+            template = self._templates.get(source)
+            if template is not None:
+                self._templates.move_to_end(source)
+                self.hits += 1
+                return template
+            self.misses += 1
+
+        template = env.from_string(source)
+        if self.maxsize <= 0:
+            return template
+
+        with self._lock:
+            self._templates[source] = template
+            self._templates.move_to_end(source)
+            while len(self._templates) > self.maxsize:
+                self._templates.popitem(last=False)
+        return template
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._templates),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+
+def _json_default(obj: Any) -> Any:
+    """(私有) 让 `tojson` 把只读视图等 Mapping 当作 dict 序列化。"""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_dumps(obj: Any, **kwargs: Any) -> str:
+    kwargs.setdefault("default", _json_default)
+    return json.dumps(obj, **kwargs)
+
+
+if JINJA2_AVAILABLE:
+    class _RenderEnvironment(NativeEnvironment):
+        """(私有) 共享渲染环境：`StateReadView` 的下划线名称只按键查找。"""
+
+        def _view_item(self, obj: StateReadView, name: str) -> Any:
+            try:
+                return obj[name]
+            except KeyError:
+                return self.undefined(obj=obj, name=name)
+
+        def getattr(self, obj: Any, attribute: str) -> Any:
+            if isinstance(obj, StateReadView) and attribute.startswith("_"):
+                return self._view_item(obj, attribute)
+            return super().getattr(obj, attribute)
+
+        def getitem(self, obj: Any, argument: Any) -> Any:
+            if isinstance(obj, StateReadView) and isinstance(argument, str) and argument.startswith("_"):
+                return self._view_item(obj, argument)
+            return super().getitem(obj, argument)
+else:
+    _RenderEnvironment = None  # type: ignore
+
+
+_shared_env: Optional[Any] = None
+_shared_cache: Optional[CompiledTemplateCache] = None
+_shared_lock = threading.Lock()
+
+
+def _get_shared_env() -> Any:
+    """(私有) 懒加载进程级共享的 `NativeEnvironment`。"""
+    global _shared_env
+    if _shared_env is None:
+        with _shared_lock:
+            if _shared_env is None:
+                env = _RenderEnvironment(loader=BaseLoader(), enable_async=True)
+                env.policies["json.dumps_function"] = _json_dumps
+                _shared_env = env
+    return _shared_env
+
+
+def get_template_cache() -> CompiledTemplateCache:
+    """返回进程级共享的已编译模板缓存。"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                maxsize = int(get_config_value("template.cache_maxsize", 1024))
+                _shared_cache = CompiledTemplateCache(maxsize=maxsize)
+    return _shared_cache
+
+
 class TemplateRenderer:
     """负责使用多层上下文模型异步渲染 Jinja2 模板。
 
@@ -40,14 +167,20 @@ class TemplateRenderer:
         """
         self.execution_context = execution_context
         self.state_store = state_store
-        self.jinja_env = NativeEnvironment(loader=BaseLoader(), enable_async=True)
+        self.jinja_env = _get_shared_env()
+        self.template_cache = get_template_cache()
+
+    @staticmethod
+    def get_cache_stats() -> Dict[str, Any]:
+        """返回共享模板缓存的命中/未命中统计。"""
+        return get_template_cache().stats()
 
     async def get_render_scope(self) -> Dict[str, Any]:
         """构建并返回用于 Jinja2 渲染的完整数据作用域。
 
         作用域按以下层次结构组织，模板中可以通过 `state.`, `initial.` 等
         方式访问：
-        - `state`: 来自 `StateStoreService` 的持久化数据。
+        - `state`: 来自 `StateStoreService` 的持久化数据（只读视图，按需读取，不复制）。
         - `initial`: 任务启动时的初始数据。
         - `inputs`: 传递给当前任务的输入参数。
         - `loop`: 当前循环迭代的变量（如 `item`, `index`）。
@@ -56,11 +189,11 @@ class TemplateRenderer:
         Returns:
             一个包含了所有可用上下文数据的字典。
         """
-        state_data = {}
+        state_data: Mapping[str, Any] = {}
         if self.state_store:
             if not getattr(self.state_store, '_initialized', False):
                 await self.state_store.initialize()
-            state_data = await self.state_store.get_all_data()
+            state_data = await self.state_store.get_read_view()
 
         exec_data = self.execution_context.data
 
@@ -102,8 +235,10 @@ class TemplateRenderer:
             if "{{" not in value and "{%" not in value:
                 return value
             try:
-                template = self.jinja_env.from_string(value)
-                return await template.render_async(scope)
+                template = self.template_cache.get_or_compile(self.jinja_env, value)
+                rendered = await template.render_async(scope)
+                # `{{ state }}` 整体作为值时交出普通 dict，而不是绑定存储的视图对象。
+                return dict(rendered) if isinstance(rendered, StateReadView) else rendered
             except UndefinedError as e:
                 logger.warning(f"渲染模板 '{value}' 时出错: 变量或属性未定义 - {e.message}。返回 None。")
                 return None
@@ -7,7 +7,6 @@
 """
 
 from __future__ import annotations
-import copy
 from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -18,9 +17,15 @@ class ExecutionContext:
     """管理单次任务执行期间的数据流。
 
     这个类维护着一个任务在执行过程中所有的数据。它被组织成不同的作用域，
-    以区分不同来源和用途的数据。它支持深度拷贝（`fork`）以用于并行执行，
+    以区分不同来源和用途的数据。它支持写时复制的派生（`fork`）以用于并行执行，
     以及将多个分支的结果合并（`merge`）回主线。
 
+    `fork` 不再深拷贝整个数据树：分支之间共享 `initial`、`inputs`、`loop`
+    以及各节点输出的值对象，只复制会被写入的结构（顶层作用域字典、`nodes`
+    映射及其中每个节点条目）。因此写入必须发生在这些层级上（例如
+    `add_node_result`、`set_loop_variables` 或替换 `nodes[id][key]`），
+    而不应原地修改共享的嵌套值。
+
     Attributes:
         data (Dict[str, Any]): 存储所有上下文数据的字典，包含以下几个顶级键：
             - `initial`: 任务启动时由触发器等传入的初始数据。
@@ -58,20 +63,33 @@ class ExecutionContext:
         self.plan_context = plan_context
 
     def fork(self) -> 'ExecutionContext':
-        """为并行分支创建一个当前上下文的深度拷贝副本。
+        """为并行分支创建一个当前上下文的写时复制副本。
 
-        当任务执行图遇到并行分支时，每个分支都需要一个独立的上下文副本，
-        以避免分支间的状态污染。`fork` 方法通过深度拷贝 `self.data` 来
-        实现这一点。
+        当任务执行图遇到并行分支或循环迭代时，每个分支都需要一个独立的
+        上下文，以避免分支间的状态污染。与深拷贝不同，副本只复制分支会写入
+        的结构，其余数据（包括体积较大的节点输出）在父子上下文之间共享。
 
         Returns:
-            一个新的 `ExecutionContext` 实例，其内容与当前实例完全相同但相互独立。
+            一个新的 `ExecutionContext` 实例，其内容与当前实例相同，
+            且对其 `nodes`/`loop` 等作用域的写入不会影响当前实例。
         """
         forked_context = ExecutionContext()
-        forked_context.data = copy.deepcopy(self.data)
+        forked_context.data = self._fork_data(self.data)
         forked_context.plan_context = self.plan_context  # ✅ NEW: Preserve reference
         return forked_context
 
+    @staticmethod
+    def _fork_data(data: Dict[str, Any]) -> Dict[str, Any]:
+        """(私有) 复制可写的上层结构，共享所有叶子值。"""
+        forked = dict(data)
+        nodes = data.get("nodes")
+        if isinstance(nodes, dict):
+            forked["nodes"] = {
+                node_id: dict(entry) if isinstance(entry, dict) else entry
+                for node_id, entry in nodes.items()
+            }
+        return forked
+
     def merge(self, other_contexts: List['ExecutionContext']):
         """将来自多个父分支的上下文合并到当前上下文中。
 
@@ -4,11 +4,13 @@
 此模块提供数据持久化策略和状态存储功能。
 
 核心组件:
-- IPersistenceStrategy: 持久化策略接口（文件/StateStore/无）
+- IPersistenceStrategy: 持久化策略接口（文件/SQLite/无）
+- AppendOnlyStateLog: StateStoreService 使用的追加写日志引擎（组提交 + 后台压缩）
 - StateStoreService: 状态存储服务，全局键值存储（需直接导入避免循环依赖）
 """
 
 from .strategy import IPersistenceStrategy, StateStorePersistence, DatabasePersistence, NoPersistence
+from .wal import AppendOnlyStateLog
 # StateStoreService 需要直接导入以避免循环依赖:
 # from packages.aura_core.context.persistence.store_service import StateStoreService
 
@@ -17,4 +19,5 @@ __all__ = [
     'StateStorePersistence',
     'DatabasePersistence',
     'NoPersistence',
+    'AppendOnlyStateLog',
 ]
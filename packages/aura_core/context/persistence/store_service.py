@@ -3,17 +3,90 @@
 
 该模块定义了 `StateStoreService`，这是一个核心服务，负责处理需要
 在 Aura 框架重启后依然保持的数据。它将数据以 JSON 格式存储在
-文件中，并提供了一套异步、线程安全的接口来访问这些数据。
+文件中，并提供了一套异步、线程安全的接口来访问这些数据。默认通过
+追加写日志（见 `wal.py`）持久化单次变更，而不是每次重写整个文件。
+
+模板渲染等只读场景通过 `get_read_view()` 获取按版本号缓存的只读视图，
+无需复制整个状态字典。
 """
 import asyncio
 import json
 import os
-from typing import Any, Dict
+import weakref
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
 
 from ...api import requires_services, service_info
 from ...config.service import ConfigService
 from packages.aura_core.observability.logging.core_logger import logger
 from packages.aura_core.observability.events import Event, EventBus
+from .wal import AppendOnlyStateLog
+
+_MISSING = object()
+
+
+class StateReadView(Mapping):
+    """`StateStoreService` 在某个版本上的只读视图，不复制任何数据。
+
+    读取时直接按键查询存储；之后发生的写入会先把被覆盖的旧值记录到当时
+    最新的视图中（每个键只记第一次），新旧视图按创建顺序串成链。旧视图
+    查询某个键时沿链找到的第一个旧值就是它创建时的值，找不到则说明该键
+    此后未被修改，直接读取存储。因此视图始终是创建时刻的一致快照，而只有
+    被覆盖的键才会额外保存一份引用。
+
+    与 `get_all_data()` 的浅拷贝一样，值对象本身与存储共享，不应原地修改。
+    """
+
+    __slots__ = ("_store", "_version", "_preimages", "_next", "__weakref__")
+
+    def __init__(self, store: "StateStoreService", version: int):
+        self._store = store
+        self._version = version
+        self._preimages: Dict[str, Any] = {}
+        self._next: Optional["StateReadView"] = None
+
+    def _lookup(self, key: Any) -> Any:
+        view = self
+        while view is not None:
+            if key in view._preimages:
+                return view._preimages[key]
+            view = view._next
+        return self._store._data.get(key, _MISSING)
+
+    def _keys(self) -> List[str]:
+        overrides: Dict[str, Any] = {}
+        view = self
+        while view is not None:
+            for key, value in view._preimages.items():
+                overrides.setdefault(key, value)
+            view = view._next
+        keys = [key for key in self._store._data if key not in overrides]
+        keys.extend(key for key, value in overrides.items() if value is not _MISSING)
+        return keys
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self._lookup(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def __contains__(self, key: Any) -> bool:
+        return self._lookup(key) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        if self._version == self._store._version:
+            return len(self._store._data)
+        return len(self._keys())
+
+    def __repr__(self) -> str:
+        return f"StateReadView(version={self._version}, keys={len(self)})"
 
 
 @service_info(alias="state_store", public=True)
@@ -25,6 +98,10 @@ class StateStoreService:
     等方法来操作持久化数据。所有文件 I/O 操作都是异步的，并通过一个
     内部锁来确保线程安全。服务采用延迟初始化模式，只在首次被访问时
     才会真正加载文件。
+
+    `state_store.wal.enabled`（默认开启）时，变更以紧凑记录追加到
+    `<path>.wal`，并发写入合并提交，日志定期在后台压缩回 `<path>` 快照；
+    关闭时退回到每次变更重写整个 JSON 文件。
     """
 
     def __init__(self, config: ConfigService):
@@ -39,6 +116,9 @@ class StateStoreService:
         self._lock = asyncio.Lock()
         self._initialized = False
         self._event_bus = None
+        self._wal: Optional[AppendOnlyStateLog] = None
+        self._version = 0
+        self._view_ref: Optional["weakref.ReferenceType[StateReadView]"] = None
 
     def set_event_bus(self, event_bus):
         """手动注入事件总线实例。"""
@@ -66,7 +146,17 @@ class StateStoreService:
             path = store_config.get('path', './project_state.json')
             self._filepath = os.path.abspath(path)
 
+            wal_config = store_config.get('wal', {}) or {}
+            if wal_config.get('enabled', True):
+                self._wal = AppendOnlyStateLog(
+                    self._filepath,
+                    fsync=bool(wal_config.get('fsync', False)),
+                    compact_threshold=int(wal_config.get('compact_threshold', 1000)),
+                )
+                self._wal.bind_snapshot(lambda: self._data)
+
             await self._load()
+            self._version += 1
             self._initialized = True
             logger.info(f"StateStoreService已初始化，状态文件: {self._filepath}")
 
@@ -76,6 +166,13 @@ class StateStoreService:
             return
 
         loop = asyncio.get_running_loop()
+        if self._wal is not None:
+            try:
+                self._data = await loop.run_in_executor(None, self._wal.recover)
+            except Exception as e:
+                logger.error(f"恢复状态日志'{self._wal.log_path}'失败: {e}。将使用空状态。", exc_info=True)
+                self._data = {}
+            return
         try:
             if os.path.exists(self._filepath):
                 def _read():
@@ -107,6 +204,16 @@ class StateStoreService:
         except Exception as e:
             logger.error(f"保存状态文件'{self._filepath}'失败: {e}", exc_info=True)
 
+    async def _append(self, key: str, value: Any = None, deleted: bool = False):
+        """(私有) 把单次变更追加到日志；与 `_save` 一样，失败只记录错误。"""
+        try:
+            if deleted:
+                await self._wal.append_delete(key)
+            else:
+                await self._wal.append_set(key, value)
+        except Exception as e:
+            logger.error(f"写入状态日志'{self._wal.log_path}'失败 (key='{key}'): {e}", exc_info=True)
+
     async def get(self, key: str, default: Any = None) -> Any:
         """从状态存储中异步获取一个值。
 
@@ -128,10 +235,18 @@ class StateStoreService:
             value (Any): 要设置的值。
         """
         if not self._initialized: await self.initialize()
-        async with self._lock:
+        if self._wal is not None:
+            # 内存更新与入队之间没有 await，日志顺序与内存中的变更顺序一致。
             old_value = self._data.get(key)
+            self._before_write(key)
             self._data[key] = value
-            await self._save()
+            await self._append(key, value)
+        else:
+            async with self._lock:
+                old_value = self._data.get(key)
+                self._before_write(key)
+                self._data[key] = value
+                await self._save()
 
         if self._event_bus:
             await self._event_bus.publish(Event(
@@ -146,17 +261,25 @@ class StateStoreService:
             key (str): 要删除的键。
         """
         if not self._initialized: await self.initialize()
-        async with self._lock:
-            if key in self._data:
-                old_value = self._data[key]
-                del self._data[key]
+        if self._wal is not None:
+            if key not in self._data:
+                return
+            self._before_write(key)
+            old_value = self._data.pop(key)
+            await self._append(key, deleted=True)
+        else:
+            async with self._lock:
+                if key not in self._data:
+                    return
+                self._before_write(key)
+                old_value = self._data.pop(key)
                 await self._save()
 
-                if self._event_bus:
-                    await self._event_bus.publish(Event(
-                        name="state.changed",
-                        payload={"key": key, "old_value": old_value, "new_value": None, "deleted": True}
-                    ))
+        if self._event_bus:
+            await self._event_bus.publish(Event(
+                name="state.changed",
+                payload={"key": key, "old_value": old_value, "new_value": None, "deleted": True}
+            ))
 
     async def get_all_data(self) -> Dict[str, Any]:
         """异步获取所有状态数据的副本。
@@ -166,3 +289,42 @@ class StateStoreService:
         """
         if not self._initialized: await self.initialize()
         return self._data.copy()
+
+    async def get_read_view(self) -> StateReadView:
+        """异步获取当前版本的只读视图（见 `StateReadView`）。
+
+        状态未变化时重复调用返回同一个视图对象；任何写入都会使版本号加一，
+        下次调用时才创建新视图，旧视图仍保持其创建时刻的内容。
+        """
+        if not self._initialized: await self.initialize()
+        view = self._view_ref() if self._view_ref is not None else None
+        if view is not None and view._version == self._version:
+            return view
+        new_view = StateReadView(self, self._version)
+        if view is not None:
+            view._next = new_view
+        self._view_ref = weakref.ref(new_view)
+        return new_view
+
+    def get_version(self) -> int:
+        """返回状态版本号，每次 set/delete 后递增。"""
+        return self._version
+
+    def _before_write(self, key: str):
+        """(私有) 修改 `key` 之前调用：为仍存活的最新视图保存旧值并递增版本号。"""
+        view = self._view_ref() if self._view_ref is not None else None
+        if view is not None and key not in view._preimages:
+            view._preimages[key] = self._data.get(key, _MISSING)
+        self._version += 1
+
+    async def compact(self):
+        """立即把追加写日志压缩为快照（未启用日志时为空操作）。"""
+        if not self._initialized: await self.initialize()
+        if self._wal is not None:
+            await self._wal.compact()
+
+    def get_persistence_stats(self) -> Dict[str, Any]:
+        """返回持久化统计：日志记录数、提交次数、平均每次提交合并的写入数、压缩次数。"""
+        if self._wal is None:
+            return {"mode": "file" if self._filepath else "disabled"}
+        return {"mode": "wal", **self._wal.stats()}
@@ -6,8 +6,12 @@ for different persistence backends (in-memory, file-based, database, etc.).
 """
 import asyncio
 import json
+import os
+import sqlite3
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 
 from packages.aura_core.observability.logging.core_logger import logger
@@ -61,6 +65,24 @@ class IPersistenceStrategy(ABC):
         """
         pass
 
+    async def get(self, plan_name: str, key: str, default: Any = None) -> Any:
+        """Read a single persisted key.
+
+        The default implementation loads the whole plan state; backends that
+        can look keys up individually should override it.
+        """
+        return (await self.load(plan_name)).get(key, default)
+
+    async def set(self, plan_name: str, key: str, value: Any) -> None:
+        """Persist a single key.
+
+        The default implementation rewrites the whole plan state; backends
+        that support per-key writes should override it.
+        """
+        state = await self.load(plan_name)
+        state[key] = value
+        await self.save(plan_name, state)
+
 
 class NoPersistence(IPersistenceStrategy):
     """In-memory only persistence (no actual persistence).
@@ -79,6 +101,11 @@ class NoPersistence(IPersistenceStrategy):
         logger.trace(f"NoPersistence.save('{plan_name}'): no-op")
         pass
 
+    async def set(self, plan_name: str, key: str, value: Any) -> None:
+        """No-op - state is not persisted."""
+        logger.trace(f"NoPersistence.set('{plan_name}', '{key}'): no-op")
+        pass
+
     async def delete(self, plan_name: str, key: str) -> None:
         """No-op - state is not persisted."""
         logger.trace(f"NoPersistence.delete('{plan_name}', '{key}'): no-op")
@@ -177,6 +204,19 @@ class StateStorePersistence(IPersistenceStrategy):
             self._data[plan_name] = state_data.copy()
             await self._save_to_file()
 
+    async def get(self, plan_name: str, key: str, default: Any = None) -> Any:
+        """Read a single key from the in-memory copy of the file."""
+        await self._ensure_initialized()
+        return self._data.get(plan_name, {}).get(key, default)
+
+    async def set(self, plan_name: str, key: str, value: Any) -> None:
+        """Persist a single key (the whole file is still rewritten)."""
+        await self._ensure_initialized()
+
+        async with self._lock:
+            self._data.setdefault(plan_name, {})[key] = value
+            await self._save_to_file()
+
     async def delete(self, plan_name: str, key: str) -> None:
         """Delete a specific key from persisted state."""
         await self._ensure_initialized()
@@ -197,25 +237,288 @@ class StateStorePersistence(IPersistenceStrategy):
 
 
 class DatabasePersistence(IPersistenceStrategy):
-    """Placeholder for future database-backed persistence.
+    """SQLite-backed persistence with per-key rows.
+
+    - One row per (plan, key); values are stored as compact JSON text
+    - `set`/`delete` touch a single row; `save` upserts only changed keys
+    - Writes that arrive while a transaction is committing are grouped into
+      the next transaction (group commit)
+    - WAL journal mode, so reads are not blocked by an in-flight commit
+    - `get` is a primary-key lookup; nothing is cached in memory
 
-    Future implementations could support:
-    - SQLite for local storage
-    - PostgreSQL/MySQL for shared storage
-    - Redis for distributed caching
+    The connection is owned by a single worker thread; every database call
+    runs there, off the event loop.
     """
 
-    def __init__(self, connection_string: str):
-        raise NotImplementedError("DatabasePersistence is not yet implemented")
+    _UPSERT_SQL = (
+        "INSERT INTO plan_state (plan, key, value) VALUES (?, ?, ?) "
+        "ON CONFLICT (plan, key) DO UPDATE SET value = excluded.value"
+    )
+
+    def __init__(self, connection_string: str, *, migrate_from: Optional[str] = None,
+                 synchronous: str = "NORMAL"):
+        """Initialize SQLite persistence.
+
+        Args:
+            connection_string: Database file path, optionally prefixed with
+                ``sqlite:///`` (``sqlite:///:memory:`` for an in-memory database).
+            migrate_from: Optional StateStorePersistence JSON file. Its contents
+                are imported on first access if the database is still empty.
+            synchronous: SQLite ``synchronous`` pragma; ``FULL`` also survives
+                power loss, ``NORMAL`` only process crashes.
+        """
+        self._db_path = self._parse_connection_string(connection_string)
+        self._migrate_from = migrate_from
+        self._synchronous = str(synchronous).upper()
+        if self._synchronous not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"Invalid SQLite synchronous mode: {synchronous}")
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+        self._initialized = False
+        self._pending: List[Tuple[Tuple[Any, ...], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._stats = {"operations": 0, "commits": 0, "rows_written": 0, "rows_deleted": 0}
+
+    @staticmethod
+    def _parse_connection_string(connection_string: str) -> str:
+        if "://" not in connection_string:
+            return connection_string
+        scheme, _, path = connection_string.partition("://")
+        if scheme.lower() != "sqlite":
+            raise ValueError(f"DatabasePersistence only supports SQLite, got '{scheme}://'")
+        # sqlite:///relative.db -> relative.db, sqlite:////abs/path.db -> /abs/path.db
+        return path[1:] if path.startswith("/") else path
+
+    # ------------------------------------------------------------------
+    # Initialization and migration
+    # ------------------------------------------------------------------
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            # Created lazily so the instance can be reopened after close().
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-persistence")
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _ensure_initialized(self):
+        """Lazy initialization - open the database on first access."""
+        if self._initialized:
+            return
+
+        async with self._lock:
+            if self._initialized:
+                return
+
+            await self._run(self._open)
+            if self._migrate_from:
+                await self._migrate_if_empty(self._migrate_from)
+            self._initialized = True
+            logger.info(f"DatabasePersistence initialized: {self._db_path}")
+
+    def _open(self):
+        if self._db_path != ":memory:":
+            Path(self._db_path).resolve().parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: transactions are opened explicitly per batch.
+        conn = sqlite3.connect(self._db_path, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={self._synchronous}")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS plan_state ("
+            " plan TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " PRIMARY KEY (plan, key)) WITHOUT ROWID"
+        )
+        self._conn = conn
+
+    async def _migrate_if_empty(self, json_path: str):
+        if not os.path.exists(json_path):
+            return
+        has_rows = await self._run(lambda: self._conn.execute("SELECT 1 FROM plan_state LIMIT 1").fetchone())
+        if has_rows:
+            return
+        count = await self._import_json(json_path, overwrite=False)
+        logger.info(f"Migrated {count} state keys from '{json_path}' into '{self._db_path}'")
+
+    async def import_json(self, json_path: str, overwrite: bool = False) -> int:
+        """Import a StateStorePersistence JSON file (``{plan: {key: value}}``).
+
+        Args:
+            json_path: Path to the JSON state file.
+            overwrite: Replace keys that already exist in the database.
+
+        Returns:
+            Number of keys written.
+        """
+        await self._ensure_initialized()
+        return await self._import_json(json_path, overwrite)
+
+    async def _import_json(self, json_path: str, overwrite: bool) -> int:
+        def _read():
+            with open(json_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        loaded = await self._run(_read)
+        if not isinstance(loaded, dict):
+            raise ValueError(f"Invalid state file format: {json_path}")
+        rows = [
+            (str(plan_name), str(key), self._dumps(value))
+            for plan_name, state in loaded.items() if isinstance(state, dict)
+            for key, value in state.items()
+        ]
+        sql = self._UPSERT_SQL if overwrite else (
+            "INSERT INTO plan_state (plan, key, value) VALUES (?, ?, ?) ON CONFLICT (plan, key) DO NOTHING"
+        )
+
+        def _write():
+            with self._transaction() as cur:
+                cur.executemany(sql, rows)
+                return cur.rowcount
+
+        written = await self._run(_write)
+        return written if written >= 0 else len(rows)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
 
     async def load(self, plan_name: str) -> Dict[str, Any]:
-        raise NotImplementedError()
+        """Load persisted state for a plan."""
+        await self._ensure_initialized()
+        rows = await self._run(
+            lambda: self._conn.execute("SELECT key, value FROM plan_state WHERE plan = ?", (plan_name,)).fetchall()
+        )
+        return {key: json.loads(value) for key, value in rows}
+
+    async def get(self, plan_name: str, key: str, default: Any = None) -> Any:
+        """Read a single key with a primary-key lookup."""
+        await self._ensure_initialized()
+        row = await self._run(
+            lambda: self._conn.execute(
+                "SELECT value FROM plan_state WHERE plan = ? AND key = ?", (plan_name, key)
+            ).fetchone()
+        )
+        return json.loads(row[0]) if row is not None else default
+
+    async def keys(self, plan_name: str) -> List[str]:
+        """List persisted keys for a plan without loading their values."""
+        await self._ensure_initialized()
+        rows = await self._run(
+            lambda: self._conn.execute("SELECT key FROM plan_state WHERE plan = ?", (plan_name,)).fetchall()
+        )
+        return [key for (key,) in rows]
+
+    # ------------------------------------------------------------------
+    # Writes (group commit)
+    # ------------------------------------------------------------------
 
     async def save(self, plan_name: str, state_data: Dict[str, Any]) -> None:
-        raise NotImplementedError()
+        """Persist state data for a plan, writing only keys whose value changed."""
+        rows = {str(key): self._dumps(value) for key, value in state_data.items()}
+        await self._submit(("replace", plan_name, rows))
+
+    async def set(self, plan_name: str, key: str, value: Any) -> None:
+        """Upsert a single key."""
+        await self._submit(("set", plan_name, str(key), self._dumps(value)))
 
     async def delete(self, plan_name: str, key: str) -> None:
-        raise NotImplementedError()
+        """Delete a specific key from persisted state."""
+        await self._submit(("delete", plan_name, str(key)))
 
     async def clear(self, plan_name: str) -> None:
-        raise NotImplementedError()
+        """Clear all persisted state for a plan."""
+        await self._submit(("clear", plan_name))
+
+    @staticmethod
+    def _dumps(value: Any) -> str:
+        # Serialized in the caller so unserializable values fail there, not in the batch.
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+    async def _submit(self, op: Tuple[Any, ...]):
+        await self._ensure_initialized()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((op, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_pending())
+        await future
+
+    async def _flush_pending(self):
+        while self._pending:
+            # Everything queued while the previous transaction committed goes into this one.
+            batch, self._pending = self._pending, []
+            try:
+                written, deleted = await self._run(self._apply_batch, [op for op, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self._stats["operations"] += len(batch)
+            self._stats["commits"] += 1
+            self._stats["rows_written"] += written
+            self._stats["rows_deleted"] += deleted
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    @contextmanager
+    def _transaction(self):
+        cursor = self._conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        cursor.execute("COMMIT")
+
+    def _apply_batch(self, ops: List[Tuple[Any, ...]]) -> Tuple[int, int]:
+        """(worker thread) Apply a batch of operations in one transaction."""
+        written = deleted = 0
+        with self._transaction() as cur:
+            for op in ops:
+                kind, plan_name = op[0], op[1]
+                if kind == "set":
+                    cur.execute(self._UPSERT_SQL, (plan_name, op[2], op[3]))
+                    written += 1
+                elif kind == "delete":
+                    cur.execute("DELETE FROM plan_state WHERE plan = ? AND key = ?", (plan_name, op[2]))
+                    deleted += max(cur.rowcount, 0)
+                elif kind == "clear":
+                    cur.execute("DELETE FROM plan_state WHERE plan = ?", (plan_name,))
+                    deleted += max(cur.rowcount, 0)
+                elif kind == "replace":
+                    rows: Dict[str, str] = op[2]
+                    existing = dict(cur.execute("SELECT key, value FROM plan_state WHERE plan = ?", (plan_name,)))
+                    changed = [(plan_name, key, text) for key, text in rows.items() if existing.get(key) != text]
+                    removed = [(plan_name, key) for key in existing if key not in rows]
+                    cur.executemany(self._UPSERT_SQL, changed)
+                    cur.executemany("DELETE FROM plan_state WHERE plan = ? AND key = ?", removed)
+                    written += len(changed)
+                    deleted += len(removed)
+        return written, deleted
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def close(self) -> None:
+        """Wait for queued writes, then close the connection.
+
+        The next call reopens the database with a fresh worker thread.
+        """
+        while self._flush_task is not None and not self._flush_task.done():
+            await asyncio.shield(self._flush_task)
+        if self._conn is not None:
+            await self._run(self._conn.close)
+            self._conn = None
+        self._initialized = False
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["avg_commit_size"] = stats["operations"] / stats["commits"] if stats["commits"] else 0.0
+        return stats
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""StateStore 的追加写日志（WAL）持久化引擎。
+
+快照沿用原有的 JSON 状态文件格式；每次变更只向 `<快照>.wal` 追加一行紧凑的
+JSON 记录（整值 set / delete）。同一时刻到达的多个写入合并为一次文件写入
+（group commit），日志累积到阈值后在后台压缩为新的快照。
+
+记录都是整值覆盖，按顺序重放是幂等的：即使快照已经包含某些记录，再重放一次
+也得到相同结果。因此恢复流程固定为「快照 -> .wal.old -> .wal」，压缩过程中
+任何时刻崩溃都能恢复出完全相同的状态。
+"""
+import asyncio
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from packages.aura_core.observability.logging.core_logger import logger
+
+
+class AppendOnlyStateLog:
+    """追加写日志 + 快照的键值持久化引擎（供 `StateStoreService` 使用）。"""
+
+    def __init__(self, snapshot_path: str, *, fsync: bool = False, compact_threshold: int = 1000):
+        """
+        Args:
+            snapshot_path: 快照文件路径（即原来的状态 JSON 文件）。
+            fsync: 每次提交后是否 fsync，开启后掉电也不丢已确认的写入。
+            compact_threshold: 日志记录数达到该值后触发后台压缩。
+        """
+        self.snapshot_path = snapshot_path
+        self.log_path = snapshot_path + ".wal"
+        self.old_log_path = snapshot_path + ".wal.old"
+        self.fsync = fsync
+        self.compact_threshold = max(1, int(compact_threshold))
+        self._snapshot_fn: Optional[Callable[[], Dict[str, Any]]] = None
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._compact_task: Optional[asyncio.Task] = None
+        self._log_records = 0
+        self._stats = {"records": 0, "commits": 0, "bytes": 0, "compactions": 0}
+
+    def bind_snapshot(self, snapshot_fn: Callable[[], Dict[str, Any]]):
+        """设置压缩时读取当前完整状态的回调。"""
+        self._snapshot_fn = snapshot_fn
+
+    # ------------------------------------------------------------------
+    # 恢复
+    # ------------------------------------------------------------------
+
+    def recover(self) -> Dict[str, Any]:
+        """(同步) 读取快照并按顺序重放日志，返回恢复后的完整状态。"""
+        data: Dict[str, Any] = {}
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                if isinstance(loaded, dict):
+                    data = loaded
+                else:
+                    logger.warning(f"状态快照'{self.snapshot_path}'格式无效，将从空状态重放日志。")
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"读取状态快照'{self.snapshot_path}'失败: {e}。将从空状态重放日志。")
+
+        had_old_log = os.path.exists(self.old_log_path)
+        self._replay(self.old_log_path, data)
+        self._log_records = self._replay(self.log_path, data)
+        if had_old_log:
+            # 上次压缩没有完成：先把完整状态落成快照，再丢弃旧日志，避免下次轮转覆盖它。
+            self._write_snapshot(self._dump_snapshot(data))
+            os.remove(self.old_log_path)
+        return data
+
+    def _replay(self, path: str, data: Dict[str, Any]) -> int:
+        if not os.path.exists(path):
+            return 0
+        with open(path, 'rb') as f:
+            content = f.read()
+        complete_end = content.rfind(b"\n") + 1
+        if complete_end < len(content):
+            # 写入中途崩溃留下的半条记录：丢弃并截断，保证后续追加从完整行开始。
+            logger.warning(f"状态日志'{path}'末尾有不完整记录（{len(content) - complete_end} 字节），已丢弃。")
+            with open(path, 'r+b') as f:
+                f.truncate(complete_end)
+        count = 0
+        for line_no, line in enumerate(content[:complete_end].splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                op, key = record["op"], record["k"]
+            except (ValueError, KeyError, TypeError) as e:
+                logger.error(f"状态日志'{path}'第 {line_no} 行无法解析，已跳过: {e}")
+                continue
+            if op == "set":
+                data[key] = record.get("v")
+            elif op == "del":
+                data.pop(key, None)
+            count += 1
+        return count
+
+    # ------------------------------------------------------------------
+    # 追加与组提交
+    # ------------------------------------------------------------------
+
+    async def append_set(self, key: str, value: Any):
+        await self._append({"op": "set", "k": key, "v": value})
+
+    async def append_delete(self, key: str):
+        await self._append({"op": "del", "k": key})
+
+    async def _append(self, record: Dict[str, Any]):
+        # 在调用方当下序列化，记录的是此刻的值；不可序列化时直接抛给调用方。
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((line, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_pending())
+        await future
+
+    async def _flush_pending(self):
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            # 上一批写盘期间到达的所有记录合并为这一批，一次 write 提交。
+            batch, self._pending = self._pending, []
+            payload = "".join(line for line, _ in batch)
+            try:
+                await loop.run_in_executor(None, self._write_batch, payload)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self._log_records += len(batch)
+            self._stats["records"] += len(batch)
+            self._stats["commits"] += 1
+            self._stats["bytes"] += len(payload.encode("utf-8"))
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+            if self._log_records >= self.compact_threshold:
+                self._start_compaction(loop)
+
+    def _write_batch(self, payload: str):
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(payload)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    # ------------------------------------------------------------------
+    # 压缩
+    # ------------------------------------------------------------------
+
+    async def compact(self):
+        """等待当前提交完成后立即压缩，并等待新快照落盘。"""
+        while self._flush_task is not None and not self._flush_task.done():
+            await asyncio.shield(self._flush_task)
+        if self._compact_task is not None and not self._compact_task.done():
+            await asyncio.shield(self._compact_task)
+        self._start_compaction(asyncio.get_running_loop())
+        if self._compact_task is not None:
+            await asyncio.shield(self._compact_task)
+
+    def _start_compaction(self, loop: asyncio.AbstractEventLoop):
+        """(事件循环线程) 在两批提交之间轮转日志，快照在后台线程写入。"""
+        if self._snapshot_fn is None or (self._compact_task is not None and not self._compact_task.done()):
+            return
+        try:
+            text = self._dump_snapshot(self._snapshot_fn())
+        except (TypeError, ValueError) as e:
+            logger.error(f"状态快照序列化失败，暂不压缩日志: {e}")
+            return
+        rotated = False
+        if not os.path.exists(self.old_log_path) and os.path.exists(self.log_path):
+            os.replace(self.log_path, self.old_log_path)
+            rotated = True
+        if rotated:
+            self._log_records = 0
+        self._compact_task = loop.create_task(self._finish_compaction(text))
+
+    async def _finish_compaction(self, text: str):
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self._write_snapshot_and_drop_old_log, text)
+            self._stats["compactions"] += 1
+        except Exception as e:
+            logger.error(f"状态日志压缩失败（日志保留，可正常恢复）: {e}", exc_info=True)
+
+    def _write_snapshot_and_drop_old_log(self, text: str):
+        self._write_snapshot(text)
+        if os.path.exists(self.old_log_path):
+            os.remove(self.old_log_path)
+
+    @staticmethod
+    def _dump_snapshot(data: Dict[str, Any]) -> str:
+        return json.dumps(data, indent=4, ensure_ascii=False)
+
+    def _write_snapshot(self, text: str):
+        os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["log_records"] = self._log_records
+        stats["avg_commit_size"] = stats["records"] / stats["commits"] if stats["commits"] else 0.0
+        return stats
@@ -229,12 +229,9 @@ class StateLayer:
         """
         async with self._ctx._state_lock:
             self._ctx._state_data[key] = value
-            # Persist immediately
+            # Persist immediately (only this key for backends that support it)
             try:
-                await self._ctx._persistence.save(
-                    self._ctx.plan_name,
-                    self._ctx._state_data
-                )
+                await self._ctx._persistence.set(self._ctx.plan_name, key, value)
             except Exception as e:
                 logger.error(
                     f"Failed to persist state for plan '{self._ctx.plan_name}': {e}",
@@ -27,10 +27,32 @@ class DAGScheduler:
 
     async def schedule_ready_nodes(self):
         """Find and enqueue all currently runnable nodes."""
-        for node_id in self.engine.nodes:
+        plan = getattr(self.engine, "execution_plan", None)
+        candidates = plan.initial_ready if plan is not None else self.engine.nodes
+        for node_id in candidates:
             await self.enqueue_ready_node(node_id)
         await self.drain_ready_queue()
 
+    async def on_node_completed(self, node_id: str):
+        """Re-check only the direct dependents of a finished node.
+
+        Dependents whose spec requires every parent to succeed are skipped
+        until their remaining-parent counter reaches zero.
+        """
+        plan = getattr(self.engine, "execution_plan", None)
+        pending_counts = getattr(self.engine, "pending_dependency_counts", {})
+        for downstream_id in self.engine.reverse_dependencies.get(node_id, ()):
+            if downstream_id in pending_counts:
+                pending_counts[downstream_id] -= 1
+                if (
+                    plan is not None
+                    and downstream_id in plan.conjunctive_nodes
+                    and pending_counts[downstream_id] > 0
+                ):
+                    continue
+            await self.enqueue_ready_node(downstream_id)
+        await self.drain_ready_queue()
+
     async def enqueue_ready_node(self, node_id: str):
         """Enqueue a node if it is pending and dependencies are met."""
         if node_id in self.engine._ready_set:
@@ -62,6 +84,9 @@ class DAGScheduler:
 
     async def are_dependencies_met(self, node_id: str) -> bool:
         """Return whether node dependency spec is currently satisfied."""
+        plan = getattr(self.engine, "execution_plan", None)
+        if plan is not None and node_id in plan.predicates:
+            return plan.is_ready(node_id, self.engine.step_states)
         dep_struct = self.engine.dependencies.get(node_id)
         return await self.evaluate_dep_struct(dep_struct)
 
@@ -27,6 +27,7 @@ from packages.aura_core.context.persistence.store_service import StateStoreServi
 from .graph_builder import GraphBuilder
 from .dag_scheduler import DAGScheduler
 from .node_executor import NodeExecutor
+from .execution_plan import ExecutionPlan, VALID_DEPENDENCY_STATUSES
 
 
 class StepState(Enum):
@@ -79,6 +80,8 @@ class ExecutionEngine:
         self.nodes: Dict[str, Dict] = {}
         self.dependencies: Dict[str, Any] = {}
         self.reverse_dependencies: Dict[str, Set[str]] = {}
+        self.execution_plan: Optional[ExecutionPlan] = None
+        self.pending_dependency_counts: Dict[str, int] = {}
         self.step_states: Dict[str, StepState] = {}
         self.ready_queue: deque[str] = deque()
         self._ready_set: Set[str] = set()
@@ -93,7 +96,7 @@ class ExecutionEngine:
 
         # ===== 依赖的服务 =====
         self.state_store: StateStoreService = self.services.get('state_store')
-        self.VALID_DEPENDENCY_STATUSES = {'success', 'failed', 'running', 'skipped'}
+        self.VALID_DEPENDENCY_STATUSES = set(VALID_DEPENDENCY_STATUSES)
 
         # ===== 控制流异常机制 =====
 
@@ -199,9 +202,12 @@ class ExecutionEngine:
         Returns:
             新的ExecutionContext实例
         """
-        parent_ids = self.graph_builder.get_all_deps_from_struct(
-            self.dependencies.get(node_id, [])
-        )
+        if self.execution_plan is not None:
+            parent_ids = self.execution_plan.parents.get(node_id, ())
+        else:
+            parent_ids = self.graph_builder.get_all_deps_from_struct(
+                self.dependencies.get(node_id)
+            )
 
         if not parent_ids:
             return self.root_context.fork()
@@ -238,9 +244,7 @@ class ExecutionEngine:
 
         async def reschedule_and_maybe_finish():
             try:
-                for downstream_id in self.reverse_dependencies.get(node_id, set()):
-                    await self.dag_scheduler.enqueue_ready_node(downstream_id)
-                await self.dag_scheduler.drain_ready_queue()
+                await self.dag_scheduler.on_node_completed(node_id)
             finally:
                 if not self.running_tasks and not self.ready_queue and self.completion_event:
                     self.completion_event.set()
@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+"""Compiled, immutable DAG execution plans.
+
+A task's dependency topology (node ids plus their ``depends_on`` specs) is
+compiled once into an :class:`ExecutionPlan` holding the validated graph, a
+topological order, per-node in-degree counters and ``depends_on`` specs
+lowered into plain predicates over the current step states. Plans are cached
+process-wide keyed by a frozen copy of that topology, so re-triggered tasks
+skip graph construction, validation and cycle detection entirely.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
+
+from packages.aura_core.config.loader import get_config_value
+
+VALID_DEPENDENCY_STATUSES = frozenset({"success", "failed", "running", "skipped"})
+
+DependencyPredicate = Callable[[Mapping[str, Any]], bool]
+
+
+def collect_dependency_ids(struct: Any) -> Set[str]:
+    """Recursively collect node ids referenced by a dependency spec."""
+    deps: Set[str] = set()
+
+    if struct is None:
+        return deps
+
+    if isinstance(struct, str):
+        if struct.strip().startswith("when:"):
+            raise ValueError(
+                "Inline dependency condition 'when:' has been removed from 'depends_on'. "
+                "Please use step-level field 'when' instead."
+            )
+        deps.add(struct)
+        return deps
+
+    if isinstance(struct, list):
+        raise ValueError(
+            "List dependency shorthand has been removed from 'depends_on'. "
+            "Please use '{ all: [...] }' instead."
+        )
+
+    if isinstance(struct, dict):
+        operator, payload = _split_logical_operator(struct)
+        if operator is not None:
+            if isinstance(payload, list):
+                for item in payload:
+                    deps.update(collect_dependency_ids(item))
+                return deps
+            deps.update(collect_dependency_ids(payload))
+            return deps
+
+        # Status query form: {node_id: "success|failed|..."}
+        deps.update(struct.keys())
+        return deps
+
+    raise ValueError(f"Unsupported dependency spec type: {type(struct).__name__}")
+
+
+def detect_cycles(dependencies: Mapping[str, Any], all_nodes: Set[str]) -> None:
+    """Raise ``ValueError`` naming the cycle path if the graph is not a DAG."""
+    WHITE = 0
+    GRAY = 1
+    BLACK = 2
+
+    colors = {node: WHITE for node in all_nodes}
+    path: List[str] = []
+
+    def dfs(node: str) -> None:
+        colors[node] = GRAY
+        path.append(node)
+
+        for dep in collect_dependency_ids(dependencies.get(node)):
+            if colors[dep] == GRAY:
+                cycle_start = path.index(dep)
+                cycle = path[cycle_start:] + [dep]
+                raise ValueError(
+                    f"Detected circular dependency: {' -> '.join(cycle)}\n"
+                    "Please check the depends_on configuration of involved nodes."
+                )
+            if colors[dep] == WHITE:
+                dfs(dep)
+
+        path.pop()
+        colors[node] = BLACK
+
+    for node in all_nodes:
+        if colors[node] == WHITE:
+            path = []
+            dfs(node)
+
+
+def _split_logical_operator(struct: Dict[str, Any]) -> Tuple[Optional[str], Any]:
+    legacy_operators = {"and", "or", "not"}
+    if legacy_operators.intersection(struct.keys()):
+        raise ValueError(
+            "Dependency operators 'and/or/not' have been removed. "
+            "Please use 'all/any/none'."
+        )
+
+    logical_operators = {"all", "any", "none"}
+    present_operators = logical_operators.intersection(struct.keys())
+    if not present_operators:
+        return None, None
+    if len(present_operators) != 1 or len(struct) != 1:
+        raise ValueError(
+            "Dependency object with logical operator must contain exactly one key "
+            "from {'all', 'any', 'none'}."
+        )
+    operator = next(iter(present_operators))
+    return operator, struct[operator]
+
+
+def _always_true(_states: Mapping[str, Any]) -> bool:
+    return True
+
+
+def lower_dependency_spec(struct: Any) -> Tuple[DependencyPredicate, bool]:
+    """Lower a ``depends_on`` spec into a predicate over ``step_states``.
+
+    Returns:
+        ``(predicate, conjunctive)`` where ``conjunctive`` is True when the
+        predicate can only hold once every referenced node has succeeded, so
+        the scheduler may skip evaluating it until all parents completed.
+    """
+    if struct is None:
+        return _always_true, True
+
+    if isinstance(struct, (str, list)):
+        # Reuse the collector's syntax checks for removed shorthand forms.
+        collect_dependency_ids(struct)
+
+    if isinstance(struct, str):
+        node_id = struct
+
+        def _succeeded(states: Mapping[str, Any]) -> bool:
+            state = states.get(node_id)
+            return state is not None and state.name == "SUCCESS"
+
+        return _succeeded, True
+
+    if isinstance(struct, dict):
+        if not struct:
+            return _always_true, True
+
+        operator, payload = _split_logical_operator(struct)
+        if operator is not None:
+            if isinstance(payload, list):
+                lowered = [lower_dependency_spec(item) for item in payload]
+                children = tuple(predicate for predicate, _ in lowered)
+                if operator == "all":
+                    return (
+                        lambda states: all(child(states) for child in children),
+                        all(conjunctive for _, conjunctive in lowered),
+                    )
+                if operator == "any":
+                    return lambda states: any(child(states) for child in children), False
+                return lambda states: not any(child(states) for child in children), False
+
+            child, conjunctive = lower_dependency_spec(payload)
+            if operator == "none":
+                return lambda states: not child(states), False
+            if operator == "any":
+                return child, False
+            return child, conjunctive
+
+        # Status query form: {node_id: "success|failed|..."}
+        if len(struct) != 1:
+            raise ValueError(
+                f"Invalid dependency condition format: {struct}. "
+                "Status query must contain exactly one key-value pair."
+            )
+
+        node_id, expected_status_str = next(iter(struct.items()))
+        if not isinstance(expected_status_str, str):
+            raise ValueError(
+                f"Dependency status for node '{node_id}' must be a string, got "
+                f"{type(expected_status_str).__name__}."
+            )
+
+        raw_statuses = frozenset(s.strip().lower() for s in expected_status_str.split("|"))
+        invalid_statuses = raw_statuses - VALID_DEPENDENCY_STATUSES
+        if invalid_statuses:
+            raise ValueError(
+                f"Unknown dependency statuses: {set(invalid_statuses)}. "
+                f"Supported statuses: {set(VALID_DEPENDENCY_STATUSES)}"
+            )
+
+        def _status_matches(states: Mapping[str, Any]) -> bool:
+            state = states.get(node_id)
+            return state is not None and state.name.lower() in raw_statuses
+
+        return _status_matches, False
+
+    raise ValueError(f"Unsupported dependency spec type: {type(struct).__name__}")
+
+
+class _PendingState:
+    """Stand-in for ``StepState.PENDING`` when computing initially ready nodes."""
+
+    name = "PENDING"
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """Immutable, validated DAG topology for one task definition."""
+
+    node_ids: Tuple[str, ...]
+    dependencies: Mapping[str, Any]
+    parents: Mapping[str, Tuple[str, ...]]
+    reverse_dependencies: Mapping[str, FrozenSet[str]]
+    in_degree: Mapping[str, int]
+    conjunctive_nodes: FrozenSet[str]
+    predicates: Mapping[str, DependencyPredicate]
+    topological_order: Tuple[str, ...]
+    initial_ready: Tuple[str, ...]
+
+    def is_ready(self, node_id: str, step_states: Mapping[str, Any]) -> bool:
+        """Evaluate the pre-lowered ``depends_on`` predicate of ``node_id``."""
+        predicate = self.predicates.get(node_id)
+        return True if predicate is None else predicate(step_states)
+
+
+def compile_execution_plan(steps: Mapping[str, Any]) -> ExecutionPlan:
+    """Validate ``steps`` and compile their dependency graph into a plan."""
+    node_ids = tuple(steps.keys())
+    all_node_ids = set(node_ids)
+    declaration_index = {node_id: index for index, node_id in enumerate(node_ids)}
+
+    dependencies: Dict[str, Any] = {}
+    parents: Dict[str, Tuple[str, ...]] = {}
+    reverse: Dict[str, Set[str]] = {node_id: set() for node_id in node_ids}
+    for node_id, node_data in steps.items():
+        deps_struct = node_data.get("depends_on")
+        dependencies[node_id] = deps_struct
+
+        all_deps = collect_dependency_ids(deps_struct)
+        for dep_id in all_deps:
+            if dep_id not in all_node_ids:
+                raise KeyError(
+                    f"Node '{node_id}' references undefined dependency '{dep_id}'"
+                )
+            reverse[dep_id].add(node_id)
+        parents[node_id] = tuple(sorted(all_deps, key=declaration_index.__getitem__))
+
+    detect_cycles(dependencies, all_node_ids)
+
+    predicates: Dict[str, DependencyPredicate] = {}
+    conjunctive_nodes: Set[str] = set()
+    for node_id in node_ids:
+        predicate, conjunctive = lower_dependency_spec(dependencies[node_id])
+        predicates[node_id] = predicate
+        if conjunctive:
+            conjunctive_nodes.add(node_id)
+
+    in_degree = {node_id: len(parents[node_id]) for node_id in node_ids}
+    remaining = dict(in_degree)
+    frontier = deque(node_id for node_id in node_ids if remaining[node_id] == 0)
+    topological_order: List[str] = []
+    while frontier:
+        node_id = frontier.popleft()
+        topological_order.append(node_id)
+        for child_id in sorted(reverse[node_id], key=declaration_index.__getitem__):
+            remaining[child_id] -= 1
+            if remaining[child_id] == 0:
+                frontier.append(child_id)
+
+    pending_states = {node_id: _PendingState for node_id in node_ids}
+    initial_ready = tuple(
+        node_id for node_id in node_ids if predicates[node_id](pending_states)
+    )
+
+    return ExecutionPlan(
+        node_ids=node_ids,
+        dependencies=MappingProxyType(dependencies),
+        parents=MappingProxyType(parents),
+        reverse_dependencies=MappingProxyType(
+            {node_id: frozenset(children) for node_id, children in reverse.items()}
+        ),
+        in_degree=MappingProxyType(in_degree),
+        conjunctive_nodes=frozenset(conjunctive_nodes),
+        predicates=MappingProxyType(predicates),
+        topological_order=tuple(topological_order),
+        initial_ready=initial_ready,
+    )
+
+
+def _freeze_spec(value: Any) -> Any:
+    if isinstance(value, dict):
+        return ("dict", tuple((key, _freeze_spec(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return ("list", tuple(_freeze_spec(item) for item in value))
+    try:
+        hash(value)
+    except TypeError:
+        return ("repr", repr(value))
+    return value
+
+
+def topology_key(steps: Mapping[str, Any]) -> Tuple[Any, ...]:
+    """Hashable fingerprint of the parts of ``steps`` a plan depends on."""
+    return tuple(
+        (node_id, _freeze_spec(node_data.get("depends_on")))
+        for node_id, node_data in steps.items()
+    )
+
+
+class ExecutionPlanCache:
+    """Thread-safe LRU of compiled plans keyed by task topology."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = max(0, int(maxsize))
+        self._plans: "OrderedDict[Tuple[Any, ...], ExecutionPlan]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compile(self, steps: Mapping[str, Any]) -> ExecutionPlan:
+        key = topology_key(steps)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+            self.misses += 1
+
+        plan = compile_execution_plan(steps)
+        if self.maxsize <= 0:
+            return plan
+
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+        return plan
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._plans),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_plan_cache: Optional[ExecutionPlanCache] = None
+_plan_cache_lock = threading.Lock()
+
+
+def get_execution_plan_cache() -> ExecutionPlanCache:
+    """Return the process-wide execution plan cache."""
+    global _plan_cache
+    if _plan_cache is None:
+        with _plan_cache_lock:
+            if _plan_cache is None:
+                maxsize = int(get_config_value("execution.plan_cache_maxsize", 256))
+                _plan_cache = ExecutionPlanCache(maxsize=maxsize)
+    return _plan_cache
@@ -11,6 +11,8 @@
 
 功能特性:
 - **主题过滤**: 支持使用 `*` 和 `?` 等通配符进行事件名称匹配。
+- **模式索引**: 精确名称走哈希表、`foo.*` 形式走前缀树，只有复杂通配符才回退到
+  `fnmatch` 逐个匹配，发布开销与订阅总数无关。
 - **频道隔离**: 支持按频道发布和订阅事件。
 - **跨线程安全**: 可以在不同的 asyncio 事件循环之间安全地发布事件。
 - **持久化订阅**: 支持在清理时保留某些关键的订阅。
@@ -18,12 +20,13 @@
 """
 import asyncio
 import fnmatch
+import os
 import uuid
 import weakref
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Callable, Dict, Any, List, Optional, Awaitable
+from typing import Callable, Dict, Any, List, Optional, Awaitable, Set
 import threading
 
 # logger will be imported on first use
@@ -86,6 +89,102 @@ class Subscription:
     subscription_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     created_at: float = field(default_factory=lambda: datetime.now().timestamp())
 
+_GLOB_CHARS = frozenset("*?[")
+_TRIE_KEYS = "\0keys"
+
+
+class _PatternIndex:
+    """单个频道内的事件名称模式索引。
+
+    - 不含通配符的模式放入精确哈希表；
+    - 形如 `prefix*`（前缀本身不含通配符）的模式放入字符前缀树；
+    - 其余模式放入回退列表，发布时才用 `fnmatch` 逐个匹配。
+
+    模式与事件名称都会经过 `os.path.normcase`，与 `fnmatch.fnmatch` 的语义保持一致。
+    """
+
+    def __init__(self):
+        self._exact: Dict[str, Set[str]] = defaultdict(set)
+        self._trie: Dict[str, Any] = {}
+        self._fallback: Dict[str, str] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _classify(pattern: str):
+        normalized = os.path.normcase(pattern)
+        if not _GLOB_CHARS.intersection(normalized):
+            return "exact", normalized
+        prefix = normalized[:-1]
+        if normalized.endswith("*") and not _GLOB_CHARS.intersection(prefix):
+            return "prefix", prefix
+        return "fallback", normalized
+
+    def add(self, pattern: str, key: str) -> None:
+        self._size += 1
+        kind, value = self._classify(pattern)
+        if kind == "exact":
+            self._exact[value].add(key)
+        elif kind == "prefix":
+            node = self._trie
+            for char in value:
+                node = node.setdefault(char, {})
+            node.setdefault(_TRIE_KEYS, set()).add(key)
+        else:
+            self._fallback[key] = value
+
+    def remove(self, pattern: str, key: str) -> None:
+        self._size -= 1
+        kind, value = self._classify(pattern)
+        if kind == "exact":
+            keys = self._exact.get(value)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._exact[value]
+        elif kind == "prefix":
+            path = [self._trie]
+            for char in value:
+                child = path[-1].get(char)
+                if child is None:
+                    return
+                path.append(child)
+            keys = path[-1].get(_TRIE_KEYS)
+            if keys is None:
+                return
+            keys.discard(key)
+            if not keys:
+                del path[-1][_TRIE_KEYS]
+            # 回收空分支
+            for depth in range(len(value), 0, -1):
+                if path[depth]:
+                    break
+                del path[depth - 1][value[depth - 1]]
+        else:
+            self._fallback.pop(key, None)
+
+    def match(self, event_name: str) -> Set[str]:
+        name = os.path.normcase(event_name)
+        matched: Set[str] = set(self._exact.get(name, ()))
+
+        node = self._trie
+        if _TRIE_KEYS in node:
+            matched.update(node[_TRIE_KEYS])
+        for char in name:
+            node = node.get(char)
+            if node is None:
+                break
+            if _TRIE_KEYS in node:
+                matched.update(node[_TRIE_KEYS])
+
+        for key, pattern in self._fallback.items():
+            if fnmatch.fnmatchcase(name, pattern):
+                matched.add(key)
+        return matched
+
+
 class EventBus:
     """实现发布/订阅模式的事件总线。
 
@@ -100,6 +199,42 @@ class EventBus:
         self._subscription_index: Dict[str, tuple[str, Subscription]] = {}
         # ✅ 新增：使用弱引用跟踪事件循环
         self._loop_refs: weakref.WeakSet = weakref.WeakSet()
+        # 按频道划分的模式索引，随订阅增删增量维护
+        self._pattern_indexes: Dict[str, _PatternIndex] = {}
+        self._key_order: Dict[str, int] = {}
+        self._key_seq = 0
+
+    def _index_key(self, key: str) -> None:
+        """(私有) 将新出现的订阅键加入模式索引。调用方需持有锁。"""
+        if key in self._key_order:
+            return
+        channel, pattern = key.split('::', 1)
+        self._key_seq += 1
+        self._key_order[key] = self._key_seq
+        self._pattern_indexes.setdefault(channel, _PatternIndex()).add(pattern, key)
+
+    def _unindex_key(self, key: str) -> None:
+        """(私有) 将已无订阅者的订阅键移出模式索引。调用方需持有锁。"""
+        if self._key_order.pop(key, None) is None:
+            return
+        channel, pattern = key.split('::', 1)
+        index = self._pattern_indexes.get(channel)
+        if index is not None:
+            index.remove(pattern, key)
+            if not len(index):
+                del self._pattern_indexes[channel]
+
+    def _match_keys(self, event: Event) -> List[str]:
+        """(私有) 返回匹配事件的订阅键，按注册顺序排列。调用方需持有锁。"""
+        matched: Set[str] = set()
+        index = self._pattern_indexes.get('*')
+        if index is not None:
+            matched.update(index.match(event.name))
+        if event.channel != '*':
+            index = self._pattern_indexes.get(event.channel)
+            if index is not None:
+                matched.update(index.match(event.name))
+        return sorted(matched, key=self._key_order.__getitem__)
 
     async def subscribe(
             self,
@@ -145,6 +280,7 @@ class EventBus:
                 persistent=persistent
             )
             self._subscriptions[key].append(subscription)
+            self._index_key(key)
 
             # 建立反向索引
             self._subscription_index[subscription.subscription_id] = (key, subscription)
@@ -184,6 +320,7 @@ class EventBus:
                 # 清理空列表
                 if not self._subscriptions[key]:
                     del self._subscriptions[key]
+                    self._unindex_key(key)
 
                 _get_logger().debug(f"[EventBus] 已取消订阅: {subscription_id[:8]} (key={key})")
                 return True
@@ -211,6 +348,7 @@ class EventBus:
 
                 # 删除订阅列表
                 del self._subscriptions[key]
+                self._unindex_key(key)
 
         _get_logger().debug(f"[EventBus] 已取消模式订阅: {key}, 数量={count}")
         return count
@@ -230,30 +368,31 @@ class EventBus:
             current_loop = None
 
         with self._lock:
-            all_subscriptions = list(self._subscriptions.items())
-
-        for key, subscriptions in all_subscriptions:
-            channel, pattern = key.split('::', 1)
-            if (channel == '*' or event.channel == channel) and fnmatch.fnmatch(event.name, pattern):
-                for sub in subscriptions:
-                    # ✅ 检查loop是否仍然有效
-                    if sub.loop and sub.loop.is_closed():
-                        _get_logger().warning(
-                            f"[EventBus] 检测到已关闭的事件循环，跳过订阅: "
-                            f"{key}, id={sub.subscription_id[:8]}"
+            matched_subscriptions = [
+                (key, tuple(self._subscriptions.get(key, ())))
+                for key in self._match_keys(event)
+            ]
+
+        for key, subscriptions in matched_subscriptions:
+            for sub in subscriptions:
+                # ✅ 检查loop是否仍然有效
+                if sub.loop and sub.loop.is_closed():
+                    _get_logger().warning(
+                        f"[EventBus] 检测到已关闭的事件循环，跳过订阅: "
+                        f"{key}, id={sub.subscription_id[:8]}"
+                    )
+                    continue
+
+                if sub.loop and sub.loop is not current_loop:
+                    try:
+                        sub.loop.call_soon_threadsafe(
+                            sub.loop.create_task,
+                            sub.callback(event)
                         )
-                        continue
-
-                    if sub.loop and sub.loop is not current_loop:
-                        try:
-                            sub.loop.call_soon_threadsafe(
-                                sub.loop.create_task,
-                                sub.callback(event)
-                            )
-                        except RuntimeError as e:
-                            _get_logger().error(f"[EventBus] 跨循环调用失败: {e}")
-                    elif current_loop:
-                        tasks.append(current_loop.create_task(sub.callback(event)))
+                    except RuntimeError as e:
+                        _get_logger().error(f"[EventBus] 跨循环调用失败: {e}")
+                elif current_loop:
+                    tasks.append(current_loop.create_task(sub.callback(event)))
 
         if tasks:
             results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -287,10 +426,13 @@ class EventBus:
                     else:
                         # 只有在没有持久订阅时才删除key
                         del self._subscriptions[key]
+                        self._unindex_key(key)
             else:
                 # 清除所有订阅
                 self._subscriptions.clear()
                 self._subscription_index.clear()
+                self._pattern_indexes.clear()
+                self._key_order.clear()
 
             # ✅ 修复：验证索引一致性
             index_ids = set(self._subscription_index.keys())
@@ -354,6 +496,7 @@ class EventBus:
                         self._subscriptions[key] = fresh_subs
                     else:
                         del self._subscriptions[key]
+                        self._unindex_key(key)
 
         if removed_count > 0:
             _get_logger().info(f"[EventBus] 清理了 {removed_count} 个过期订阅")
@@ -1,15 +1,34 @@
 # -*- coding: utf-8 -*-
-"""Durable run state store backed by SQLite (WAL)."""
+"""Durable run state store backed by SQLite (WAL).
+
+Events are applied by a background writer thread that group-commits them:
+``apply_event`` only enqueues, and the writer drains the queue into a single
+transaction every ``batch_interval_ms`` or ``batch_max_events`` events.
+Reads flush pending events first, so callers always observe their own writes.
+"""
 
 from __future__ import annotations
 
 import json
+import queue
 import sqlite3
 import threading
 import time
+from collections import deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from packages.aura_core.observability.logging.core_logger import logger
+
 
+_DURABILITY_LEVELS = {"off": "OFF", "normal": "NORMAL", "full": "FULL"}
+_BACKPRESSURE_POLICIES = {"block", "drop"}
+# Node terminal events are shed first under the "drop" policy; run lifecycle
+# events spill into a bounded in-order overflow list and are only shed once
+# that is full too.
+_DROPPABLE_EVENTS = {"node.finished", "node.failed"}
+_STOP = object()
+_FLUSH = object()
 
 _TERMINAL_STATUSES = {"success", "error", "failed", "timeout", "cancelled"}
 _ALLOWED_TRANSITIONS = {
@@ -22,19 +41,75 @@ _ALLOWED_TRANSITIONS = {
 class RunStore:
     """Authoritative run timeline store."""
 
-    def __init__(self, db_path: Path):
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        async_writes: bool = True,
+        batch_max_events: int = 256,
+        batch_interval_ms: float = 50.0,
+        queue_maxsize: int = 10000,
+        durability: str = "normal",
+        backpressure: str = "drop",
+    ):
+        """
+        Args:
+            db_path: SQLite database file.
+            async_writes: When False, commit each event on the calling thread.
+            batch_max_events: Maximum number of events per transaction.
+            batch_interval_ms: How long the writer waits for more events after
+                the first one of a batch before committing.
+            queue_maxsize: Capacity of the writer queue; 0 means unbounded.
+            durability: ``off`` / ``normal`` / ``full``, mapped to ``PRAGMA synchronous``.
+            backpressure: What to do when the queue is full. ``drop`` (default)
+                never blocks: node terminal events are shed and run lifecycle
+                events spill into an overflow list the writer drains in order.
+                The overflow holds at most ``queue_maxsize`` events; lifecycle
+                events beyond that are dropped and counted in ``stats["dropped"]``,
+                so at most ``2 * queue_maxsize`` events are ever pending.
+                ``block`` makes the caller wait for queue space; when events are
+                applied from the event loop this stalls the loop, so only use it
+                with callers on their own thread.
+        """
+        durability = str(durability or "normal").lower()
+        if durability not in _DURABILITY_LEVELS:
+            raise ValueError(f"Unknown RunStore durability '{durability}', expected one of {sorted(_DURABILITY_LEVELS)}")
+        backpressure = str(backpressure or "drop").lower()
+        if backpressure not in _BACKPRESSURE_POLICIES:
+            raise ValueError(
+                f"Unknown RunStore backpressure policy '{backpressure}', expected one of {sorted(_BACKPRESSURE_POLICIES)}"
+            )
+
         self._db_path = Path(db_path)
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
         self._lock = threading.RLock()
         self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
+        self._durability = durability
         self._init_db()
 
+        self.async_writes = bool(async_writes)
+        self.batch_max_events = max(1, int(batch_max_events))
+        self.batch_interval_sec = max(0.0, float(batch_interval_ms) / 1000.0)
+        self.backpressure = backpressure
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(0, int(queue_maxsize)))
+        # Events that did not fit in the queue. While it is non-empty every new
+        # event goes here too, so the writer sees them in arrival order.
+        self._overflow: "deque[Tuple[str, str, Dict[str, Any], int]]" = deque()
+        self._overflow_maxsize = self._queue.maxsize
+        self._overflow_lock = threading.Lock()
+        self._progress = threading.Condition()
+        self._enqueued_seq = 0
+        self._applied_seq = 0
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+        self.stats: Dict[str, int] = {"applied": 0, "failed": 0, "dropped": 0, "overflowed": 0, "batches": 0}
+
     def _init_db(self):
         with self._lock:
             cur = self._conn.cursor()
             cur.execute("PRAGMA journal_mode=WAL;")
-            cur.execute("PRAGMA synchronous=NORMAL;")
+            cur.execute(f"PRAGMA synchronous={_DURABILITY_LEVELS[self._durability]};")
             cur.execute(
                 """
                 CREATE TABLE IF NOT EXISTS runs (
@@ -82,20 +157,191 @@ class RunStore:
             self._conn.commit()
 
     def apply_event(self, name: str, payload: Dict[str, Any], timestamp_ms: int):
+        """Record one event; returns once it is queued for the writer thread.
+
+        With ``async_writes=False`` the event is committed before returning and
+        errors propagate to the caller.
+        """
         cid = payload.get("cid")
         if not cid:
             return
         lowered = (name or "").lower()
+        if not self.async_writes:
+            with self._lock:
+                try:
+                    self._dispatch_event(cid, lowered, payload, timestamp_ms)
+                finally:
+                    self._conn.commit()
+            return
+
+        if self._closed:
+            raise RuntimeError("RunStore is closed")
+        self._ensure_writer()
+        item = (cid, lowered, payload, timestamp_ms)
+        with self._progress:
+            # Reserve the sequence number before queueing so flush() covers in-flight events.
+            self._enqueued_seq += 1
+        if self.backpressure == "block":
+            self._queue.put(item)
+            return
+        with self._overflow_lock:
+            if not self._overflow:
+                try:
+                    self._queue.put_nowait(item)
+                    return
+                except queue.Full:
+                    pass
+            if lowered not in _DROPPABLE_EVENTS and len(self._overflow) < self._overflow_maxsize:
+                if not self._overflow:
+                    logger.warning(
+                        "RunStore writer queue full, spilling run events into overflow (at most %d)",
+                        self._overflow_maxsize,
+                    )
+                self._overflow.append(item)
+                self.stats["overflowed"] += 1
+                return
+        self.stats["dropped"] += 1
+        self._mark_applied(1)
+        logger.warning("RunStore writer queue full, dropped '%s' for run %s", lowered, cid)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every event applied before this call is committed.
+
+        Returns:
+            False if ``timeout`` elapsed first.
+        """
+        with self._progress:
+            target = self._enqueued_seq
+            if self._applied_seq >= target:
+                return True
+        try:
+            # Make the writer commit its current batch now instead of waiting out the interval.
+            self._queue.put_nowait(_FLUSH)
+        except queue.Full:
+            pass  # a full queue fills the batch up to batch_max_events right away
+        with self._progress:
+            return self._progress.wait_for(lambda: self._applied_seq >= target, timeout=timeout)
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Drain pending events, stop the writer thread and close the connection."""
+        if self._closed:
+            return
+        self._closed = True
+        writer = self._writer
+        if writer is not None and writer.is_alive():
+            self._queue.put(_STOP)
+            writer.join(timeout)
         with self._lock:
-            if lowered == "queue.enqueued":
-                self._upsert_queued(cid, payload, timestamp_ms)
-            elif lowered == "task.started":
-                self._upsert_started(cid, payload, timestamp_ms)
-            elif lowered == "task.finished":
-                self._upsert_finished(cid, payload, timestamp_ms)
-            elif lowered in {"node.finished", "node.failed"}:
-                self._upsert_node_terminal(cid, lowered, payload, timestamp_ms)
-            self._conn.commit()
+            self._conn.close()
+
+    def _ensure_writer(self):
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._writer_loop,
+                    name=f"RunStoreWriter-{self._db_path.name}",
+                    daemon=True,
+                )
+                self._writer.start()
+
+    def _mark_applied(self, count: int):
+        with self._progress:
+            self._applied_seq += count
+            self._progress.notify_all()
+
+    def _next_item(self, timeout: Optional[float] = None) -> Any:
+        """(writer thread) Queue first, then overflow: queued events are always the older ones."""
+        try:
+            return self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        with self._overflow_lock:
+            if self._overflow:
+                return self._overflow.popleft()
+        if timeout is not None and timeout <= 0:
+            raise queue.Empty
+        return self._queue.get(timeout=timeout)
+
+    def _drain_overflow(self) -> List[Tuple[str, str, Dict[str, Any], int]]:
+        with self._overflow_lock:
+            items = list(self._overflow)
+            self._overflow.clear()
+        return items
+
+    def _writer_loop(self):
+        while True:
+            item = self._next_item()
+            if item is _STOP:
+                self._commit_remaining(self._drain_overflow())
+                return
+            if item is _FLUSH:
+                continue
+            batch: List[Tuple[str, str, Dict[str, Any], int]] = [item]
+            stop = False
+            deadline = time.monotonic() + self.batch_interval_sec
+            while len(batch) < self.batch_max_events:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._next_item(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                if item is _FLUSH:
+                    break
+                batch.append(item)
+
+            if stop:
+                batch.extend(self._drain_overflow())
+            self._commit_remaining(batch)
+            if stop:
+                return
+
+    def _commit_remaining(self, batch: List[Tuple[str, str, Dict[str, Any], int]]):
+        if not batch:
+            return
+        try:
+            self._commit_batch(batch)
+        except Exception as exc:
+            logger.error("RunStore failed to commit %d event(s): %s", len(batch), exc, exc_info=True)
+        finally:
+            self._mark_applied(len(batch))
+
+    def _commit_batch(self, batch: List[Tuple[str, str, Dict[str, Any], int]]):
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for cid, lowered, payload, timestamp_ms in batch:
+                    # One savepoint per event: an illegal transition only rolls back itself.
+                    self._conn.execute("SAVEPOINT run_event")
+                    try:
+                        self._dispatch_event(cid, lowered, payload, timestamp_ms)
+                    except Exception as exc:
+                        self._conn.execute("ROLLBACK TO run_event")
+                        self.stats["failed"] += 1
+                        logger.error("RunStore apply_event failed: %s", exc)
+                    else:
+                        self.stats["applied"] += 1
+                    finally:
+                        self._conn.execute("RELEASE run_event")
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self.stats["batches"] += 1
+
+    def _dispatch_event(self, cid: str, lowered: str, payload: Dict[str, Any], timestamp_ms: int):
+        if lowered == "queue.enqueued":
+            self._upsert_queued(cid, payload, timestamp_ms)
+        elif lowered == "task.started":
+            self._upsert_started(cid, payload, timestamp_ms)
+        elif lowered == "task.finished":
+            self._upsert_finished(cid, payload, timestamp_ms)
+        elif lowered in {"node.finished", "node.failed"}:
+            self._upsert_node_terminal(cid, lowered, payload, timestamp_ms)
 
     def _get_current_status(self, cid: str) -> Optional[str]:
         row = self._conn.execute("SELECT status FROM runs WHERE cid = ?", (cid,)).fetchone()
@@ -315,7 +561,12 @@ class RunStore:
             ),
         )
 
+    def _flush_for_read(self):
+        if self.async_writes and self._writer is not None and self._writer.is_alive():
+            self.flush()
+
     def get_run(self, cid: str) -> Dict[str, Any]:
+        self._flush_for_read()
         with self._lock:
             row = self._conn.execute("SELECT * FROM runs WHERE cid = ?", (cid,)).fetchone()
             if not row:
@@ -345,6 +596,7 @@ class RunStore:
         task_name: Optional[str] = None,
         status: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
+        self._flush_for_read()
         with self._lock:
             clauses: List[str] = []
             params: List[Any] = []
@@ -364,6 +616,7 @@ class RunStore:
             return [dict(r) for r in rows]
 
     def get_metrics_snapshot(self, running_tasks: int = 0) -> Dict[str, Any]:
+        self._flush_for_read()
         with self._lock:
             out = {
                 "tasks_started": 0,
@@ -53,7 +53,15 @@ class ObservabilityService:
                 str(base_path / "logs" / "runs" / "run_store.sqlite3"),
             )
         ).resolve()
-        self.run_store = RunStore(run_store_path)
+        self.run_store = RunStore(
+            run_store_path,
+            async_writes=bool(get_config_value("observability.runs.writer.async", True)),
+            batch_max_events=int(get_config_value("observability.runs.writer.batch_max_events", 256)),
+            batch_interval_ms=float(get_config_value("observability.runs.writer.batch_interval_ms", 50)),
+            queue_maxsize=int(get_config_value("observability.runs.writer.queue_maxsize", 10000)),
+            durability=str(get_config_value("observability.runs.writer.durability", "normal")),
+            backpressure=str(get_config_value("observability.runs.writer.backpressure", "drop")),
+        )
 
         self._metrics: Dict[str, Any] = {
             "tasks_started": 0,
@@ -72,6 +80,9 @@ class ObservabilityService:
             "updated_at": time.time(),
         }
 
+        # 最近一次查询接口从 RunStore 读取的计数，供摄取路径合并使用。
+        self._store_metrics: Dict[str, Any] = {}
+
         self._ui_event_queue: queue.Queue = queue.Queue(maxsize=0)
 
     def get_ui_event_queue(self) -> queue.Queue:
@@ -428,7 +439,8 @@ class ObservabilityService:
         if persist_event and run_snapshot and self.persist_runs:
             await self._persist_run_snapshot(cid, run_snapshot)
         if metrics_changed and self._event_bus:
-            snap = self.get_metrics_snapshot()
+            # 摄取路径不查询也不 flush RunStore，避免每个事件都在事件循环上等待一次提交。
+            snap = self.get_metrics_snapshot(refresh_store=False)
             await self._event_bus.publish(Event(name="metrics.update", payload=snap))
 
     def get_queue_overview(self) -> Dict[str, Any]:
@@ -498,7 +510,13 @@ class ObservabilityService:
             )
         return {"items": items, "next_cursor": None}
 
-    def get_metrics_snapshot(self) -> Dict[str, Any]:
+    def get_metrics_snapshot(self, *, refresh_store: bool = True) -> Dict[str, Any]:
+        """返回指标快照。
+
+        Args:
+            refresh_store: 为 True 时（查询接口）先等待 RunStore 落盘再读取持久化计数；
+                为 False 时只合并内存计数与上一次读取到的持久化计数，不触碰 SQLite。
+        """
         with self._lock:
             running_tasks = 0
             if self._running_tasks_provider:
@@ -508,8 +526,9 @@ class ObservabilityService:
                     running_tasks = 0
             memory_snap = dict(self._metrics)
             if self.persist_runs:
-                store_snap = self.run_store.get_metrics_snapshot(running_tasks=running_tasks)
-                snap = dict(store_snap)
+                if refresh_store:
+                    self._store_metrics = self.run_store.get_metrics_snapshot(running_tasks=running_tasks)
+                snap = dict(self._store_metrics)
                 for key, value in memory_snap.items():
                     if key not in snap:
                         snap[key] = value
@@ -568,28 +587,29 @@ class ObservabilityService:
 
     def get_run_timeline(self, cid_or_trace: str) -> Dict[str, Any]:
         with self._lock:
-            cid = cid_or_trace
-            if cid_or_trace in self._obs_runs_by_trace:
-                cid = self._obs_runs_by_trace.get(cid_or_trace, cid_or_trace)
-
-            persisted = self.run_store.get_run(cid)
-            if persisted:
-                return {
-                    "cid": persisted.get("cid"),
-                    "trace_id": persisted.get("trace_id"),
-                    "trace_label": persisted.get("trace_label"),
-                    "parent_cid": persisted.get("parent_cid"),
-                    "plan_name": persisted.get("plan_name"),
-                    "task_name": persisted.get("task_name"),
-                    "started_at": persisted.get("started_at_ms"),
-                    "finished_at": persisted.get("finished_at_ms"),
-                    "queue_wait_ms": persisted.get("queue_wait_ms"),
-                    "duration_ms": persisted.get("duration_ms"),
-                    "exec_ms": persisted.get("exec_ms"),
-                    "status": persisted.get("status"),
-                    "nodes": persisted.get("nodes") or [],
-                }
+            cid = self._obs_runs_by_trace.get(cid_or_trace, cid_or_trace)
 
+        # RunStore 读取会等待写线程提交，必须在 self._lock 之外进行，
+        # 否则事件循环上的 ingest_event 会被阻塞。
+        persisted = self.run_store.get_run(cid)
+        if persisted:
+            return {
+                "cid": persisted.get("cid"),
+                "trace_id": persisted.get("trace_id"),
+                "trace_label": persisted.get("trace_label"),
+                "parent_cid": persisted.get("parent_cid"),
+                "plan_name": persisted.get("plan_name"),
+                "task_name": persisted.get("task_name"),
+                "started_at": persisted.get("started_at_ms"),
+                "finished_at": persisted.get("finished_at_ms"),
+                "queue_wait_ms": persisted.get("queue_wait_ms"),
+                "duration_ms": persisted.get("duration_ms"),
+                "exec_ms": persisted.get("exec_ms"),
+                "status": persisted.get("status"),
+                "nodes": persisted.get("nodes") or [],
+            }
+
+        with self._lock:
             # ✅ NEW: 先从运行队列查找，再从已完成队列查找
             run = self._obs_runs.get(cid)
             if not run:
@@ -666,9 +686,11 @@ class ObservabilityService:
 
     def get_batch_task_status(self, cids: List[str]) -> List[Dict[str, Any]]:
         results = []
+        # 同 get_run_timeline：持久化记录在 self._lock 之外读取。
+        persisted_runs = {cid: self.run_store.get_run(cid) for cid in dict.fromkeys(cids)}
         with self._lock:
             for cid in cids:
-                persisted = self.run_store.get_run(cid)
+                persisted = persisted_runs[cid]
                 if persisted:
                     results.append(
                         {
@@ -780,6 +802,10 @@ class ObservabilityService:
                 pass
             logger.info("[ObservabilityService] Cleanup task stopped")
 
+    def flush_run_store(self, timeout: Optional[float] = None) -> bool:
+        """等待 RunStore 写线程提交所有已接收的事件。"""
+        return self.run_store.flush(timeout=timeout)
+
     # ========== ✅ NEW: 前端查询API（选项3扩展） ==========
 
     def get_completed_runs(self, limit: int = 100) -> List[Dict[str, Any]]:
@@ -50,6 +50,12 @@ class PlanRegistry:
 
         with self._scheduler.fallback_lock:
             load_core()
+        self._notify_schedule_changed()
+
+    def _notify_schedule_changed(self):
+        scheduling_service = getattr(self._scheduler, "scheduling_service", None)
+        if scheduling_service is not None:
+            scheduling_service.notify_schedule_changed()
 
     def load_all_tasks_definitions(self):
         logger.info("--- Loading all task definitions ---")
@@ -170,6 +176,7 @@ class PlanRegistry:
                     self._scheduler.run_statuses.setdefault(item_id, {"status": "idle"})
             except Exception as exc:
                 logger.error(f"Failed to load schedule '{schedule_path}': {exc}")
+            self._notify_schedule_changed()
 
     def load_interrupt_file(self, plan_dir: Path, plan_name: str):
         interrupt_path = plan_dir / "interrupts.yaml"
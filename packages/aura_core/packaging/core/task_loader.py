@@ -3,23 +3,15 @@
 
 from __future__ import annotations
 
+import os
 import threading
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import yaml
 
-try:
-    from cachetools import TTLCache
-    from cachetools.keys import hashkey
-
-    CACHETOOLS_AVAILABLE = True
-except ImportError:
-    CACHETOOLS_AVAILABLE = False
-    TTLCache = dict  # type: ignore
-    hashkey = lambda *args, **kwargs: str(args)  # type: ignore
-
 from packages.aura_core.config.loader import get_config_value
 from packages.aura_core.observability.logging.core_logger import logger
 
@@ -46,13 +38,154 @@ class TaskLoadErrorRecord:
         }
 
 
-class TaskLoader:
-    """Load and cache task yaml files for one plan."""
+FileSignature = Tuple[int, int, int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedTaskFile:
+    """Outcome of parsing and validating one task file.
+
+    Successful parses carry ``data``; failures carry ``error_code``/``message``
+    plus whatever was parsed before validation failed, so each loader can
+    rebuild its own :class:`TaskLoadErrorRecord` without re-reading the file.
+    """
+
+    data: Dict[str, Any] = field(default_factory=dict)
+    error_code: Optional[str] = None
+    message: str = ""
+    raw_data: Any = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error_code is None
+
+
+def _file_signature(file_path: Path) -> Optional[FileSignature]:
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class TaskDefinitionCache:
+    """Process-wide LRU of parsed task files, validated by file identity.
+
+    Entries are keyed by resolved path and remember the file's
+    ``(st_dev, st_ino, st_mtime_ns, st_size)`` plus the cache version at parse
+    time. A lookup costs one ``stat``: an edited, replaced or renamed-over file,
+    or a bumped version, forces a re-parse. The parsed dicts are shared by
+    every reader (task loader, plan registry, orchestrator) and must be
+    treated as read-only.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = max(0, int(maxsize))
+        self._entries: "OrderedDict[str, Tuple[FileSignature, int, ParsedTaskFile]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._file_locks: Dict[str, threading.Lock] = {}
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, file_path: Path, parse: Callable[[Path], ParsedTaskFile]) -> ParsedTaskFile:
+        key = str(Path(file_path).resolve())
+        signature = _file_signature(file_path)
+        if signature is None:
+            self.invalidate(file_path)
+            return ParsedTaskFile()
+
+        cached = self._lookup(key, signature)
+        if cached is not None:
+            return cached
+
+        with self._file_lock(key):
+            # Another thread may have parsed the same file while we waited.
+            cached = self._lookup(key, signature, count=False)
+            if cached is not None:
+                return cached
+            with self._lock:
+                version = self.version
+            parsed = parse(file_path)
+            if self.maxsize > 0:
+                with self._lock:
+                    self._entries[key] = (signature, version, parsed)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+            return parsed
+
+    def peek(self, file_path: Path) -> Optional[ParsedTaskFile]:
+        """Return the cached entry if it is still valid, without ever parsing.
+
+        Costs one ``stat``; a miss is not counted, since the caller is expected
+        to follow up with :meth:`get_or_load` (typically off the event loop).
+        """
+        signature = _file_signature(file_path)
+        if signature is None:
+            return None
+        cached = self._lookup(str(Path(file_path).resolve()), signature, count=False)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+        return cached
+
+    def _lookup(self, key: str, signature: FileSignature, count: bool = True) -> Optional[ParsedTaskFile]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature and entry[1] == self.version:
+                self._entries.move_to_end(key)
+                if count:
+                    self.hits += 1
+                return entry[2]
+            if count:
+                self.misses += 1
+            return None
+
+    def _file_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._file_locks.get(key)
+            if lock is None:
+                lock = self._file_locks[key] = threading.Lock()
+            return lock
+
+    def invalidate(self, file_path: Optional[Path] = None) -> None:
+        """Drop one file, or bump the version to invalidate every entry."""
+        with self._lock:
+            if file_path is None:
+                self.version += 1
+                self._entries.clear()
+            else:
+                self._entries.pop(str(Path(file_path).resolve()), None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "version": self.version,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_definition_cache: Optional[TaskDefinitionCache] = None
+_definition_cache_lock = threading.Lock()
 
-    _global_cache_version = 0
-    _version_lock = threading.Lock()
-    _file_locks: Dict[str, threading.RLock] = {}
-    _locks_lock = threading.Lock()
+
+def get_task_definition_cache() -> TaskDefinitionCache:
+    """Return the process-wide parsed task definition cache."""
+    global _definition_cache
+    if _definition_cache is None:
+        with _definition_cache_lock:
+            if _definition_cache is None:
+                maxsize = int(get_config_value("task_loader.cache_maxsize", 1024))
+                _definition_cache = TaskDefinitionCache(maxsize=maxsize)
+    return _definition_cache
+
+
+class TaskLoader:
+    """Load task yaml files for one plan through the shared definition cache."""
 
     def __init__(self, plan_name: str, plan_path: Path, manifest: Optional[Any] = None):
         self.plan_name = plan_name
@@ -65,12 +198,7 @@ class TaskLoader:
         self.task_paths = [path for path in self.task_paths if path.is_dir()]
         self.tasks_dir = self.task_paths[0] if self.task_paths else plan_path / "tasks"
 
-        cache_maxsize = int(get_config_value("task_loader.cache_maxsize", 1024))
-        cache_ttl = int(get_config_value("task_loader.cache_ttl_sec", 300))
-        self.cache = TTLCache(maxsize=cache_maxsize, ttl=cache_ttl)
-
-        with TaskLoader._version_lock:
-            self.cache_version = TaskLoader._global_cache_version
+        self.cache = get_task_definition_cache()
 
         enable_schema_validation = get_config_value("task_loader.enable_schema_validation", True)
         strict_validation = get_config_value("task_loader.strict_validation", False)
@@ -83,24 +211,9 @@ class TaskLoader:
 
     @classmethod
     def invalidate_all_caches(cls):
-        with cls._version_lock:
-            cls._global_cache_version += 1
-            logger.info("Task loader caches invalidated, version=%s", cls._global_cache_version)
-
-    def _is_cache_valid(self) -> bool:
-        with TaskLoader._version_lock:
-            return self.cache_version == TaskLoader._global_cache_version
-
-    def _update_cache_version(self):
-        with TaskLoader._version_lock:
-            self.cache_version = TaskLoader._global_cache_version
-
-    def _get_file_lock(self, file_path: Path) -> threading.RLock:
-        file_path_str = str(file_path)
-        with TaskLoader._locks_lock:
-            if file_path_str not in TaskLoader._file_locks:
-                TaskLoader._file_locks[file_path_str] = threading.RLock()
-            return TaskLoader._file_locks[file_path_str]
+        cache = get_task_definition_cache()
+        cache.invalidate()
+        logger.info("Task loader caches invalidated, version=%s", cache.version)
 
     @staticmethod
     def _format_raw_data_preview(raw_data: Any, *, max_chars: int = 4000) -> str:
@@ -121,78 +234,75 @@ class TaskLoader:
         return dumped
 
     def _load_and_parse_file(self, file_path: Path) -> Dict[str, Any]:
-        if not self._is_cache_valid():
-            logger.debug("Task cache expired for plan '%s', clearing local cache", self.plan_name)
-            self.cache.clear()
-            self._update_cache_version()
-
-        file_lock = self._get_file_lock(file_path)
-        with file_lock:
-            key = hashkey(file_path)
-            try:
-                return self.cache[key]
-            except KeyError:
-                pass
+        parsed = self.cache.get_or_load(file_path, self._parse_file)
+        if parsed.ok:
+            self._clear_file_error(file_path)
+            return parsed.data
+        error = self._make_error_record(
+            file_path=file_path,
+            error_code=parsed.error_code,
+            message=parsed.message,
+            raw_data=parsed.raw_data,
+        )
+        self._record_file_error(file_path, error)
+        return {}
 
-            if not file_path.is_file():
-                self.cache[key] = {}
-                self._clear_file_error(file_path)
-                return {}
+    def _parse_file(self, file_path: Path) -> ParsedTaskFile:
+        data = None
+        try:
+            with open(file_path, "r", encoding="utf-8") as handle:
+                data = yaml.safe_load(handle)
+            result = data if isinstance(data, dict) else {}
+            self.task_validator.validate_file(result, file_path)
+
+            # Only task definitions get the default; setting it on every value
+            # would inject a bogus "execution_mode" step into single-task files.
+            for _, task_def in self._iter_task_definitions(result, file_path):
+                task_def.setdefault("execution_mode", "sync")
+
+            return ParsedTaskFile(data=result)
+        except yaml.YAMLError as exc:
+            logger.error("Failed to parse task file '%s': %s", file_path, exc)
+            return ParsedTaskFile(
+                error_code="yaml_parse_failed",
+                message=f"Failed to parse YAML file '{file_path.name}': {exc}",
+            )
+        except TaskValidationError as exc:
+            logger.error(
+                "Task file validation failed '%s' [code=%s]: %s",
+                file_path,
+                exc.code,
+                exc,
+            )
+            logger.error(
+                "Task file validation raw_data preview '%s':\n%s",
+                file_path,
+                self._format_raw_data_preview(data),
+            )
+            return ParsedTaskFile(error_code=exc.code, message=str(exc), raw_data=data)
+        except Exception as exc:
+            logger.error("Failed to load task file '%s': %s", file_path, exc)
+            return ParsedTaskFile(
+                error_code="task_load_failed",
+                message=f"Failed to load task file '{file_path.name}': {exc}",
+                raw_data=data,
+            )
 
-            try:
-                with open(file_path, "r", encoding="utf-8") as handle:
-                    data = yaml.safe_load(handle)
-                result = data if isinstance(data, dict) else {}
-                self.task_validator.validate_file(result, file_path)
-
-                for task_def in result.values():
-                    if isinstance(task_def, dict):
-                        task_def.setdefault("execution_mode", "sync")
-
-                self.cache[key] = result
-                self._clear_file_error(file_path)
-                return result
-            except yaml.YAMLError as exc:
-                error = self._make_error_record(
-                    file_path=file_path,
-                    error_code="yaml_parse_failed",
-                    message=f"Failed to parse YAML file '{file_path.name}': {exc}",
-                    raw_data=None,
-                )
-                self._record_file_error(file_path, error)
-                logger.error("Failed to parse task file '%s': %s", file_path, exc)
-                return {}
-            except TaskValidationError as exc:
-                raw_data = locals().get("result", None) or locals().get("data", None)
-                error = self._make_error_record(
-                    file_path=file_path,
-                    error_code=exc.code,
-                    message=str(exc),
-                    raw_data=raw_data,
-                )
-                self._record_file_error(file_path, error)
-                logger.error(
-                    "Task file validation failed '%s' [code=%s]: %s",
-                    file_path,
-                    exc.code,
-                    exc,
-                )
-                logger.error(
-                    "Task file validation raw_data preview '%s':\n%s",
-                    file_path,
-                    self._format_raw_data_preview(raw_data),
-                )
-                return {}
-            except Exception as exc:
-                error = self._make_error_record(
-                    file_path=file_path,
-                    error_code="task_load_failed",
-                    message=f"Failed to load task file '{file_path.name}': {exc}",
-                    raw_data=locals().get("result", None) or locals().get("data", None),
-                )
-                self._record_file_error(file_path, error)
-                logger.error("Failed to load task file '%s': %s", file_path, exc)
-                return {}
+    def load_task_file(self, file_path: Path) -> Dict[str, Any]:
+        """Return the parsed contents of one task file, raising on load errors."""
+        parsed = self.cache.get_or_load(file_path, self._parse_file)
+        if not parsed.ok:
+            raise ValueError(parsed.message)
+        return parsed.data
+
+    def get_cached_task_file(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Like :meth:`load_task_file`, but return None instead of parsing on a cache miss."""
+        parsed = self.cache.peek(file_path)
+        if parsed is None:
+            return None
+        if not parsed.ok:
+            raise ValueError(parsed.message)
+        return parsed.data
 
     def _record_file_error(self, file_path: Path, error: TaskLoadErrorRecord) -> None:
         relative_path = self._to_relative_source_file(file_path)
@@ -412,10 +522,8 @@ class TaskLoader:
         return all_definitions
 
     def reload_task_file(self, file_path: Path) -> None:
-        key = hashkey(file_path)
-        if key in self.cache:
-            logger.info("[TaskLoader] clearing cache for task file: %s", file_path.name)
-            del self.cache[key]
+        logger.info("[TaskLoader] clearing cache for task file: %s", file_path.name)
+        self.cache.invalidate(file_path)
 
         self._load_and_parse_file(file_path)
         logger.info("[TaskLoader] reloaded task file: %s", file_path.name)
@@ -699,6 +699,10 @@ class Scheduler:
         """Reorder the queue."""
         return await self.dispatch.queue_reorder(cid_order)
 
+    async def queue_update_priority(self, cid: str, priority: int) -> Dict[str, Any]:
+        """Change the numeric priority of a queued task."""
+        return await self.dispatch.queue_update_priority(cid, priority)
+
     def update_task_priority(self, cid: str, new_priority: int) -> Dict[str, Any]:
         """调整指定任务的优先级。
 
@@ -711,16 +715,11 @@ class Scheduler:
         Returns:
             包含操作结果的字典
         """
-        # 由于当前的 TaskQueue 实现基于 asyncio.PriorityQueue，
-        # 无法直接修改已入队任务的优先级。
-        # 这需要重新实现队列或在任务未入队时设置优先级。
-
-        logger.warning(f"Priority update for task '{cid}' is not fully implemented yet.")
-        return {
-            "status": "error",
-            "message": "Priority update is not supported for tasks already in the queue. "
-                       "This feature requires queue implementation upgrade."
-        }
+        try:
+            return self.run_on_control_loop(self.queue_update_priority(cid, new_priority), timeout=5.0)
+        except Exception as exc:
+            logger.warning(f"Priority update for task '{cid}' failed: {exc}")
+            return {"status": "error", "message": f"Priority update failed: {exc}"}
 
     async def _enqueue_schedule_item(self, item: Dict[str, Any], *, source: str,
                                      triggering_event: Optional[Event] = None) -> bool:
@@ -23,26 +23,38 @@ class DispatchService:
     def list_queue(self, state: str, limit: int = 200) -> dict:
         return self._scheduler.list_queue(state, limit)
 
+    def _notify_capacity_changed(self) -> None:
+        notify = getattr(self._scheduler.execution_manager, "notify_capacity_changed", None)
+        if notify is not None:
+            notify()
+
     async def consume_main_task_queue(self):
-        max_cc = int(getattr(self._scheduler.execution_manager, "max_concurrent_tasks", 1) or 1)
-        queue_full_sleep = float(get_config_value("scheduler.loop_sleep_sec.queue_full", 0.2))
+        execution_manager = self._scheduler.execution_manager
+        slot_recheck_sec = float(get_config_value("scheduler.dispatch.slot_recheck_sec", 5.0))
         consumer_error_sleep = float(get_config_value("scheduler.loop_sleep_sec.consumer_error", 0.5))
 
+        def _max_concurrency() -> int:
+            # 0 表示暂停派发；未配置时退回 1。
+            value = getattr(execution_manager, "max_concurrent_tasks", 1)
+            return max(0, int(1 if value is None else value))
+
+        def _has_slot() -> bool:
+            # len() 是原子操作；写入方都在控制循环上，因此这里无需线程锁。
+            return len(self._scheduler.running_tasks) < _max_concurrency()
+
         while True:
             try:
-                with self._scheduler.fallback_lock:
-                    current_running_count = len(self._scheduler.running_tasks)
-                    running_keys = list(self._scheduler.running_tasks.keys())
+                current_running_count = len(self._scheduler.running_tasks)
                 queue_size = self._scheduler.task_queue.qsize()
                 if current_running_count > 0 or queue_size > 0:
                     logger.debug(  # 改为DEBUG级别，避免过多INFO日志
-                        f"[Queue Consumer] current status running={current_running_count}/{max_cc}, "
-                        f"queue_size={queue_size}, keys={running_keys}"
+                        f"[Queue Consumer] current status running={current_running_count}/{_max_concurrency()}, "
+                        f"queue_size={queue_size}"
                     )
 
-                if current_running_count >= max_cc:
-                    logger.debug("[Queue Consumer] concurrency limit reached, waiting...")  # 改为DEBUG级别
-                    await asyncio.sleep(queue_full_sleep)
+                if not _has_slot():
+                    logger.debug("[Queue Consumer] concurrency limit reached, waiting for a free slot...")
+                    await execution_manager.wait_for_capacity(_has_slot, timeout=slot_recheck_sec)
                     continue
 
                 tasklet = await self._scheduler.task_queue.get()
@@ -108,6 +120,7 @@ class DispatchService:
                             # ✅ 降低日志级别：这可能是正常的双重清理
                             logger.debug(f"[consume_main_task_queue] running task key already removed={key}")
                     finally:
+                        self._notify_capacity_changed()
                         try:
                             self._scheduler.task_queue.task_done()
                         except Exception:
@@ -349,6 +362,13 @@ class DispatchService:
             return {"status": "success", "message": f"Task {cid} moved to position {new_index}"}
         return {"status": "error", "message": f"Task {cid} not found in queue"}
 
+    async def queue_update_priority(self, cid: str, priority: int) -> Dict[str, Any]:
+        success = await self._scheduler.task_queue.update_priority(cid, priority)
+
+        if success:
+            return {"status": "success", "message": f"Task {cid} priority set to {priority}"}
+        return {"status": "error", "message": f"Task {cid} not found in queue"}
+
     async def queue_list_all(self) -> List[Dict[str, Any]]:
         return await self._scheduler.task_queue.list_all()
 
@@ -22,7 +22,7 @@ import asyncio
 import queue
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional, List, TYPE_CHECKING
+from typing import Callable, Dict, Any, Optional, List, TYPE_CHECKING
 
 from ...api import hook_manager
 from ...types import TaskRefResolver
@@ -56,6 +56,30 @@ class ExecutionManager:
         self._global_sem = asyncio.Semaphore(max_concurrent_tasks)
         self._resource_sems: Dict[str, asyncio.Semaphore] = {}
         self._resource_sem_lock = asyncio.Lock()
+        self._capacity_event = asyncio.Event()
+
+    def notify_capacity_changed(self):
+        """通知等待执行槽位的消费者重新检查并发余量（需在控制循环线程中调用）。"""
+        self._capacity_event.set()
+
+    async def wait_for_capacity(self, has_capacity: Callable[[], bool], timeout: Optional[float] = None) -> bool:
+        """等待直到 `has_capacity()` 为真。
+
+        每当有任务结束时会被立即唤醒重新检查；`timeout` 仅作为兜底，
+        防止跨线程修改运行表时丢失通知。
+
+        Returns:
+            bool: 返回时是否已有空闲槽位。
+        """
+        while not has_capacity():
+            self._capacity_event.clear()
+            if has_capacity():
+                break
+            try:
+                await asyncio.wait_for(self._capacity_event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return has_capacity()
+        return True
 
     def set_ui_update_queue(self, q: queue.Queue):
         """设置用于向UI发送更新的队列。
@@ -212,6 +236,7 @@ class ExecutionManager:
                         self.scheduler._running_task_meta.pop(tasklet.cid, None)
                 except Exception as lock_e:
                     logger.warning(f"清理 running_tasks 时发生异常 (cid: {tasklet.cid}): {lock_e}")
+            self.notify_capacity_changed()
 
             await hook_manager.trigger('after_task_run', task_context=task_context)
             logger.debug(f"任务 '{task_name_for_log}' 执行完毕，资源已释放。")
@@ -333,7 +333,8 @@ class LifecycleManager:
             self.scheduler.api_log_queue = queue.Queue(maxsize=0)
 
         self.scheduler.task_queue = TaskQueue(
-            maxsize=int(get_config_value("scheduler.queue.main_maxsize", 1000))
+            maxsize=int(get_config_value("scheduler.queue.main_maxsize", 1000)),
+            plan_weights=get_config_value("scheduler.queue.plan_weights", {}) or {},
         )
         self.scheduler.event_task_queue = TaskQueue(
             maxsize=int(get_config_value("scheduler.queue.event_maxsize", 2000))
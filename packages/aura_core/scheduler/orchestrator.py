@@ -22,7 +22,7 @@ import yaml
 
 from packages.aura_core.config.template import TemplateRenderer
 from packages.aura_core.context.plan import PlanContext, current_plan_name
-from packages.aura_core.context.persistence.strategy import NoPersistence, StateStorePersistence
+from packages.aura_core.context.persistence.strategy import DatabasePersistence, NoPersistence, StateStorePersistence
 from packages.aura_core.context.persistence.store_service import StateStoreService
 from packages.aura_core.context.state.planner import StatePlanner
 from packages.aura_core.observability.events import Event, EventBus
@@ -97,6 +97,13 @@ class Orchestrator:
             if strategy_type == 'file':
                 storage_path = persistence_config.get('path', f'./plan_states/{self.plan_name}_state.json')
                 persistence_strategy = StateStorePersistence(storage_path)
+            elif strategy_type == 'sqlite':
+                storage_path = persistence_config.get('path', f'./plan_states/{self.plan_name}_state.db')
+                persistence_strategy = DatabasePersistence(
+                    storage_path,
+                    migrate_from=persistence_config.get('migrate_from', f'./plan_states/{self.plan_name}_state.json'),
+                    synchronous=persistence_config.get('synchronous', 'NORMAL'),
+                )
             else:
                 persistence_strategy = NoPersistence()
         else:
@@ -139,24 +146,18 @@ class Orchestrator:
                     )
             raise ValueError(error_msg)
 
+        # 通过共享的解析缓存加载：命中时只需一次 stat，直接在事件循环上返回；
+        # 未命中（首次加载或文件已变更）时在线程中读取、解析与校验，不阻塞事件循环。
         try:
-            if ASYNC_FILE_OPS_AVAILABLE and aiofiles is not None:
-                async with aiofiles.open(full_path, 'r', encoding='utf-8') as handle:
-                    content = await handle.read()
-            else:
-                content = await asyncio.to_thread(full_path.read_text, encoding='utf-8')
-            task_file_data = yaml.safe_load(content)
-
-            if not isinstance(task_file_data, dict):
-                raise ValueError(f"Task file must contain a dictionary, got {type(task_file_data)}")
-
-            logger.debug(f"Loaded task file '{task_file_path}' with {len(task_file_data)} task(s)")
-            return task_file_data
-        except yaml.YAMLError as exc:
-            raise ValueError(f"Failed to parse YAML file '{task_file_path}': {exc}") from exc
+            task_file_data = self.task_loader.get_cached_task_file(full_path)
+            if task_file_data is None:
+                task_file_data = await asyncio.to_thread(self.task_loader.load_task_file, full_path)
         except Exception as exc:
             raise ValueError(f"Failed to load task file '{task_file_path}': {exc}") from exc
 
+        logger.debug(f"Loaded task file '{task_file_path}' with {len(task_file_data)} task(s)")
+        return task_file_data
+
     @staticmethod
     def _build_event_task_name(
         task_file_path: Optional[str],
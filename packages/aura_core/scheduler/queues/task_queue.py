@@ -4,12 +4,22 @@
 此模块定义了两个核心类：
 - `Tasklet`: 一个轻量级的数据类，代表一个待执行的任务单元。
 - `TaskQueue`: 一个支持高级操作（插入、删除、重排序）的异步任务队列。
+
+`TaskQueue` 内部是一个按方案（plan）分组的优先级队列：
+- 每个方案一个按 `(priority, 入队序号)` 排序的最小堆，数字越小优先级越高；
+- 同一优先级下，各方案之间按加权差额轮询（Deficit Round Robin）公平出队，
+  避免单个方案的突发任务饿死其他方案；
+- 用户显式排序（`high_priority`、`insert_at`、`move_*`、`reorder`）的任务进入
+  "钉住"通道，先于公平调度部分出队；
+- cid 索引 + 惰性删除使取消为 O(1)；`list_all` 返回按版本号缓存的快照。
 """
 import asyncio
+import heapq
+import itertools
 import time
 from collections import deque
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any, Literal, Callable
+from typing import Optional, List, Dict, Any, Literal, Callable, Tuple
 
 from ...observability.events import Event
 
@@ -32,6 +42,7 @@ class Tasklet:
         timeout (Optional[float]): 任务的执行超时时间（秒）。
         cpu_bound (bool): 标记此任务是否为CPU密集型。
         planning_depth (int): ✅ 状态规划深度，用于防止无限递归。
+        priority (int): 队列优先级，数字越小越先出队，默认为 0。
     """
     task_name: str
     cid: Optional[str] = None
@@ -48,32 +59,253 @@ class Tasklet:
     cpu_bound: bool = False
     enqueued_at: float = field(default_factory=time.time)
     planning_depth: int = 0  # ✅ 新增：状态规划递归深度
+    priority: int = 0
+
+
+@dataclass(eq=False)
+class _QueueEntry:
+    """(私有) 队列中的一个条目；`removed` 用于堆与钉住通道内的惰性删除。"""
+    tasklet: Tasklet
+    plan: str
+    priority: int
+    seq: int
+    removed: bool = False
+    pinned: bool = False
 
 
 class TaskQueue:
     """一个支持高级操作的、异步的、有界任务队列。
 
     支持的操作：
+    - 数值优先级与按方案的加权公平出队
     - 插入任务到任意位置
-    - 删除队列中的任务
-    - 调整任务顺序
+    - 按 cid 以 O(1) 删除队列中的任务
+    - 调整任务顺序与优先级
     - 批量操作
     """
 
-    def __init__(self, maxsize: int = 1000):
+    def __init__(self, maxsize: int = 1000, plan_weights: Optional[Dict[str, float]] = None):
         """初始化任务队列。
 
         Args:
             maxsize (int): 队列的最大容量，用于实现背压（back-pressure）。
+            plan_weights (Optional[Dict[str, float]]): 各方案的公平调度权重，
+                未列出的方案权重为 1。权重越大，同一优先级下每轮可连续出队的任务越多。
         """
         self._maxsize = maxsize
-        self._queue: deque[Tasklet] = deque()
+        self._plan_weights: Dict[str, float] = {
+            str(plan): max(0.01, float(weight)) for plan, weight in (plan_weights or {}).items()
+        }
+        self._pinned: deque[_QueueEntry] = deque()
+        self._pinned_live = 0
+        self._plan_heaps: Dict[str, List[Tuple[int, int, int, _QueueEntry]]] = {}
+        self._plan_live: Dict[str, int] = {}
+        self._deficits: Dict[str, float] = {}
+        self._ring: deque[str] = deque()
+        self._entries: Dict[int, _QueueEntry] = {}
+        self._cid_index: Dict[str, _QueueEntry] = {}
+        self._seq = itertools.count()
+        self._heap_tiebreak = itertools.count()
+        self._version = 0
+        self._snapshot: Optional[Tuple[int, List[Dict[str, Any]]]] = None
+
         self._lock = asyncio.Lock()
         self._not_empty = asyncio.Condition(self._lock)
         self._not_full = asyncio.Condition(self._lock)
         self._unfinished_tasks = 0
 
-    async def put(self, tasklet: Tasklet, high_priority: bool = False):
+    # ========== 内部结构维护 ==========
+
+    @staticmethod
+    def _plan_of(tasklet: Tasklet) -> str:
+        payload = tasklet.payload if isinstance(tasklet.payload, dict) else {}
+        plan_name = payload.get("plan_name")
+        if plan_name:
+            return str(plan_name)
+        task_name = tasklet.task_name or ""
+        return task_name.split("/", 1)[0] if "/" in task_name else ""
+
+    def _weight_of(self, plan: str) -> float:
+        return self._plan_weights.get(plan, 1.0)
+
+    def _new_entry(self, tasklet: Tasklet, priority: Optional[int] = None) -> _QueueEntry:
+        if priority is not None:
+            tasklet.priority = int(priority)
+        return _QueueEntry(
+            tasklet=tasklet,
+            plan=self._plan_of(tasklet),
+            priority=int(getattr(tasklet, "priority", 0) or 0),
+            seq=next(self._seq),
+        )
+
+    def _track(self, entry: _QueueEntry):
+        self._entries[entry.seq] = entry
+        if entry.tasklet.cid:
+            self._cid_index[entry.tasklet.cid] = entry
+        self._version += 1
+
+    def _untrack(self, entry: _QueueEntry):
+        self._entries.pop(entry.seq, None)
+        cid = entry.tasklet.cid
+        if cid and self._cid_index.get(cid) is entry:
+            del self._cid_index[cid]
+        self._version += 1
+
+    def _push_fair(self, entry: _QueueEntry):
+        heap = self._plan_heaps.setdefault(entry.plan, [])
+        heapq.heappush(heap, (entry.priority, entry.seq, next(self._heap_tiebreak), entry))
+        live = self._plan_live.get(entry.plan, 0)
+        if live == 0:
+            self._ring.append(entry.plan)
+            self._deficits[entry.plan] = 0.0
+        self._plan_live[entry.plan] = live + 1
+        self._track(entry)
+
+    def _detach(self, entry: _QueueEntry):
+        """从所在结构中摘除一个条目（钉住通道与堆内均为惰性删除）。"""
+        if entry.removed:
+            return
+        entry.removed = True
+        self._untrack(entry)
+        if entry.pinned:
+            self._pinned_live -= 1
+            if self._pinned_live <= 0:
+                self._pinned.clear()
+                self._pinned_live = 0
+            return
+        live = self._plan_live.get(entry.plan, 0) - 1
+        if live <= 0:
+            self._drop_plan(entry.plan)
+        else:
+            self._plan_live[entry.plan] = live
+
+    def _drop_plan(self, plan: str):
+        self._plan_heaps.pop(plan, None)
+        self._plan_live.pop(plan, None)
+        self._deficits.pop(plan, None)
+        try:
+            self._ring.remove(plan)
+        except ValueError:
+            pass
+
+    @staticmethod
+    def _heap_head(heap: List[Tuple[int, int, int, _QueueEntry]]) -> Optional[_QueueEntry]:
+        while heap and heap[0][-1].removed:
+            heapq.heappop(heap)
+        return heap[0][-1] if heap else None
+
+    @classmethod
+    def _select_fair(
+        cls,
+        heaps: Dict[str, List[Tuple[int, int, int, _QueueEntry]]],
+        ring: deque,
+        deficits: Dict[str, float],
+        weight_of: Callable[[str], float],
+    ) -> Optional[_QueueEntry]:
+        """按"最高优先级 + 加权差额轮询"从公平部分弹出下一个条目。
+
+        只读取/修改传入的结构，因此既用于真实出队，也用于在副本上推演快照顺序。
+        """
+        heads = {plan: cls._heap_head(heaps[plan]) for plan in ring}
+        live_heads = [head for head in heads.values() if head is not None]
+        if not live_heads:
+            return None
+        top_priority = min(head.priority for head in live_heads)
+
+        while True:
+            plan = ring[0]
+            head = heads.get(plan)
+            if head is None or head.priority != top_priority:
+                ring.rotate(-1)
+                continue
+            if deficits.get(plan, 0.0) < 1:
+                deficits[plan] = deficits.get(plan, 0.0) + weight_of(plan)
+                if deficits[plan] < 1:
+                    ring.rotate(-1)
+                    continue
+            deficits[plan] -= 1
+            heapq.heappop(heaps[plan])
+            next_head = cls._heap_head(heaps[plan])
+            if next_head is None:
+                ring.popleft()
+                deficits.pop(plan, None)
+            elif deficits[plan] < 1 or next_head.priority != top_priority:
+                ring.rotate(-1)
+            return head
+
+    def _compact_pinned(self):
+        """清理钉住通道中已惰性删除的条目，使下标与实际出队位置一致。"""
+        if len(self._pinned) != self._pinned_live:
+            self._pinned = deque(entry for entry in self._pinned if not entry.removed)
+
+    def _append_pinned(self, entry: _QueueEntry, left: bool = False):
+        entry.pinned = True
+        if left:
+            self._pinned.appendleft(entry)
+        else:
+            self._pinned.append(entry)
+        self._pinned_live += 1
+
+    def _pop_next(self) -> Optional[_QueueEntry]:
+        if self._pinned_live:
+            entry = self._pinned.popleft()
+            while entry.removed:
+                entry = self._pinned.popleft()
+            self._pinned_live -= 1
+        else:
+            entry = self._select_fair(self._plan_heaps, self._ring, self._deficits, self._weight_of)
+            if entry is None:
+                return None
+            live = self._plan_live.get(entry.plan, 0) - 1
+            if live <= 0:
+                self._drop_plan(entry.plan)
+            else:
+                self._plan_live[entry.plan] = live
+        entry.removed = True
+        self._untrack(entry)
+        return entry
+
+    def _pin_prefix(self, count: int):
+        """把当前出队顺序的前 `count` 个条目冻结进钉住通道，保证位置语义。"""
+        while self._pinned_live < count:
+            entry = self._select_fair(self._plan_heaps, self._ring, self._deficits, self._weight_of)
+            if entry is None:
+                return
+            live = self._plan_live.get(entry.plan, 0) - 1
+            if live <= 0:
+                self._drop_plan(entry.plan)
+            else:
+                self._plan_live[entry.plan] = live
+            self._append_pinned(entry)
+        self._version += 1
+
+    def _insert_pinned(self, index: int, entry: _QueueEntry):
+        index = max(0, index)
+        self._pin_prefix(index)
+        self._compact_pinned()
+        entry.pinned = True
+        self._pinned.insert(min(index, len(self._pinned)), entry)
+        self._pinned_live += 1
+        self._track(entry)
+
+    def _ordered_entries(self) -> List[_QueueEntry]:
+        """在结构副本上推演完整出队顺序。"""
+        ordered = [entry for entry in self._pinned if not entry.removed]
+        heaps = {plan: list(heap) for plan, heap in self._plan_heaps.items()}
+        ring = deque(self._ring)
+        deficits = dict(self._deficits)
+        while True:
+            entry = self._select_fair(heaps, ring, deficits, self._weight_of)
+            if entry is None:
+                return ordered
+            ordered.append(entry)
+
+    def _size(self) -> int:
+        return len(self._entries)
+
+    # ========== 基础队列接口 ==========
+
+    async def put(self, tasklet: Tasklet, high_priority: bool = False, priority: Optional[int] = None):
         """将一个任务单元异步放入队列。
 
         如果队列已满，此操作将会阻塞等待，直到有空间可用。
@@ -81,38 +313,39 @@ class TaskQueue:
         Args:
             tasklet: 要放入的任务单元。
             high_priority: 如果为 True，任务将被插入到队列头部。
+            priority: 数值优先级（越小越先出队）；为 None 时使用 `tasklet.priority`。
         """
         async with self._not_full:
-            while len(self._queue) >= self._maxsize:
+            while self._size() >= self._maxsize:
                 await self._not_full.wait()
 
-            if high_priority:
-                self._queue.appendleft(tasklet)
-            else:
-                self._queue.append(tasklet)
-
+            self._put_entry(self._new_entry(tasklet, priority), high_priority)
             self._unfinished_tasks += 1
             self._not_empty.notify()
 
-    def put_nowait(self, tasklet: Tasklet, high_priority: bool = False):
+    def put_nowait(self, tasklet: Tasklet, high_priority: bool = False, priority: Optional[int] = None):
         """从同步代码中非阻塞地将任务放入队列。
 
         Args:
             tasklet: 要放入的任务单元。
             high_priority: 如果为 True，任务将被插入到队列头部。
+            priority: 数值优先级（越小越先出队）；为 None 时使用 `tasklet.priority`。
 
         Raises:
             asyncio.QueueFull: 如果队列已满。
         """
-        if len(self._queue) >= self._maxsize:
+        if self._size() >= self._maxsize:
             raise asyncio.QueueFull()
 
+        self._put_entry(self._new_entry(tasklet, priority), high_priority)
+        self._unfinished_tasks += 1
+
+    def _put_entry(self, entry: _QueueEntry, high_priority: bool):
         if high_priority:
-            self._queue.appendleft(tasklet)
+            self._append_pinned(entry, left=True)
+            self._track(entry)
         else:
-            self._queue.append(tasklet)
-
-        self._unfinished_tasks += 1
+            self._push_fair(entry)
 
     async def get(self) -> Tasklet:
         """从队列中异步获取一个任务单元。
@@ -120,12 +353,12 @@ class TaskQueue:
         如果队列为空，此操作将会阻塞等待，直到有任务可用。
         """
         async with self._not_empty:
-            while not self._queue:
+            while not self._size():
                 await self._not_empty.wait()
 
-            tasklet = self._queue.popleft()
+            entry = self._pop_next()
             self._not_full.notify()
-            return tasklet
+            return entry.tasklet
 
     def task_done(self):
         """Notify the queue that a task has completed."""
@@ -154,11 +387,11 @@ class TaskQueue:
 
     def empty(self) -> bool:
         """检查队列是否为空。"""
-        return len(self._queue) == 0
+        return self._size() == 0
 
     def qsize(self) -> int:
         """返回队列中的大致项目数量。"""
-        return len(self._queue)
+        return self._size()
 
     # ========== 高级队列操作 ==========
 
@@ -173,11 +406,11 @@ class TaskQueue:
             是否成功插入
         """
         async with self._not_full:
-            while len(self._queue) >= self._maxsize:
+            while self._size() >= self._maxsize:
                 await self._not_full.wait()
 
             try:
-                self._queue.insert(max(0, min(index, len(self._queue))), tasklet)
+                self._insert_pinned(index, self._new_entry(tasklet))
                 self._unfinished_tasks += 1
                 self._not_empty.notify()
                 return True
@@ -194,14 +427,14 @@ class TaskQueue:
             是否成功删除
         """
         async with self._lock:
-            for i, tasklet in enumerate(self._queue):
-                if tasklet.cid == cid:
-                    del self._queue[i]
-                    if self._unfinished_tasks > 0:
-                        self._unfinished_tasks -= 1
-                    self._not_full.notify()
-                    return True
-            return False
+            entry = self._cid_index.get(cid)
+            if entry is None:
+                return False
+            self._detach(entry)
+            if self._unfinished_tasks > 0:
+                self._unfinished_tasks -= 1
+            self._not_full.notify()
+            return True
 
     async def remove_by_filter(self, predicate: Callable[[Tasklet], bool]) -> int:
         """根据条件批量删除任务。
@@ -213,9 +446,9 @@ class TaskQueue:
             删除的任务数量
         """
         async with self._lock:
-            to_remove = [i for i, t in enumerate(self._queue) if predicate(t)]
-            for i in reversed(to_remove):
-                del self._queue[i]
+            to_remove = [entry for entry in self._entries.values() if predicate(entry.tasklet)]
+            for entry in to_remove:
+                self._detach(entry)
             if to_remove:
                 # 将计数与实际队列同步，避免 join() 永久阻塞
                 self._unfinished_tasks = max(0, self._unfinished_tasks - len(to_remove))
@@ -231,12 +464,7 @@ class TaskQueue:
         Returns:
             是否成功移动
         """
-        async with self._lock:
-            for i, tasklet in enumerate(self._queue):
-                if tasklet.cid == cid:
-                    self._queue.rotate(-i)
-                    return True
-            return False
+        return await self.move_to_position(cid, 0)
 
     async def move_to_position(self, cid: str, new_index: int) -> bool:
         """将指定任务移动到指定位置。
@@ -249,34 +477,60 @@ class TaskQueue:
             是否成功移动
         """
         async with self._lock:
-            for i, tasklet in enumerate(self._queue):
-                if tasklet.cid == cid:
-                    self._queue.rotate(-i)
-                    task = self._queue.popleft()
-                    self._queue.rotate(i)
+            entry = self._cid_index.get(cid)
+            if entry is None:
+                return False
+            self._detach(entry)
+            moved = _QueueEntry(tasklet=entry.tasklet, plan=entry.plan, priority=entry.priority, seq=entry.seq)
+            self._insert_pinned(new_index, moved)
+            return True
+
+    async def update_priority(self, cid: str, priority: int) -> bool:
+        """修改仍在队列中的任务的数值优先级。
+
+        被显式排序（钉住）的任务会回到按优先级与公平调度出队的部分。
+
+        Args:
+            cid: 任务的唯一追踪ID
+            priority: 新的优先级（越小越先出队）
 
-                    target_index = max(0, min(new_index, len(self._queue)))
-                    self._queue.insert(target_index, task)
-                    return True
-            return False
+        Returns:
+            是否成功修改
+        """
+        async with self._lock:
+            entry = self._cid_index.get(cid)
+            if entry is None:
+                return False
+            self._detach(entry)
+            entry.tasklet.priority = int(priority)
+            self._push_fair(
+                _QueueEntry(tasklet=entry.tasklet, plan=entry.plan, priority=int(priority), seq=entry.seq)
+            )
+            return True
 
     async def list_all(self) -> List[Dict[str, Any]]:
-        """获取队列中所有任务的快照。
+        """获取队列中所有任务的快照（按实际出队顺序）。
+
+        快照在队列未发生变化时会被复用，返回的字典应视为只读。
 
         Returns:
             包含所有任务信息的列表
         """
         async with self._lock:
-            return [
-                {
-                    "cid": t.cid,
-                    "task_name": t.task_name,
-                    "plan_name": t.payload.get("plan_name") if t.payload else None,
-                    "is_ad_hoc": t.is_ad_hoc,
-                    "execution_mode": t.execution_mode,
-                }
-                for t in self._queue
-            ]
+            if self._snapshot is None or self._snapshot[0] != self._version:
+                items = [
+                    {
+                        "cid": entry.tasklet.cid,
+                        "task_name": entry.tasklet.task_name,
+                        "plan_name": entry.tasklet.payload.get("plan_name") if entry.tasklet.payload else None,
+                        "is_ad_hoc": entry.tasklet.is_ad_hoc,
+                        "execution_mode": entry.tasklet.execution_mode,
+                        "priority": entry.priority,
+                    }
+                    for entry in self._ordered_entries()
+                ]
+                self._snapshot = (self._version, items)
+            return list(self._snapshot[1])
 
     async def clear(self) -> int:
         """清空队列中的所有任务。
@@ -285,8 +539,18 @@ class TaskQueue:
             清除的任务数量
         """
         async with self._lock:
-            count = len(self._queue)
-            self._queue.clear()
+            count = self._size()
+            for entry in self._entries.values():
+                entry.removed = True
+            self._pinned.clear()
+            self._pinned_live = 0
+            self._plan_heaps.clear()
+            self._plan_live.clear()
+            self._deficits.clear()
+            self._ring.clear()
+            self._entries.clear()
+            self._cid_index.clear()
+            self._version += 1
             # 清空时重置未完成计数，防止后续 join() 悬挂
             self._unfinished_tasks = 0
             self._not_full.notify_all()
@@ -295,6 +559,8 @@ class TaskQueue:
     async def reorder(self, cid_order: List[str]) -> bool:
         """根据提供的 cid 列表重新排序队列。
 
+        列表中的任务按给定顺序排到队列最前，其余任务保持原有相对顺序。
+
         Args:
             cid_order: 期望的 cid 顺序列表
 
@@ -302,16 +568,17 @@ class TaskQueue:
             是否成功重排序
         """
         async with self._lock:
-            cid_to_task = {t.cid: t for t in self._queue if t.cid}
-
-            new_queue = []
+            leading: List[_QueueEntry] = []
             for cid in cid_order:
-                if cid in cid_to_task:
-                    new_queue.append(cid_to_task.pop(cid))
-
-            # 将未在列表中的任务追加到末尾
-            new_queue.extend(cid_to_task.values())
-
-            self._queue = deque(new_queue)
+                entry = self._cid_index.get(cid)
+                if entry is None or entry.removed:
+                    continue
+                self._detach(entry)
+                leading.append(
+                    _QueueEntry(tasklet=entry.tasklet, plan=entry.plan, priority=entry.priority, seq=entry.seq)
+                )
+            for entry in reversed(leading):
+                self._append_pinned(entry, left=True)
+                self._track(entry)
             # 重排不影响未完成计数
             return True
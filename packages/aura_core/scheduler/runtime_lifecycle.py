@@ -66,6 +66,7 @@ class RuntimeLifecycleService:
         finally:
             scheduler.is_running.clear()
             await scheduler.observability.stop_cleanup_task()
+            await asyncio.to_thread(scheduler.observability.flush_run_store, 5.0)
             scheduler.file_watcher_service.stop()
             scheduler._loop = None
             scheduler._main_task = None
@@ -1,10 +1,20 @@
 # -*- coding: utf-8 -*-
-"""Time-based scheduling service."""
+"""Time-based scheduling service.
+
+Schedule items with cron triggers are kept in a timer heap keyed by their next
+due time. The service sleeps until the earliest deadline, fires whatever is
+due and re-arms only the items it just evaluated. Schedule edits (see
+``PlanRegistry.load_schedule_file``) call :meth:`SchedulingService.notify_schedule_changed`,
+which wakes the loop so the heap is rebuilt immediately.
+"""
 
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime
+import heapq
+import itertools
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 
 try:
     from croniter import croniter
@@ -18,64 +28,162 @@ from packages.aura_core.config.loader import get_config_value
 from packages.aura_core.observability.logging.core_logger import logger
 from ..utils.asynccontext import plan_context
 
+_BUSY_STATUSES = ("queued", "running")
+
 
 class SchedulingService:
-    """Periodically evaluate schedule items and enqueue ready tasks."""
+    """Fire cron schedule items from a timer heap of their next due times."""
 
     def __init__(self, scheduler):
         self.scheduler = scheduler
         self.is_running = None
+        # Re-check interval while the scheduler is paused.
         self.tick_sec = int(get_config_value("scheduling_service.tick_sec", 60))
+        # Upper bound for sleeping towards a deadline; timers are wall-clock
+        # based, so this bounds the error after a system clock jump.
+        self.max_sleep_sec = float(get_config_value("scheduling_service.max_sleep_sec", 300))
         self._stop_requested = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._croniter_missing_logged = False
+        self._timers: List[Tuple[datetime, int, str]] = []
+        self._armed: Dict[str, int] = {}
+        self._items: Dict[str, dict] = {}
+        self._seq = itertools.count()
+        self._schedule_dirty = True
 
     async def run(self):
         logger.info("SchedulingService starting...")
         self.is_running = asyncio.Event()
         self._stop_requested = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._schedule_dirty = True
         self.is_running.set()
         try:
             while not self._stop_requested.is_set():
+                if self._schedule_dirty:
+                    self._rebuild_timers(datetime.now())
                 if self.scheduler.is_running.is_set():
-                    await self._check_and_enqueue_tasks(datetime.now())
+                    await self._fire_due_items(datetime.now())
+                    timeout = self._seconds_until_next_due(datetime.now())
+                else:
+                    timeout = float(self.tick_sec)
 
+                self._wakeup.clear()
+                if self._stop_requested.is_set() or self._schedule_dirty:
+                    continue
                 try:
-                    await asyncio.wait_for(self._stop_requested.wait(), timeout=self.tick_sec)
-                    logger.info("SchedulingService stop requested.")
-                    break
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
                 except asyncio.TimeoutError:
                     pass
+            logger.info("SchedulingService stop requested.")
         except asyncio.CancelledError:
             logger.info("SchedulingService cancelled.")
             raise
         finally:
             self.is_running.clear()
+            self._loop = None
             logger.info("SchedulingService stopped.")
 
     def stop(self):
         logger.info("Requesting SchedulingService stop...")
         if self._stop_requested:
             self._stop_requested.set()
+            self._wake()
+
+    def notify_schedule_changed(self):
+        """Mark the schedule table as edited and wake the loop; safe from any thread."""
+        self._schedule_dirty = True
+        self._wake()
 
-    async def _check_and_enqueue_tasks(self, now: datetime):
+    def _wake(self):
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            wakeup.set()
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            # Loop closed between the check and the call; run() rebuilds on start.
+            pass
+
+    def _seconds_until_next_due(self, now: datetime) -> float:
+        if not self._timers:
+            return self.max_sleep_sec
+        delay = (self._timers[0][0] - now).total_seconds()
+        return min(max(delay, 0.0), self.max_sleep_sec)
+
+    def _rebuild_timers(self, now: datetime):
+        # Clear the flag before reading so an edit racing with the rebuild
+        # triggers another one.
+        self._schedule_dirty = False
         with self.scheduler.fallback_lock:
             schedule_items_copy = list(self.scheduler.schedule_items)
 
+        self._timers = []
+        self._armed = {}
+        self._items = {}
         for item in schedule_items_copy:
             item_id = item.get("id")
-            plan_name = item.get("plan_name")
-
-            if not item_id or not plan_name or not item.get("enabled", False):
+            if not item_id or not item.get("plan_name") or not item.get("enabled", False):
                 continue
+            if not self._cron_expressions(item):
+                continue
+            if not CRONITER_AVAILABLE:
+                self._log_croniter_missing()
+                continue
+            self._items[item_id] = item
+            self._arm(item_id, now)
+        logger.debug("SchedulingService armed %d cron schedule(s).", len(self._armed))
+
+    def _arm(self, item_id: str, now: datetime, evaluated: bool = False):
+        """(Re)compute the next due time of one item and push it on the heap.
+
+        `evaluated` marks an item that was just checked at `now`; if it is still
+        due on paper (busy, or just enqueued) its next chance is the first cron
+        fire after `now`.
+        """
+        item = self._items.get(item_id)
+        if item is None:
+            return
+        with self.scheduler.fallback_lock:
+            status = dict(self.scheduler.run_statuses.get(item_id, {}))
+
+        due = self._next_due(item, now, status)
+        if evaluated and due is not None and due <= now:
+            due = self._next_cron_fire(item, now, now)
+        if due is None:
+            self._armed.pop(item_id, None)
+            return
+
+        seq = next(self._seq)
+        self._armed[item_id] = seq
+        heapq.heappush(self._timers, (due, seq, item_id))
+
+    async def _fire_due_items(self, now: datetime):
+        while self._timers and self._timers[0][0] <= now:
+            _, seq, item_id = heapq.heappop(self._timers)
+            if self._armed.get(item_id) != seq:
+                continue  # superseded by a later _arm()
 
+            item = self._items[item_id]
+            plan_name = item.get("plan_name")
             async with plan_context(plan_name):
                 try:
                     with self.scheduler.fallback_lock:
-                        status = self.scheduler.run_statuses.get(item_id, {})
-                        if status.get("status") in ["queued", "running"]:
-                            continue
-
-                    if self._is_ready_to_run(item, now, status) and self._has_cron_trigger_match(item, now, status):
+                        status = dict(self.scheduler.run_statuses.get(item_id, {}))
+                    if (
+                        status.get("status") not in _BUSY_STATUSES
+                        and self._is_ready_to_run(item, now, status)
+                        and self._has_cron_trigger_match(item, now, status)
+                    ):
                         logger.info(
                             "Scheduled task '%s' (%s) is ready and enqueued.",
                             item.get("name", item_id),
@@ -84,6 +192,19 @@ class SchedulingService:
                         await self.scheduler._enqueue_schedule_item(item, source="schedule")
                 except Exception as exc:
                     logger.error("Error checking schedule '%s': %s", item_id, exc, exc_info=True)
+                finally:
+                    self._arm(item_id, now, evaluated=True)
+
+    def _next_due(self, item: dict, now: datetime, status: dict) -> Optional[datetime]:
+        """Earliest time at which both the cron match and the cooldown hold."""
+        last_run = status.get("last_run")
+        due = self._next_cron_fire(item, last_run, now)
+        if due is None or last_run is None:
+            return due
+        cooldown = item.get("run_options", {}).get("cooldown", 0)
+        if cooldown:
+            due = max(due, last_run + timedelta(seconds=cooldown))
+        return due
 
     def _is_ready_to_run(self, item: dict, now: datetime, status: dict) -> bool:
         cooldown = item.get("run_options", {}).get("cooldown", 0)
@@ -93,37 +214,50 @@ class SchedulingService:
         return True
 
     def _has_cron_trigger_match(self, item: dict, now: datetime, status: dict) -> bool:
-        triggers = item.get("triggers") or []
-        if not isinstance(triggers, list):
+        expressions = self._cron_expressions(item)
+        if expressions and not CRONITER_AVAILABLE:
+            self._log_croniter_missing()
             return False
 
-        has_cron = any(isinstance(trigger, dict) and trigger.get("type") == "cron" for trigger in triggers)
-        if has_cron and not CRONITER_AVAILABLE:
-            if not self._croniter_missing_logged:
-                logger.warning(
-                    "Cron triggers detected but 'croniter' is not installed. Cron schedules will be skipped."
-                )
-                self._croniter_missing_logged = True
-            return False
+        # A cron trigger matches when one of its fire times lies in (last_run, now].
+        due = self._next_cron_fire(item, status.get("last_run"), now)
+        return due is not None and due <= now
 
-        last_run = status.get("last_run")
-        for trigger in triggers:
-            if not isinstance(trigger, dict):
-                continue
-            if trigger.get("type") != "cron":
-                continue
-            expression = trigger.get("expression")
-            if not expression:
-                continue
+    def _next_cron_fire(self, item: dict, after: Optional[datetime], now: datetime) -> Optional[datetime]:
+        """First cron fire strictly after `after`; `now` when the item never ran."""
+        if not CRONITER_AVAILABLE:
+            return None
 
+        earliest = None
+        for expression in self._cron_expressions(item):
             try:
-                iterator = croniter(expression, now)
-                prev_scheduled_run = iterator.get_prev(datetime)
-                effective_last_run = last_run or datetime.min
-                if prev_scheduled_run > effective_last_run:
-                    return True
+                if after is None:
+                    croniter(expression, now)  # validate only
+                    candidate = now
+                else:
+                    candidate = croniter(expression, after).get_next(datetime)
             except Exception as exc:
                 item_id = item.get("id")
                 logger.error("Invalid cron expression for schedule '%s': %s (%s)", item_id, expression, exc)
+                continue
+            if earliest is None or candidate < earliest:
+                earliest = candidate
+        return earliest
+
+    @staticmethod
+    def _cron_expressions(item: dict) -> List[str]:
+        triggers = item.get("triggers") or []
+        if not isinstance(triggers, list):
+            return []
+        return [
+            trigger["expression"]
+            for trigger in triggers
+            if isinstance(trigger, dict) and trigger.get("type") == "cron" and trigger.get("expression")
+        ]
 
-        return False
+    def _log_croniter_missing(self):
+        if not self._croniter_missing_logged:
+            logger.warning(
+                "Cron triggers detected but 'croniter' is not installed. Cron schedules will be skipped."
+            )
+            self._croniter_missing_logged = True
@@ -4,12 +4,10 @@
 职责: 管理任务的调度、入队和分发
 """
 
-import time
-import fnmatch
 from typing import TYPE_CHECKING, Any, Dict, Optional
-from pathlib import Path
 from packages.aura_core.observability.logging.core_logger import logger
 from packages.aura_core.observability.events import Event
+from .trigger_index import TriggerIndex
 
 if TYPE_CHECKING:
     from .core import Scheduler
@@ -33,6 +31,13 @@ class TaskDispatcher:
             scheduler: 父调度器实例
         """
         self.scheduler = scheduler
+        self.trigger_index = TriggerIndex()
+        # 回调对象只创建一次，重复订阅时 EventBus 能识别为同一个订阅而跳过。
+        self._trigger_subscriptions = (
+            ('variable', 'state.changed', '*', self._on_state_changed),
+            ('task', 'queue.completed', '*', self._on_task_completed),
+            ('file', 'file.changed', 'file_watcher', self._on_file_changed),
+        )
 
     def run_manual_task(self, task_id: str):
         """执行手动调度任务
@@ -102,7 +107,9 @@ class TaskDispatcher:
 
         实现来自: scheduler.py 行745-856
 
-        订阅cron、variable、task、file和event类型的触发器。
+        variable、task和file触发器登记到 `TriggerIndex`，每种事件类型只订阅一个
+        处理函数，由索引查找命中的调度项；计划重载时索引按差量更新。
+        event触发器的事件模式各不相同，仍逐个订阅。cron触发器由调度服务处理。
         """
         logger.info("--- 订阅调度触发器 ---")
 
@@ -110,92 +117,31 @@ class TaskDispatcher:
             subscribed_count = 0
             schedule_items = list(self.scheduler.schedule_items)
 
+        index_stats = self.trigger_index.rebuild(schedule_items, getattr(self.scheduler, "file_watcher_service", None))
+        for kind, event_name, channel, callback in self._trigger_subscriptions:
+            if index_stats[kind]:
+                await self.scheduler.event_bus.subscribe(event_name, callback, channel=channel)
+                subscribed_count += 1
+        logger.info(
+            f"触发器索引已更新: variable={index_stats['variable']}, task={index_stats['task']}, "
+            f"file={index_stats['file']} (新增 {index_stats['added']}, 移除 {index_stats['removed']}, "
+            f"文件监听 {index_stats['watches']} 个)"
+        )
+
         for item in schedule_items:
             plan_name = item.get('plan_name')
             triggers = item.get('triggers') or []
             if not plan_name or not isinstance(triggers, list):
                 continue
 
-            for idx, trigger in enumerate(triggers):
+            for trigger in triggers:
                 if not isinstance(trigger, dict):
                     continue
 
                 trigger_type = trigger.get('type')
 
-                # 跳过cron触发器（由其他机制处理）
-                if trigger_type == 'cron':
-                    continue
-
-                # 处理variable触发器
-                elif trigger_type == 'variable':
-                    key = trigger.get('key')
-                    target_value = trigger.get('value')
-                    operator = trigger.get('operator', 'eq')
-                    if key:
-                        async def var_handler(event, sched_item=item, k=key, v=target_value, op=operator):
-                            if event.payload.get('key') == k:
-                                current_val = event.payload.get('new_value')
-                                match = False
-                                if v is None:
-                                    match = True
-                                elif op == 'eq' and str(current_val) == str(v):
-                                    match = True
-                                elif op == 'neq' and str(current_val) != str(v):
-                                    match = True
-                                if match:
-                                    await self.enqueue_schedule_item(
-                                        sched_item,
-                                        source="schedule_trigger",
-                                        triggering_event=event
-                                    )
-
-                        await self.scheduler.event_bus.subscribe('state.changed', var_handler)
-                        subscribed_count += 1
-
-                # 处理task触发器
-                elif trigger_type == 'task':
-                    target_task = trigger.get('task')
-                    target_status = trigger.get('status', 'completed')
-                    if target_task and target_status == 'completed':
-                        target_full = f"{plan_name}/{target_task}"
-
-                        async def task_handler(event, sched_item=item, target=target_full):
-                            completed_task = f"{event.payload.get('plan_name')}/{event.payload.get('task_name')}"
-                            if completed_task == target:
-                                await self.enqueue_schedule_item(
-                                    sched_item,
-                                    source="schedule_trigger",
-                                    triggering_event=event
-                                )
-
-                        await self.scheduler.event_bus.subscribe('queue.completed', task_handler)
-                        subscribed_count += 1
-
-                # 处理file触发器
-                elif trigger_type == 'file':
-                    path = trigger.get('path')
-                    pattern = trigger.get('pattern', '*')
-                    events = trigger.get('events')
-                    recursive = trigger.get('recursive', False)
-                    if path:
-                        watch_id = f"watch_{item.get('id', 'schedule')}_{idx}_{int(time.time())}"
-                        self.scheduler.file_watcher_service.add_watch(watch_id, path, events, recursive)
-
-                        async def file_handler(event, sched_item=item, p=pattern, w_id=watch_id):
-                            if event.payload.get('watch_id') == w_id:
-                                file_name = Path(event.payload.get('path')).name
-                                if fnmatch.fnmatch(file_name, p):
-                                    await self.enqueue_schedule_item(
-                                        sched_item,
-                                        source="schedule_trigger",
-                                        triggering_event=event
-                                    )
-
-                        await self.scheduler.event_bus.subscribe('file.changed', file_handler, channel='file_watcher')
-                        subscribed_count += 1
-
                 # 处理event触发器
-                elif trigger_type == 'event':
+                if trigger_type == 'event':
                     event_pattern = trigger.get('event')
                     if not event_pattern:
                         continue
@@ -227,6 +173,23 @@ class TaskDispatcher:
         if subscribed_count:
             logger.info(f"--- 已订阅 {subscribed_count} 个调度触发器 ---")
 
+    async def _dispatch_trigger_matches(self, items, event: Event):
+        for sched_item in items:
+            await self.enqueue_schedule_item(
+                sched_item,
+                source="schedule_trigger",
+                triggering_event=event
+            )
+
+    async def _on_state_changed(self, event: Event):
+        await self._dispatch_trigger_matches(self.trigger_index.match_state(event.payload), event)
+
+    async def _on_task_completed(self, event: Event):
+        await self._dispatch_trigger_matches(self.trigger_index.match_task(event.payload), event)
+
+    async def _on_file_changed(self, event: Event):
+        await self._dispatch_trigger_matches(self.trigger_index.match_file(event.payload), event)
+
     async def consume_main_queue(self):
         """消费主任务队列
 
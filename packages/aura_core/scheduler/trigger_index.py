@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""调度触发器索引。
+
+variable / task / file 三类触发器不再各自订阅 EventBus，而是登记到
+`TriggerIndex`，调度器为每种事件类型只订阅一个处理函数，事件到达后
+直接查索引找出命中的调度项：
+
+- variable 触发器按状态键建立哈希索引（`state.changed`）；
+- task 触发器按 "plan/task" 建立哈希索引（`queue.completed`）；
+- file 触发器按监听目录建立路径前缀索引（`file.changed`），事件路径逐级
+  向上查找父目录即可命中；被某个递归监听覆盖的子目录不再单独注册监听，
+  保证同一次文件变动只产生一个事件。
+
+`rebuild()` 以 (plan, 调度项 ID, 触发器序号) 为键与上一次的触发器定义做
+差量更新：定义未变的条目只替换调度项引用，文件监听也只增删有变化的部分。
+"""
+import fnmatch
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from packages.aura_core.observability.logging.core_logger import logger
+
+WATCH_ID_PREFIX = "schedule_trigger:"
+
+_EntryKey = Tuple[Any, ...]
+
+
+@dataclass
+class _TriggerEntry:
+    kind: str
+    index_key: str
+    spec: Dict[str, Any]
+    item: Dict[str, Any]
+
+
+def _normalize_dir(path: str) -> str:
+    return os.path.normcase(str(Path(path).resolve()))
+
+
+def _state_matches(spec: Dict[str, Any], current_val: Any) -> bool:
+    target = spec.get('value')
+    operator = spec.get('operator', 'eq')
+    if target is None:
+        return True
+    if operator == 'eq':
+        return str(current_val) == str(target)
+    if operator == 'neq':
+        return str(current_val) != str(target)
+    return False
+
+
+class TriggerIndex:
+    """variable / task / file 触发器的索引与匹配引擎。"""
+
+    def __init__(self):
+        self._entries: Dict[_EntryKey, _TriggerEntry] = {}
+        self._by_kind: Dict[str, Dict[str, Dict[_EntryKey, _TriggerEntry]]] = {
+            'variable': {}, 'task': {}, 'file': {},
+        }
+        # watch_id -> (监听根目录, 是否递归, 事件类型)
+        self._watches: Dict[str, Tuple[str, bool, Optional[Tuple[str, ...]]]] = {}
+
+    # ------------------------------------------------------------------
+    # 构建
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _parse(trigger: Dict[str, Any], plan_name: str) -> Optional[Tuple[str, str]]:
+        """返回 (类型, 索引键)；不由本索引处理的触发器返回 None。"""
+        trigger_type = trigger.get('type')
+        if trigger_type == 'variable':
+            key = trigger.get('key')
+            return ('variable', str(key)) if key else None
+        if trigger_type == 'task':
+            target_task = trigger.get('task')
+            if target_task and trigger.get('status', 'completed') == 'completed':
+                return 'task', f"{plan_name}/{target_task}"
+            return None
+        if trigger_type == 'file':
+            path = trigger.get('path')
+            return ('file', _normalize_dir(path)) if path else None
+        return None
+
+    def rebuild(self, schedule_items: Iterable[Dict[str, Any]], file_watcher: Any = None) -> Dict[str, int]:
+        """按最新的调度项差量更新索引，并同步文件监听。
+
+        Returns:
+            各类触发器数量以及本次新增 / 移除的条目数。
+        """
+        desired: Dict[_EntryKey, Tuple[str, str, Dict[str, Any], Dict[str, Any]]] = {}
+        for pos, item in enumerate(schedule_items):
+            plan_name = item.get('plan_name')
+            triggers = item.get('triggers') or []
+            if not plan_name or not isinstance(triggers, list):
+                continue
+            item_id = item.get('id') or f"#{pos}"
+            for idx, trigger in enumerate(triggers):
+                if not isinstance(trigger, dict):
+                    continue
+                parsed = self._parse(trigger, plan_name)
+                if parsed is None:
+                    continue
+                key: _EntryKey = (plan_name, item_id, idx)
+                if key in desired:
+                    key = key + (pos,)
+                desired[key] = (parsed[0], parsed[1], dict(trigger), item)
+
+        added = removed = 0
+        for key in [k for k in self._entries if k not in desired]:
+            self._remove(key)
+            removed += 1
+        for key, (kind, index_key, spec, item) in desired.items():
+            entry = self._entries.get(key)
+            if entry is not None and entry.kind == kind and entry.spec == spec:
+                entry.item = item
+                continue
+            if entry is not None:
+                self._remove(key)
+                removed += 1
+            entry = _TriggerEntry(kind=kind, index_key=index_key, spec=spec, item=item)
+            self._entries[key] = entry
+            self._by_kind[kind].setdefault(index_key, {})[key] = entry
+            added += 1
+
+        if file_watcher is not None:
+            self._sync_watches(file_watcher)
+
+        stats = {kind: sum(len(bucket) for bucket in index.values()) for kind, index in self._by_kind.items()}
+        stats.update({"added": added, "removed": removed, "watches": len(self._watches)})
+        return stats
+
+    def _remove(self, key: _EntryKey):
+        entry = self._entries.pop(key)
+        bucket = self._by_kind[entry.kind].get(entry.index_key)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self._by_kind[entry.kind][entry.index_key]
+
+    def _desired_watches(self) -> Dict[str, Tuple[str, bool, Optional[Tuple[str, ...]]]]:
+        roots: Dict[str, List[Any]] = {}
+        for root, bucket in self._by_kind['file'].items():
+            recursive = any(bool(e.spec.get('recursive', False)) for e in bucket.values())
+            events: Optional[set] = set()
+            for e in bucket.values():
+                if not e.spec.get('events'):
+                    events = None
+                    break
+                events.update(e.spec['events'])
+            roots[root] = [recursive, events]
+
+        owned: Dict[str, List[Any]] = {}
+        for root in sorted(roots, key=lambda r: len(Path(r).parts)):
+            recursive, events = roots[root]
+            owner = next((a for a in self._ancestors(root) if a in owned and owned[a][0]), None)
+            if owner is None:
+                owned[root] = [recursive, events]
+            elif owned[owner][1] is not None:
+                # 子目录由上层递归监听覆盖：合并它关心的事件类型。
+                owned[owner][1] = None if events is None else owned[owner][1] | events
+        return {
+            f"{WATCH_ID_PREFIX}{root}": (root, recursive, tuple(sorted(events)) if events is not None else None)
+            for root, (recursive, events) in owned.items()
+        }
+
+    def _sync_watches(self, file_watcher: Any):
+        desired = self._desired_watches()
+        active = getattr(file_watcher, 'watches', {})
+        for watch_id in list(self._watches):
+            if desired.get(watch_id) != self._watches[watch_id] or watch_id not in active:
+                if watch_id in active:
+                    file_watcher.remove_watch(watch_id)
+                del self._watches[watch_id]
+        for watch_id, spec in desired.items():
+            if watch_id in self._watches:
+                continue
+            root, recursive, events = spec
+            try:
+                file_watcher.add_watch(watch_id, root, list(events) if events is not None else None, recursive)
+            except Exception as e:
+                logger.warning(f"为文件触发器添加监听 '{root}' 失败: {e}")
+                continue
+            if watch_id in getattr(file_watcher, 'watches', {}):
+                self._watches[watch_id] = spec
+
+    @staticmethod
+    def _ancestors(path: str) -> Iterable[str]:
+        parent = os.path.dirname(path)
+        while parent and parent != path:
+            yield parent
+            path, parent = parent, os.path.dirname(parent)
+
+    # ------------------------------------------------------------------
+    # 匹配
+    # ------------------------------------------------------------------
+
+    def match_state(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """返回被 `state.changed` 事件命中的调度项。"""
+        bucket = self._by_kind['variable'].get(payload.get('key'))
+        if not bucket:
+            return []
+        current_val = payload.get('new_value')
+        return [e.item for e in bucket.values() if _state_matches(e.spec, current_val)]
+
+    def match_task(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """返回被 `queue.completed` 事件命中的调度项。"""
+        bucket = self._by_kind['task'].get(f"{payload.get('plan_name')}/{payload.get('task_name')}")
+        return [e.item for e in bucket.values()] if bucket else []
+
+    def match_file(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """返回被 `file.changed` 事件命中的调度项（只处理本索引注册的监听）。"""
+        index = self._by_kind['file']
+        raw_path = payload.get('path')
+        if not index or not raw_path or not str(payload.get('watch_id', '')).startswith(WATCH_ID_PREFIX):
+            return []
+        file_name = Path(raw_path).name
+        event_type = payload.get('event_type')
+        directory = os.path.dirname(os.path.normcase(os.path.abspath(raw_path)))
+        matched = []
+        for depth, root in enumerate([directory, *self._ancestors(directory)]):
+            bucket = index.get(root)
+            if not bucket:
+                continue
+            for e in bucket.values():
+                if depth and not e.spec.get('recursive', False):
+                    continue
+                events = e.spec.get('events')
+                if events and event_type not in events:
+                    continue
+                if fnmatch.fnmatch(file_name, e.spec.get('pattern', '*')):
+                    matched.append(e.item)
+        return matched
+
+    def stats(self) -> Dict[str, int]:
+        stats = {kind: sum(len(bucket) for bucket in index.values()) for kind, index in self._by_kind.items()}
+        stats["watches"] = len(self._watches)
+        return stats
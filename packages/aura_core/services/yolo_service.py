@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import re
 import threading
-from dataclasses import dataclass
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
 
 from packages.aura_core.api import service_info
 from packages.aura_core.config.service import ConfigService
@@ -22,6 +25,145 @@ class YoloModelReference:
     is_path: bool = False
 
 
+@dataclass
+class _InferenceRequest:
+    group_key: Tuple[Any, ...]
+    model: Any
+    source: Any
+    infer_settings: Dict[str, Any]
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class YoloInferenceQueue:
+    """Groups concurrent single-image predictions for the same model into batched predict calls.
+
+    A dedicated worker thread owns all model calls. It takes the oldest request, then keeps
+    collecting requests with the same model and inference settings until ``max_batch_size`` is
+    reached or ``max_wait_ms`` has passed since that first request was enqueued.
+    """
+
+    _LATENCY_WINDOW = 512
+
+    def __init__(self, max_batch_size: int = 8, max_wait_ms: float = 5.0):
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_ms = max(0.0, float(max_wait_ms))
+        self._cond = threading.Condition()
+        self._pending: Deque[_InferenceRequest] = deque()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self._batches = 0
+        self._requests = 0
+        self._failures = 0
+        self._max_batch_seen = 0
+        self._wait_ms: Deque[float] = deque(maxlen=self._LATENCY_WINDOW)
+        self._infer_ms: Deque[float] = deque(maxlen=self._LATENCY_WINDOW)
+
+    def submit(self, model: Any, source: Any, infer_settings: Dict[str, Any], group_key: Tuple[Any, ...]) -> Future:
+        request = _InferenceRequest(group_key=group_key, model=model, source=source, infer_settings=infer_settings)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("YOLO inference queue is closed.")
+            self._pending.append(request)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="yolo-inference", daemon=True)
+                self._worker.start()
+            self._cond.notify_all()
+        return request.future
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            wait_ms = sorted(self._wait_ms)
+            infer_ms = list(self._infer_ms)
+            return {
+                "batches": self._batches,
+                "requests": self._requests,
+                "failures": self._failures,
+                "pending": len(self._pending),
+                "avg_batch_size": self._requests / self._batches if self._batches else 0.0,
+                "max_batch_size": self._max_batch_seen,
+                "avg_queue_wait_ms": sum(wait_ms) / len(wait_ms) if wait_ms else 0.0,
+                "p95_queue_wait_ms": wait_ms[int(0.95 * (len(wait_ms) - 1))] if wait_ms else 0.0,
+                "avg_inference_ms": sum(infer_ms) / len(infer_ms) if infer_ms else 0.0,
+            }
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._execute(batch)
+
+    def _next_batch(self) -> Optional[List[_InferenceRequest]]:
+        with self._cond:
+            while not self._pending:
+                if self._closed:
+                    return None
+                self._cond.wait()
+            first = self._pending.popleft()
+            batch = [first]
+            deadline = first.enqueued_at + self.max_wait_ms / 1000.0
+            while len(batch) < self.max_batch_size:
+                self._take_matching(first.group_key, batch)
+                remaining = deadline - time.perf_counter()
+                if len(batch) >= self.max_batch_size or remaining <= 0 or self._closed:
+                    break
+                self._cond.wait(remaining)
+            return batch
+
+    def _take_matching(self, group_key: Tuple[Any, ...], batch: List[_InferenceRequest]) -> None:
+        kept: Deque[_InferenceRequest] = deque()
+        while self._pending:
+            request = self._pending.popleft()
+            if request.group_key == group_key and len(batch) < self.max_batch_size:
+                batch.append(request)
+            else:
+                kept.append(request)
+        self._pending = kept
+
+    def _execute(self, batch: List[_InferenceRequest]) -> None:
+        started = time.perf_counter()
+        head = batch[0]
+        try:
+            if len(batch) == 1:
+                outputs = [head.model.predict(source=head.source, **head.infer_settings)]
+            else:
+                predictions = list(head.model.predict(source=[r.source for r in batch], **head.infer_settings))
+                if len(predictions) != len(batch):
+                    raise RuntimeError(
+                        f"YOLO batch predict returned {len(predictions)} results for {len(batch)} images."
+                    )
+                outputs = [[prediction] for prediction in predictions]
+        except Exception as exc:
+            with self._cond:
+                self._failures += 1
+            for request in batch:
+                request.future.set_exception(exc)
+            return
+
+        finished = time.perf_counter()
+        with self._cond:
+            self._batches += 1
+            self._requests += len(batch)
+            self._max_batch_seen = max(self._max_batch_seen, len(batch))
+            self._infer_ms.append((finished - started) * 1000.0)
+            self._wait_ms.extend((started - r.enqueued_at) * 1000.0 for r in batch)
+        for request, output in zip(batch, outputs):
+            request.future.set_result(output)
+
+
 @service_info(
     alias="yolo",
     public=True,
@@ -69,6 +211,7 @@ class YoloService:
         self._model_refs: Dict[str, YoloModelReference] = {}
         self._class_names: Dict[str, Dict[int, str]] = {}
         self._active_model_key: Optional[str] = None
+        self._inference_queue: Optional[YoloInferenceQueue] = None
 
     def supported_generations(self) -> List[str]:
         return list(self._SUPPORTED_FAMILIES)
@@ -237,7 +380,7 @@ class YoloService:
     ) -> Dict[str, Any]:
         model, cache_key = self._get_loaded_model(model_name)
         infer_settings = self._build_infer_settings(options or {})
-        predictions = model.predict(source=source, **infer_settings)
+        predictions = self._predict(model, cache_key, source, infer_settings)
         detections, image_size = self._parse_detections(predictions, cache_key)
         return {
             "ok": True,
@@ -304,6 +447,37 @@ class YoloService:
 
         return result
 
+    def get_batch_stats(self) -> Dict[str, Any]:
+        queue = self._inference_queue
+        stats = queue.stats() if queue is not None else {}
+        return {"enabled": self._batching_enabled(), **stats}
+
+    def shutdown(self) -> None:
+        with self._lock:
+            queue = self._inference_queue
+        if queue is not None:
+            queue.close(timeout=5.0)
+
+    def _predict(self, model: Any, cache_key: str, source: Any, infer_settings: Dict[str, Any]) -> Any:
+        # Only single in-memory images are batched; paths, URLs and explicit lists may expand
+        # into several predictions and keep their one-call-per-request behaviour.
+        if not self._batching_enabled() or isinstance(source, (str, Path, list, tuple)):
+            return model.predict(source=source, **infer_settings)
+        group_key = (cache_key, id(model), tuple(sorted((k, repr(v)) for k, v in infer_settings.items())))
+        return self._get_inference_queue().submit(model, source, infer_settings, group_key).result()
+
+    def _batching_enabled(self) -> bool:
+        return bool(self._config.get("yolo.batch.enabled", True)) and int(self._config.get("yolo.batch.max_size", 8)) > 1
+
+    def _get_inference_queue(self) -> YoloInferenceQueue:
+        with self._lock:
+            if self._inference_queue is None or self._inference_queue.closed:
+                self._inference_queue = YoloInferenceQueue(
+                    max_batch_size=int(self._config.get("yolo.batch.max_size", 8)),
+                    max_wait_ms=float(self._config.get("yolo.batch.max_wait_ms", 5.0)),
+                )
+            return self._inference_queue
+
     def _get_loaded_model(self, model_name: Optional[str]) -> Tuple[Any, str]:
         with self._lock:
             if model_name:
@@ -21,6 +21,7 @@ from packages.aura_core.context.persistence.store_service import StateStoreServi
 
 # --- 服务与数据模型导入 (来自本包) ---
 from ..services.app_provider_service import AppProviderService
+from ..services.frame_bus import wait_for_frame_condition
 from ..services.ocr_service import OcrService, OcrResult, MultiOcrResult
 from ..services.process_manager_service import ProcessManagerService
 from ..services.screen_service import ScreenService
@@ -36,6 +37,33 @@ def _expand_template_paths(engine: ExecutionEngine, vision: VisionService, templ
     plan_name = engine.orchestrator.plan_name
     return vision.expand_templates(plan_name, templates_ref, plan_path)
 
+def _wait_on_region(app: AppProviderService, region: Optional[tuple[int, int, int, int]],
+                    timeout: float, interval: float, probe, is_done) -> Tuple[Any, bool]:
+    """wait_for_* 的公共等待循环：区域画面不变时跳过检测，变化时立即重查（interval 为最长轮询间隔）。"""
+    screen = getattr(app, "screen", None)
+    frame_bus = screen.get_frame_bus() if screen is not None and hasattr(screen, "get_frame_bus") else None
+    return wait_for_frame_condition(
+        capture_fn=lambda: app.capture(rect=region),
+        probe=probe,
+        is_done=is_done,
+        timeout=timeout,
+        interval=interval,
+        frame_bus=frame_bus,
+    )
+
+
+def _join_ocr_texts(multi_ocr_result: MultiOcrResult, whitelist: Optional[str], join_with: str) -> str:
+    if not multi_ocr_result.results:
+        return ""
+    detected_texts = [res.text for res in multi_ocr_result.results]
+    if whitelist:
+        pattern = f'[^{re.escape(whitelist)}]'
+        cleaned_texts = [re.sub(r'[\n\r]', '', txt) for txt in detected_texts]
+        filtered_texts = [re.sub(pattern, '', txt) for txt in cleaned_texts]
+    else:
+        filtered_texts = detected_texts
+    return join_with.join(filtered_texts)
+
 
 
 # ==============================================================================
@@ -460,9 +488,9 @@ def wait_for_any_template_in_set(app: AppProviderService, vision: VisionService,
                                  threshold: float = 0.8, use_grayscale: bool = True,
                                  match_method: int = cv2.TM_CCOEFF_NORMED, preprocess: str = "none") -> Dict[str, Any]:
     logger.info("Waiting for any template in '%s' (timeout=%s).", templates_ref, timeout)
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        result = find_templates_in_set(
+    result, ok = _wait_on_region(
+        app, region, timeout, interval,
+        probe=lambda: find_templates_in_set(
             app,
             vision,
             engine,
@@ -472,13 +500,13 @@ def wait_for_any_template_in_set(app: AppProviderService, vision: VisionService,
             use_grayscale,
             match_method,
             preprocess,
-        )
-        if result["count"] > 0:
-            best_match = max(result["matches"], key=lambda item: item["match"].confidence)
-            logger.info("Found template '%s' in '%s'.", best_match["template"], templates_ref)
-            return best_match
-        logger.debug("No templates found yet, retrying in %s seconds.", interval)
-        time.sleep(interval)
+        ),
+        is_done=lambda found: found["count"] > 0,
+    )
+    if ok:
+        best_match = max(result["matches"], key=lambda item: item["match"].confidence)
+        logger.info("Found template '%s' in '%s'.", best_match["template"], templates_ref)
+        return best_match
     logger.warning("Timeout waiting for templates in '%s'.", templates_ref)
     return {"template": None, "match": MatchResult(found=False)}
 
@@ -491,9 +519,9 @@ def wait_for_templates_in_set_to_disappear(app: AppProviderService, vision: Visi
                                            threshold: float = 0.8, use_grayscale: bool = True,
                                            match_method: int = cv2.TM_CCOEFF_NORMED, preprocess: str = "none") -> bool:
     logger.info("Waiting for templates in '%s' to disappear (timeout=%s).", templates_ref, timeout)
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        result = find_templates_in_set(
+    _, ok = _wait_on_region(
+        app, region, timeout, interval,
+        probe=lambda: find_templates_in_set(
             app,
             vision,
             engine,
@@ -503,12 +531,12 @@ def wait_for_templates_in_set_to_disappear(app: AppProviderService, vision: Visi
             use_grayscale,
             match_method,
             preprocess,
-        )
-        if result["count"] == 0:
-            logger.info("Templates in '%s' disappeared.", templates_ref)
-            return True
-        logger.debug("Templates still present, retrying in %s seconds.", interval)
-        time.sleep(interval)
+        ),
+        is_done=lambda found: found["count"] == 0,
+    )
+    if ok:
+        logger.info("Templates in '%s' disappeared.", templates_ref)
+        return True
     logger.warning("Timeout waiting for templates in '%s' to disappear.", templates_ref)
     return False
 
@@ -620,19 +648,26 @@ def get_text_in_region(app: AppProviderService, ocr: OcrService, region: tuple[i
                        whitelist: Optional[str] = None, join_with: str = " ") -> str:
     logger.info(f"正在读取区域 {region} 内的文本...")
     multi_ocr_result = recognize_all_text(app, ocr, region)
-    if not multi_ocr_result.results:
-        return ""
-    detected_texts = [res.text for res in multi_ocr_result.results]
-    if whitelist:
-        pattern = f'[^{re.escape(whitelist)}]'
-        cleaned_texts = [re.sub(r'[\n\r]', '', txt) for txt in detected_texts]
-        filtered_texts = [re.sub(pattern, '', txt) for txt in cleaned_texts]
-    else:
-        filtered_texts = detected_texts
-    result = join_with.join(filtered_texts)
+    result = _join_ocr_texts(multi_ocr_result, whitelist, join_with)
     logger.info(f"识别并处理后的文本: '{result}'")
     return result
 
+
+@action_info(name="get_text_in_regions", read_only=True, public=True)
+@requires_services(ocr='ocr', app='app')
+def get_text_in_regions(app: AppProviderService, ocr: OcrService, regions: list[tuple[int, int, int, int]],
+                        whitelist: Optional[str] = None, join_with: str = " ") -> list[str]:
+    """只截一次图，把所有区域合并为一次批量 OCR，按 regions 顺序返回各区域文本。"""
+    capture = app.capture()
+    if not capture.success:
+        logger.error("行为 'get_text_in_regions' 失败：无法截图。")
+        return ["" for _ in regions]
+    multi_results = ocr.recognize_regions(capture.image, [tuple(region) for region in regions])
+    texts = [_join_ocr_texts(multi_ocr_result, whitelist, join_with) for multi_ocr_result in multi_results]
+    logger.info(f"批量识别 {len(regions)} 个区域的文本: {texts}")
+    return texts
+
+
 # --- Check Actions (检查状态，返回布尔值) ---
 @action_info(name="check_text_exists", read_only=True, public=True)
 @requires_services(ocr='ocr', app='app')
@@ -772,14 +807,14 @@ def wait_for_text(app: AppProviderService, ocr: OcrService, engine: ExecutionEng
                   timeout: float = 10.0, interval: float = 1.0, region: Optional[tuple[int, int, int, int]] = None,
                   match_mode: str = "contains") -> OcrResult:
     logger.info(f"开始等待文本 '{text_to_find}' 出现，最长等待 {timeout} 秒...")
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        ocr_result = find_text(app, ocr, engine, text_to_find, region, match_mode)
-        if ocr_result.found:
-            logger.info(f"成功等到文本 '{ocr_result.text}'！")
-            return ocr_result
-        logger.debug(f"尚未等到文本，将在 {interval} 秒后重试...")
-        time.sleep(interval)
+    ocr_result, ok = _wait_on_region(
+        app, region, timeout, interval,
+        probe=lambda: find_text(app, ocr, engine, text_to_find, region, match_mode),
+        is_done=lambda result: result.found,
+    )
+    if ok:
+        logger.info(f"成功等到文本 '{ocr_result.text}'！")
+        return ocr_result
     logger.warning(f"超时 {timeout} 秒，未能等到文本 '{text_to_find}'。")
     return OcrResult(found=False)
 
@@ -791,14 +826,14 @@ def wait_for_text_to_disappear(app: AppProviderService, ocr: OcrService, engine:
                                region: Optional[tuple[int, int, int, int]] = None,
                                match_mode: str = "contains") -> bool:
     logger.info(f"开始等待文本 '{text_to_monitor}' 消失，最长等待 {timeout} 秒...")
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        ocr_result = find_text(app, ocr, engine, text_to_monitor, region, match_mode)
-        if not ocr_result.found:
-            logger.info(f"文本 '{text_to_monitor}' 已消失。等待成功！")
-            return True
-        logger.debug(f"文本仍然存在，将在 {interval} 秒后重试...")
-        time.sleep(interval)
+    _, ok = _wait_on_region(
+        app, region, timeout, interval,
+        probe=lambda: find_text(app, ocr, engine, text_to_monitor, region, match_mode),
+        is_done=lambda result: not result.found,
+    )
+    if ok:
+        logger.info(f"文本 '{text_to_monitor}' 已消失。等待成功！")
+        return True
     logger.warning(f"超时 {timeout} 秒，文本 '{text_to_monitor}' 仍然存在。")
     return False
 
@@ -810,9 +845,9 @@ def wait_for_image(app: AppProviderService, vision: VisionService, engine: Execu
                    threshold: float = 0.8, use_grayscale: bool = True,
                    match_method: int = cv2.TM_CCOEFF_NORMED, preprocess: str = "none") -> MatchResult:
     logger.info(f"开始等待图像 '{template}' 出现，最长等待 {timeout} 秒...")
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        match_result = find_image(
+    match_result, ok = _wait_on_region(
+        app, region, timeout, interval,
+        probe=lambda: find_image(
             app,
             vision,
             engine,
@@ -822,12 +857,12 @@ def wait_for_image(app: AppProviderService, vision: VisionService, engine: Execu
             use_grayscale,
             match_method,
             preprocess,
-        )
-        if match_result.found:
-            logger.info(f"成功等到图像 '{template}'！")
-            return match_result
-        logger.debug(f"尚未等到图像，将在 {interval} 秒后重试...")
-        time.sleep(interval)
+        ),
+        is_done=lambda result: result.found,
+    )
+    if ok:
+        logger.info(f"成功等到图像 '{template}'！")
+        return match_result
     logger.warning(f"超时 {timeout} 秒，未能等到图像 '{template}'。")
     return MatchResult(found=False)
 
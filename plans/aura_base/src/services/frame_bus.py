@@ -0,0 +1,353 @@
+# plans/aura_base/src/services/frame_bus.py
+
+"""
+共享帧总线与无头捕获源。
+
+FrameBus 在一个新鲜度窗口内把同一帧（只读、带时间戳与序号）分发给所有消费者
+（视觉、OCR、YOLO、中断检查……）；窗口过期后第一个请求者负责捕获，其余并发请求
+等待并共享这次捕获的结果，不会重复截图。
+
+FrameSource 是可插拔的帧来源，供 ScreenService 的 "synthetic"/"file" 后端使用，
+使整条流水线可以在没有桌面的 Linux 上测试和压测。
+
+wait_for_frame_condition 是 wait_for_* 行为的等待引擎：用廉价的降采样差分判断区域
+是否变化，未变化时跳过匹配/OCR 并逐步退避，区域一变化（或总线上出现新帧）立即重查。
+"""
+
+import glob
+import itertools
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Frame:
+    """一次成功捕获的整帧。image 为只读 RGB 数组；timestamp 取自 time.monotonic()。"""
+    image: np.ndarray
+    seq: int = 0
+    timestamp: float = 0.0
+    backend: Optional[str] = None
+    window_rect: Optional[tuple[int, int, int, int]] = None
+    relative_rect: Optional[tuple[int, int, int, int]] = None
+    quality_flags: tuple[str, ...] = ()
+    # 全屏回退模式下不支持子区域裁剪（与直接捕获时忽略 rect 的行为一致）。
+    supports_sub_rect: bool = True
+
+    @property
+    def age_ms(self) -> float:
+        return (time.monotonic() - self.timestamp) * 1000.0
+
+
+_CAPTURE_RAISED = object()
+
+
+class FrameBus:
+    """
+    按新鲜度窗口共享帧，并合并并发的捕获请求。
+
+    capture_fn 成功时返回 Frame（seq/timestamp 由总线填写），失败时返回任意其他对象
+    （例如失败的 CaptureResult）；失败结果只交给本次合并的请求者，不会被缓存。
+    """
+
+    def __init__(self, capture_fn: Callable[[], Any], freshness_ms: float = 33.0):
+        self._capture_fn = capture_fn
+        self.freshness_ms = float(freshness_ms)
+        self._cond = threading.Condition()
+        self._latest: Optional[Frame] = None
+        self._inflight = False
+        self._generation = 0
+        self._last_outcome: Any = None
+        self._seq = itertools.count(1)
+        self._stats = {"captures": 0, "shared": 0, "coalesced": 0, "failures": 0}
+
+    def get(self, max_age_ms: Optional[float] = None) -> Any:
+        """返回不超过 max_age_ms（默认 freshness_ms）的帧，必要时捕获一帧。"""
+        max_age_ms = self.freshness_ms if max_age_ms is None else float(max_age_ms)
+        with self._cond:
+            while True:
+                frame = self._latest
+                if frame is not None and max_age_ms > 0 and frame.age_ms <= max_age_ms:
+                    self._stats["shared"] += 1
+                    return frame
+                if not self._inflight:
+                    self._inflight = True
+                    break
+                # 已有捕获在进行：等它完成并共享结果。
+                generation = self._generation
+                self._stats["coalesced"] += 1
+                while self._inflight and self._generation == generation:
+                    self._cond.wait()
+                if self._last_outcome is not _CAPTURE_RAISED:
+                    return self._last_outcome
+                # 那次捕获抛出了异常，重新竞争由谁来捕获。
+
+        started = time.monotonic()
+        try:
+            outcome = self._capture_fn()
+        except BaseException:
+            self._finish(_CAPTURE_RAISED)
+            raise
+        if isinstance(outcome, Frame):
+            outcome.image.setflags(write=False)
+            outcome = replace(outcome, seq=next(self._seq), timestamp=started)
+        self._finish(outcome)
+        return outcome
+
+    def _finish(self, outcome: Any):
+        with self._cond:
+            if isinstance(outcome, Frame):
+                self._latest = outcome
+                self._stats["captures"] += 1
+            else:
+                self._stats["failures"] += 1
+            self._last_outcome = outcome
+            self._inflight = False
+            self._generation += 1
+            self._cond.notify_all()
+
+    def latest(self) -> Optional[Frame]:
+        with self._cond:
+            return self._latest
+
+    def wait_for_frame(self, after_seq: int, timeout: Optional[float] = None) -> Optional[Frame]:
+        """阻塞直到出现序号大于 after_seq 的帧；超时返回 None。"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._latest is None or self._latest.seq <= after_seq:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return self._latest
+
+    def invalidate(self):
+        """丢弃当前帧，下一次 get() 一定会重新捕获。"""
+        with self._cond:
+            self._latest = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return dict(self._stats)
+
+
+# =============================================================================
+# 无头帧来源
+# =============================================================================
+
+class FrameSource(ABC):
+    """可插拔帧来源的接口，子类必须实现 grab()。"""
+
+    name = "source"
+
+    @abstractmethod
+    def grab(self) -> Optional[np.ndarray]:
+        """返回一帧 RGB 数组；无帧可用时返回 None。"""
+        pass
+
+    def close(self):
+        pass
+
+
+class SyntheticFrameSource(FrameSource):
+    """
+    确定性的合成画面：固定的类 UI 背景上有一个按帧移动的方块。
+    每 change_every 次 grab 画面才变化一次，用于模拟静止与变化交替的界面。
+    """
+
+    name = "synthetic"
+
+    def __init__(self, width: int = 1280, height: int = 720, seed: int = 0, change_every: int = 1):
+        self.width = int(width)
+        self.height = int(height)
+        self.change_every = max(1, int(change_every))
+        self._background = self._render_background(self.width, self.height, seed)
+        self._grabs = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _render_background(width: int, height: int, seed: int) -> np.ndarray:
+        rng = np.random.default_rng(seed)
+        gradient = np.linspace(40, 100, width, dtype=np.float32)[None, :].repeat(height, axis=0)
+        image = np.dstack([gradient * 0.6, gradient * 0.8, gradient]).astype(np.uint8)
+        for _ in range(max(8, (width * height) // 20000)):
+            x, y = int(rng.integers(0, max(1, width - 40))), int(rng.integers(0, max(1, height - 20)))
+            w, h = int(rng.integers(20, 200)), int(rng.integers(12, 100))
+            color = tuple(int(c) for c in rng.integers(0, 256, size=3))
+            cv2.rectangle(image, (x, y), (x + w, y + h), color, -1 if rng.random() < 0.6 else 2)
+        return image
+
+    @property
+    def frame_index(self) -> int:
+        with self._lock:
+            return self._grabs // self.change_every
+
+    def grab(self) -> Optional[np.ndarray]:
+        with self._lock:
+            index = self._grabs // self.change_every
+            self._grabs += 1
+        image = self._background.copy()
+        size = max(8, min(self.width, self.height) // 12)
+        span_x, span_y = max(1, self.width - size), max(1, self.height - size)
+        x, y = (index * 17) % span_x, (index * 11) % span_y
+        cv2.rectangle(image, (x, y), (x + size, y + size), (255, 255, 255), -1)
+        return image
+
+
+class FileFrameSource(FrameSource):
+    """
+    从磁盘回放帧：单个图片（每次返回同一帧）、图片目录/glob（按文件名循环）
+    或视频文件（逐帧读取，读到结尾后从头循环）。
+    """
+
+    name = "file"
+    IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+    def __init__(self, path: str, loop: bool = True):
+        self.path = str(path)
+        self.loop = bool(loop)
+        self._lock = threading.Lock()
+        self._video = None
+        self._images: List[str] = []
+        self._cache: Dict[str, np.ndarray] = {}
+        self._index = 0
+
+        if os.path.isdir(self.path):
+            self._images = sorted(
+                os.path.join(self.path, name) for name in os.listdir(self.path)
+                if name.lower().endswith(self.IMAGE_EXTENSIONS)
+            )
+        elif any(ch in self.path for ch in "*?["):
+            self._images = sorted(p for p in glob.glob(self.path) if p.lower().endswith(self.IMAGE_EXTENSIONS))
+        elif self.path.lower().endswith(self.IMAGE_EXTENSIONS):
+            self._images = [self.path] if os.path.isfile(self.path) else []
+        else:
+            self._video = cv2.VideoCapture(self.path)
+            if not self._video.isOpened():
+                raise FileNotFoundError(f"Cannot open video source: {self.path}")
+        if self._video is None and not self._images:
+            raise FileNotFoundError(f"No frames found at: {self.path}")
+
+    def grab(self) -> Optional[np.ndarray]:
+        with self._lock:
+            if self._video is not None:
+                ok, frame = self._video.read()
+                if not ok and self.loop:
+                    self._video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    ok, frame = self._video.read()
+                return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) if ok else None
+
+            if self._index >= len(self._images):
+                if not self.loop:
+                    return None
+                self._index = 0
+            path = self._images[self._index]
+            self._index += 1
+            image = self._cache.get(path)
+            if image is None:
+                bgr = cv2.imread(path, cv2.IMREAD_COLOR)
+                if bgr is None:
+                    return None
+                image = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+                self._cache[path] = image
+            return image.copy()
+
+    def close(self):
+        with self._lock:
+            if self._video is not None:
+                self._video.release()
+                self._video = None
+
+
+# =============================================================================
+# 帧变化驱动的等待
+# =============================================================================
+
+class RegionChangeDetector:
+    """
+    区域感知差分：把图像缩成长边 signature_size 的灰度缩略图，与上次"变化"时的缩略图
+    比较，任一格的平均亮度差超过 tolerance 即视为变化。按格取最大差而不是全图平均，
+    小图标的出现/消失也能被检测到；误报只会多跑一次检测，不影响正确性。
+    """
+
+    def __init__(self, tolerance: float = 2.0, signature_size: int = 64):
+        self.tolerance = float(tolerance)
+        self.signature_size = max(4, int(signature_size))
+        self._reference: Optional[np.ndarray] = None
+
+    def signature(self, image: np.ndarray) -> np.ndarray:
+        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY) if image.ndim == 3 and image.shape[2] == 3 else image
+        if gray.ndim == 3:
+            gray = gray[..., 0]
+        h, w = gray.shape[:2]
+        scale = min(1.0, self.signature_size / float(max(h, w)))
+        size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+        return cv2.resize(gray, size, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+    def check(self, image: np.ndarray) -> bool:
+        """区域相对上次变化时是否又变化了；变化时把当前图像记为新的参照。"""
+        signature = self.signature(image)
+        reference = self._reference
+        if reference is None or reference.shape != signature.shape or \
+                int(np.abs(signature - reference).max()) > self.tolerance:
+            self._reference = signature
+            return True
+        return False
+
+    def reset(self):
+        self._reference = None
+
+
+def wait_for_frame_condition(capture_fn: Callable[[], Any],
+                             probe: Callable[[], Any],
+                             is_done: Callable[[Any], bool],
+                             timeout: float,
+                             interval: float,
+                             frame_bus: Optional[FrameBus] = None,
+                             min_poll: float = 0.05,
+                             detector: Optional[RegionChangeDetector] = None) -> Tuple[Any, bool]:
+    """
+    等待 is_done(probe()) 成立，返回 (最后一次 probe 的结果, 是否成功)。
+
+    每一轮先用 capture_fn 取区域图像做差分：区域未变化则跳过 probe，轮询间隔从 min_poll
+    翻倍退避到 interval；区域变化则立即 probe 并把间隔重置为 min_poll。两轮之间若给了
+    frame_bus，则在总线上等待新帧（其他消费者的截图也会唤醒），否则普通 sleep。
+    截图失败时视为区域变化（仍执行 probe，与旧的定时轮询行为一致）。
+    差分低于 tolerance 的细微变化（按钮变亮、1-2px 的字形变化）检测不到，因此距上次
+    probe 满 interval 时无论差分结果如何都强制 probe 一次，保证不弱于旧的定时轮询。
+    """
+    detector = detector or RegionChangeDetector()
+    min_poll = max(0.0, min(float(min_poll), float(interval)))
+    delay = min_poll
+    deadline = time.monotonic() + float(timeout)
+    result: Any = None
+    last_probe: Optional[float] = None
+    while True:
+        capture = capture_fn()
+        image = getattr(capture, "image", None)
+        changed = not getattr(capture, "success", False) or image is None or detector.check(image)
+        if changed or last_probe is None or time.monotonic() - last_probe >= float(interval):
+            last_probe = time.monotonic()
+            result = probe()
+            if is_done(result):
+                return result, True
+        if changed:
+            delay = min_poll
+        else:
+            delay = min(max(delay * 2, min_poll), float(interval))
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return result, False
+        sleep_for = min(delay, remaining, max(0.0, last_probe + float(interval) - time.monotonic()))
+        if frame_bus is not None:
+            latest = frame_bus.latest()
+            frame_bus.wait_for_frame(latest.seq if latest is not None else 0, timeout=sleep_for)
+        else:
+            time.sleep(sleep_for)
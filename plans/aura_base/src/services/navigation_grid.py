@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+"""Array-based grid helpers for NavigationService (skeletonization, coarse grids, path search).
+
+Kept free of screen/controller imports so the algorithms can be used and tested
+without a live game window.
+"""
+
+import heapq
+import math
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Neighbour order used by Zhang-Suen: P2..P9, clockwise starting north.
+# Each entry is the (dy, dx) offset of that neighbour relative to the centre pixel.
+_ZS_OFFSETS: Tuple[Tuple[int, int], ...] = (
+    (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1),
+)
+
+
+def _zhang_suen_tables() -> Tuple[np.ndarray, np.ndarray]:
+    """Deletion lookup tables indexed by the 8-bit neighbourhood code (bit i = P(i+2))."""
+    codes = np.arange(256, dtype=np.uint16)
+    bits = ((codes[:, None] >> np.arange(8)) & 1).astype(np.uint8)
+    p2, p4, p6, p8 = bits[:, 0], bits[:, 2], bits[:, 4], bits[:, 6]
+    n = bits.sum(axis=1)
+    c = ((bits == 0) & (np.roll(bits, -1, axis=1) == 1)).sum(axis=1)
+    base = (n >= 2) & (n <= 6) & (c == 1)
+    first = base & (p2 * p4 * p6 == 0) & (p4 * p6 * p8 == 0)
+    second = base & (p2 * p4 * p8 == 0) & (p2 * p6 * p8 == 0)
+    return first, second
+
+
+_ZS_FIRST, _ZS_SECOND = _zhang_suen_tables()
+
+
+def zhang_suen_thinning(bin_img: np.ndarray) -> np.ndarray:
+    """
+    Zhang-Suen skeleton of a binary mask, returned as a 0/1 uint8 array.
+
+    The 8 neighbours of each candidate pixel are gathered with flat-index
+    offsets, packed into one byte and matched against a 256-entry deletion
+    table. Deletions within a sub-iteration are decided from the same snapshot,
+    exactly like the classic per-pixel loop, so the output is identical to it;
+    border pixels are never removed.
+
+    A pixel's verdict under a rule can only change once its neighbourhood
+    changes, so after the first sweep each sub-iteration only re-examines
+    neighbours of pixels deleted since that rule last ran.
+    """
+    img = (bin_img > 0).astype(np.uint8)
+    h, w = img.shape
+    if h < 3 or w < 3:
+        return img
+    flat = img.reshape(-1)
+    offsets = np.array([dy * w + dx for dy, dx in _ZS_OFFSETS], dtype=np.intp)
+    interior = np.zeros((h, w), dtype=bool)
+    interior[1:-1, 1:-1] = True
+    interior_flat = interior.reshape(-1)
+    stamp = np.empty(h * w, dtype=np.intp)
+
+    def unique_pixels(indices: np.ndarray) -> np.ndarray:
+        # Sort-free dedupe: each index keeps exactly one of its positions in ``stamp``.
+        positions = np.arange(indices.size)
+        stamp[indices] = positions
+        return indices[stamp[indices] == positions]
+
+    start = np.flatnonzero(img.astype(bool) & interior)
+    candidates = [start, start]
+    tables = (_ZS_FIRST, _ZS_SECOND)
+    idle_steps = 0
+    step = 0
+    # Stop after one full iteration (both sub-iterations) without deletions.
+    while idle_steps < 2:
+        table = tables[step]
+        pixels = candidates[step]
+        pixels = pixels[flat[pixels] == 1]
+        code = np.zeros(pixels.shape, dtype=np.uint8)
+        for bit, offset in enumerate(offsets):
+            code |= flat[pixels + offset] << bit
+        deleted = pixels[table[code]]
+        if deleted.size:
+            idle_steps = 0
+            flat[deleted] = 0
+            touched = (deleted[:, None] + offsets).reshape(-1)
+            touched = unique_pixels(touched[interior_flat[touched] & (flat[touched] == 1)])
+            candidates[step] = touched
+            other = candidates[1 - step]
+            candidates[1 - step] = unique_pixels(np.concatenate([other, touched])) if other.size else touched
+        else:
+            idle_steps += 1
+            candidates[step] = deleted
+        step = 1 - step
+    return img
+
+
+def build_grid(passable: np.ndarray, step: int) -> np.ndarray:
+    """Downsample a passable mask into step x step cells; a cell is passable if any pixel in it is."""
+    h, w = passable.shape[:2]
+    gh = (h + step - 1) // step
+    gw = (w + step - 1) // step
+    padded = np.zeros((gh * step, gw * step), dtype=bool)
+    padded[:h, :w] = passable[:h, :w] > 0
+    return padded.reshape(gh, step, gw, step).any(axis=(1, 3)).astype(np.uint8)
+
+
+class GridPathfinder:
+    """
+    8-connected path search over a 0/1 passable grid (cells addressed as (x, y)).
+
+    The grid is copied once into a zero-padded, column-major flat layout so the
+    hot loops need no bounds checks, and a cell's flat index orders exactly like
+    its (x, y) tuple. g-scores, parents and closed flags live in flat NumPy
+    arrays that are reused between searches. ``astar`` reproduces the legacy
+    dict/heapq search move for move (same costs, heuristic and tie-breaking);
+    ``jump_point_search`` is an optional faster search for the same uniform-cost
+    grid that returns a path of the same cost class, but not necessarily the
+    same cells when several equally short paths exist.
+    """
+
+    DIAGONAL_COST = 1.4142
+    # Legacy neighbour order (dx, dy); it decides which equal-cost path wins.
+    NEIGHBORS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+
+    def __init__(self, grid: np.ndarray):
+        self.height, self.width = grid.shape[:2]
+        self._hp = self.height + 2
+        padded = np.zeros((self.width + 2, self._hp), dtype=np.uint8)
+        padded[1:-1, 1:-1] = (grid > 0).T
+        self._walk = padded.tobytes()
+        size = padded.size
+        self._g = np.full(size, np.inf, dtype=np.float64)
+        self._parent = np.full(size, -1, dtype=np.int64)
+        self._closed = np.zeros(size, dtype=np.uint8)
+        self._grid = (grid > 0).astype(np.uint8)
+        self._distance: Optional[np.ndarray] = None
+
+    def _index(self, cell: Tuple[int, int]) -> Optional[int]:
+        x, y = cell
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return (x + 1) * self._hp + (y + 1)
+        return None
+
+    def _cell(self, index: int) -> Tuple[int, int]:
+        xp, yp = divmod(index, self._hp)
+        return xp - 1, yp - 1
+
+    def _reset(self) -> Tuple[memoryview, memoryview, memoryview]:
+        self._g.fill(np.inf)
+        self._parent.fill(-1)
+        self._closed.fill(0)
+        return memoryview(self._g), memoryview(self._parent), memoryview(self._closed)
+
+    def _trace(self, index: int) -> List[Tuple[int, int]]:
+        parent = self._parent
+        path = [self._cell(index)]
+        while parent[index] >= 0:
+            index = int(parent[index])
+            path.append(self._cell(index))
+        path.reverse()
+        return path
+
+    def astar(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        if tuple(start) == tuple(goal):
+            return [tuple(start)]
+        start_index, goal_index = self._index(start), self._index(goal)
+        if start_index is None or goal_index is None:
+            return []
+        hp, walk, hypot = self._hp, self._walk, math.hypot
+        moves = [(dx * hp + dy, dx, dy, self.DIAGONAL_COST if dx and dy else 1.0) for dx, dy in self.NEIGHBORS]
+        g, parent, closed = self._reset()
+        gx, gy = goal
+        g[start_index] = 0.0
+        open_set = [(0.0, start_index)]
+        max_iters = self.width * self.height * 2
+        iters = 0
+        while open_set and iters < max_iters:
+            iters += 1
+            _, current = heapq.heappop(open_set)
+            if current == goal_index:
+                return self._trace(current)
+            # A stale entry re-expanded with an unchanged g relaxes nothing, so skipping it is
+            # equivalent; a node whose g improved since its expansion is reopened below.
+            if closed[current]:
+                continue
+            closed[current] = 1
+            x, y = divmod(current, hp)
+            x -= 1 + gx
+            y -= 1 + gy
+            base = g[current]
+            for offset, dx, dy, cost in moves:
+                neighbor = current + offset
+                if not walk[neighbor]:
+                    continue
+                tentative = base + cost
+                if tentative < g[neighbor]:
+                    parent[neighbor] = current
+                    g[neighbor] = tentative
+                    closed[neighbor] = 0
+                    heapq.heappush(open_set, (tentative + hypot(x + dx, y + dy), neighbor))
+        return []
+
+    def jump_point_search(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Jump point search (diagonal moves always allowed, as in ``astar``); returns every cell on the path."""
+        if tuple(start) == tuple(goal):
+            return [tuple(start)]
+        start_index, goal_index = self._index(start), self._index(goal)
+        if start_index is None or goal_index is None or not self._walk[goal_index]:
+            return []
+        hp = self._hp
+        g, parent, closed = self._reset()
+        gx, gy = goal
+        g[start_index] = 0.0
+        open_set = [(0.0, start_index)]
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current == goal_index:
+                return self._expand_jumps(self._trace(current))
+            if closed[current]:
+                continue
+            closed[current] = 1
+            cx, cy = divmod(current, hp)
+            base = g[current]
+            for dx, dy in self._pruned_directions(current, parent[current]):
+                jump = self._jump(current + dx * hp + dy, dx, dy, goal_index)
+                if jump < 0:
+                    continue
+                jx, jy = divmod(jump, hp)
+                ax, ay = abs(jx - cx), abs(jy - cy)
+                tentative = base + min(ax, ay) * self.DIAGONAL_COST + abs(ax - ay)
+                if tentative < g[jump]:
+                    parent[jump] = current
+                    g[jump] = tentative
+                    closed[jump] = 0
+                    heapq.heappush(open_set, (tentative + math.hypot(jx - 1 - gx, jy - 1 - gy), jump))
+        return []
+
+    def _pruned_directions(self, index: int, parent_index: int) -> List[Tuple[int, int]]:
+        walk, hp = self._walk, self._hp
+        if parent_index < 0:
+            return [(dx, dy) for dx, dy in self.NEIGHBORS if walk[index + dx * hp + dy]]
+        px, py = divmod(parent_index, hp)
+        x, y = divmod(index, hp)
+        dx = (x > px) - (x < px)
+        dy = (y > py) - (y < py)
+        sx = dx * hp
+        directions = []
+        if dx and dy:
+            if walk[index + dy]:
+                directions.append((0, dy))
+            if walk[index + sx]:
+                directions.append((dx, 0))
+            directions.append((dx, dy))
+            if not walk[index - sx]:
+                directions.append((-dx, dy))
+            if not walk[index - dy]:
+                directions.append((dx, -dy))
+        elif dx:
+            directions.append((dx, 0))
+            if not walk[index + 1]:
+                directions.append((dx, 1))
+            if not walk[index - 1]:
+                directions.append((dx, -1))
+        else:
+            directions.append((0, dy))
+            if not walk[index + hp]:
+                directions.append((1, dy))
+            if not walk[index - hp]:
+                directions.append((-1, dy))
+        return directions
+
+    def _jump(self, index: int, dx: int, dy: int, goal_index: int) -> int:
+        walk, hp = self._walk, self._hp
+        sx = dx * hp
+        step = sx + dy
+        while True:
+            if not walk[index]:
+                return -1
+            if index == goal_index:
+                return index
+            if dx and dy:
+                if (walk[index - sx + dy] and not walk[index - sx]) or (walk[index + sx - dy] and not walk[index - dy]):
+                    return index
+                if self._jump(index + sx, dx, 0, goal_index) >= 0 or self._jump(index + dy, 0, dy, goal_index) >= 0:
+                    return index
+            elif dx:
+                if (walk[index + sx + 1] and not walk[index + 1]) or (walk[index + sx - 1] and not walk[index - 1]):
+                    return index
+            else:
+                if (walk[index + hp + dy] and not walk[index + hp]) or (walk[index - hp + dy] and not walk[index - hp]):
+                    return index
+            index += step
+
+    @staticmethod
+    def _expand_jumps(jump_points: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        path = jump_points[:1]
+        for (x0, y0), (x1, y1) in zip(jump_points, jump_points[1:]):
+            dx = (x1 > x0) - (x1 < x0)
+            dy = (y1 > y0) - (y1 < y0)
+            x, y = x0, y0
+            while (x, y) != (x1, y1):
+                x += dx
+                y += dy
+                path.append((x, y))
+        return path
+
+    def path_cost(self, path: List[Tuple[int, int]]) -> float:
+        cost = 0.0
+        for (x0, y0), (x1, y1) in zip(path, path[1:]):
+            cost += self.DIAGONAL_COST if x0 != x1 and y0 != y1 else 1.0
+        return cost
+
+    def nearest_passable(self, cell: Tuple[int, int], max_radius: int = 19) -> Optional[Tuple[int, int]]:
+        """
+        Closest passable cell by Chebyshev distance (first in row-major order on ties), or None
+        beyond ``max_radius``; same answer as the legacy ring scan. In-grid queries read the
+        distance from a precomputed chessboard distance transform and only inspect that ring.
+        """
+        gx, gy = cell
+        grid = self._grid
+        inside = 0 <= gx < self.width and 0 <= gy < self.height
+        if inside:
+            if grid[gy, gx]:
+                return cell
+            if self._distance is None:
+                self._distance = self._chessboard_distance()
+            radius = int(self._distance[gy, gx])
+            if radius > max_radius:
+                return None
+        else:
+            radius = max_radius
+        y0, x0 = max(0, gy - radius), max(0, gx - radius)
+        window = grid[y0:max(0, gy + radius + 1), x0:max(0, gx + radius + 1)]
+        if not window.any():
+            return None
+        ys, xs = np.nonzero(window)
+        ring = np.maximum(np.abs(ys + y0 - gy), np.abs(xs + x0 - gx))
+        first = int(np.argmax(ring == ring.min()))  # np.nonzero is already row-major
+        return int(xs[first] + x0), int(ys[first] + y0)
+
+    def _chessboard_distance(self) -> np.ndarray:
+        if not self._grid.any():
+            return np.full(self._grid.shape, np.iinfo(np.int32).max, dtype=np.int64)
+        blocked = (self._grid == 0).astype(np.uint8)
+        return np.rint(cv2.distanceTransform(blocked, cv2.DIST_C, 3)).astype(np.int64)
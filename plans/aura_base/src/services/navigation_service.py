@@ -13,6 +13,7 @@ from packages.aura_core.api import service_info
 from packages.aura_core.observability.logging.core_logger import logger
 from .app_provider_service import AppProviderService
 from .config_service import ConfigService
+from .navigation_grid import GridPathfinder, build_grid, zhang_suen_thinning
 
 
 def _normalize_angle_deg(angle: float) -> float:
@@ -106,6 +107,8 @@ class NavigationService:
         self._heading_detector: Optional[_TemplateHeadingDetector] = None
         self._heading_template_dir: Optional[Path] = None
         self._circle_mask_cache: Dict[Tuple[int, int], np.ndarray] = {}
+        # Skeleton / grid pathfinders derived from the last passable mask, reused across re-plans.
+        self._planning_cache: Dict[Tuple[int, bool], Tuple[np.ndarray, Dict[str, Any]]] = {}
 
     def run_from_files(
         self,
@@ -151,6 +154,7 @@ class NavigationService:
         lookahead_index = int(nav_cfg.get("lookahead_index", 5))
         minimap_mask_circle = bool(nav_cfg.get("minimap_mask_circle", True))
         use_skeleton = bool(nav_cfg.get("use_skeleton", True))
+        jump_point_search = bool(nav_cfg.get("jump_point_search", False))
 
         self._ensure_heading_detector(heading_template_dir, heading_match_threshold)
 
@@ -178,6 +182,7 @@ class NavigationService:
                     v_max=v_max,
                     minimap_mask_circle=minimap_mask_circle,
                     use_skeleton=use_skeleton,
+                    jump_point_search=jump_point_search,
                 )
                 if not ok:
                     return {"ok": False, "failed_goal": {"x": goal[0], "y": goal[1]}}
@@ -203,6 +208,7 @@ class NavigationService:
         v_max: int,
         minimap_mask_circle: bool,
         use_skeleton: bool,
+        jump_point_search: bool = False,
     ) -> bool:
         start_time = time.time()
         while time.time() - start_time < timeout:
@@ -236,7 +242,14 @@ class NavigationService:
                 time.sleep(0.1)
                 continue
 
-            path = self._plan_path(passable, (cur_x, cur_y), goal_xy, step=4, use_skeleton=use_skeleton)
+            path = self._plan_path(
+                passable,
+                (cur_x, cur_y),
+                goal_xy,
+                step=4,
+                use_skeleton=use_skeleton,
+                jump_point_search=jump_point_search,
+            )
             if not path:
                 logger.warning("Path planning failed; retrying.")
                 time.sleep(0.1)
@@ -307,68 +320,57 @@ class NavigationService:
         goal_xy: Tuple[int, int],
         step: int,
         use_skeleton: bool,
+        jump_point_search: bool = False,
     ) -> List[Tuple[int, int]]:
+        planning = self._get_planning_structures(passable, step, use_skeleton)
         if use_skeleton:
-            skeleton = self._zhang_suen_thinning(passable)
+            skeleton = planning["skeleton"]
             if skeleton.any():
                 start = self._nearest_mask_point(skeleton, start_xy)
                 goal = self._nearest_mask_point(skeleton, goal_xy)
                 if start and goal:
-                    skel_path = self._astar_on_mask(skeleton, start, goal)
+                    skel_path = self._search(planning["skeleton_finder"], start, goal, jump_point_search)
                     if skel_path:
                         return skel_path
 
-        grid = self._build_grid(passable, step)
+        grid_finder: GridPathfinder = planning["grid_finder"]
         start_cell = (start_xy[0] // step, start_xy[1] // step)
         goal_cell = (goal_xy[0] // step, goal_xy[1] // step)
-        start_cell = self._nearest_passable(grid, start_cell)
-        goal_cell = self._nearest_passable(grid, goal_cell)
+        start_cell = grid_finder.nearest_passable(start_cell)
+        goal_cell = grid_finder.nearest_passable(goal_cell)
         if start_cell is None or goal_cell is None:
             return []
-        path_cells = self._astar(grid, start_cell, goal_cell)
+        path_cells = self._search(grid_finder, start_cell, goal_cell, jump_point_search)
         if not path_cells:
             return []
         return [(cx * step + step // 2, cy * step + step // 2) for (cx, cy) in path_cells]
 
+    def _get_planning_structures(self, passable: np.ndarray, step: int, use_skeleton: bool) -> Dict[str, Any]:
+        key = (step, use_skeleton)
+        cached = self._planning_cache.get(key)
+        if cached is not None and cached[0] is passable:
+            return cached[1]
+        planning: Dict[str, Any] = {"grid_finder": GridPathfinder(self._build_grid(passable, step))}
+        if use_skeleton:
+            skeleton = self._zhang_suen_thinning(passable)
+            planning["skeleton"] = skeleton
+            planning["skeleton_finder"] = GridPathfinder(skeleton)
+        self._planning_cache = {key: (passable, planning)}
+        return planning
+
+    @staticmethod
+    def _search(
+        finder: GridPathfinder,
+        start: Tuple[int, int],
+        goal: Tuple[int, int],
+        jump_point_search: bool,
+    ) -> List[Tuple[int, int]]:
+        if jump_point_search:
+            return finder.jump_point_search(start, goal)
+        return finder.astar(start, goal)
+
     def _zhang_suen_thinning(self, bin_img: np.ndarray) -> np.ndarray:
-        img = (bin_img > 0).astype(np.uint8)
-        changed = True
-        h, w = img.shape
-        while changed:
-            changed = False
-            to_del = []
-            for y in range(1, h - 1):
-                for x in range(1, w - 1):
-                    if img[y, x] == 0:
-                        continue
-                    p2, p3, p4, p5 = img[y - 1, x], img[y - 1, x + 1], img[y, x + 1], img[y + 1, x + 1]
-                    p6, p7, p8, p9 = img[y + 1, x], img[y + 1, x - 1], img[y, x - 1], img[y - 1, x - 1]
-                    neighbors = [p2, p3, p4, p5, p6, p7, p8, p9]
-                    c = sum((neighbors[i] == 0 and neighbors[(i + 1) % 8] == 1) for i in range(8))
-                    n = sum(neighbors)
-                    if 2 <= n <= 6 and c == 1 and p2 * p4 * p6 == 0 and p4 * p6 * p8 == 0:
-                        to_del.append((y, x))
-            if to_del:
-                changed = True
-                for y, x in to_del:
-                    img[y, x] = 0
-            to_del = []
-            for y in range(1, h - 1):
-                for x in range(1, w - 1):
-                    if img[y, x] == 0:
-                        continue
-                    p2, p3, p4, p5 = img[y - 1, x], img[y - 1, x + 1], img[y, x + 1], img[y + 1, x + 1]
-                    p6, p7, p8, p9 = img[y + 1, x], img[y + 1, x - 1], img[y, x - 1], img[y - 1, x - 1]
-                    neighbors = [p2, p3, p4, p5, p6, p7, p8, p9]
-                    c = sum((neighbors[i] == 0 and neighbors[(i + 1) % 8] == 1) for i in range(8))
-                    n = sum(neighbors)
-                    if 2 <= n <= 6 and c == 1 and p2 * p4 * p8 == 0 and p2 * p6 * p8 == 0:
-                        to_del.append((y, x))
-            if to_del:
-                changed = True
-                for y, x in to_del:
-                    img[y, x] = 0
-        return img
+        return zhang_suen_thinning(bin_img)
 
     def _nearest_mask_point(
         self,
@@ -392,68 +394,13 @@ class NavigationService:
         start: Tuple[int, int],
         goal: Tuple[int, int],
     ) -> List[Tuple[int, int]]:
-        import heapq
-
-        def heuristic(a: Tuple[int, int], b: Tuple[int, int]) -> float:
-            return math.hypot(a[0] - b[0], a[1] - b[1])
-
-        neighbors = [
-            (-1, 0), (1, 0), (0, -1), (0, 1),
-            (-1, -1), (-1, 1), (1, -1), (1, 1),
-        ]
-        open_set = []
-        heapq.heappush(open_set, (0.0, start))
-        came_from: Dict[Tuple[int, int], Tuple[int, int]] = {}
-        g_score = {start: 0.0}
-
-        max_iters = mask.shape[0] * mask.shape[1] * 2
-        iters = 0
-        while open_set and iters < max_iters:
-            iters += 1
-            _, current = heapq.heappop(open_set)
-            if current == goal:
-                return self._reconstruct_path(came_from, current)
-            for dx, dy in neighbors:
-                nx, ny = current[0] + dx, current[1] + dy
-                if not (0 <= ny < mask.shape[0] and 0 <= nx < mask.shape[1]):
-                    continue
-                if mask[ny, nx] == 0:
-                    continue
-                neighbor = (nx, ny)
-                tentative = g_score[current] + (1.4142 if dx != 0 and dy != 0 else 1.0)
-                if tentative < g_score.get(neighbor, float("inf")):
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative
-                    f_score = tentative + heuristic(neighbor, goal)
-                    heapq.heappush(open_set, (f_score, neighbor))
-        return []
+        return GridPathfinder(mask).astar(start, goal)
 
     def _build_grid(self, passable: np.ndarray, step: int) -> np.ndarray:
-        h, w = passable.shape[:2]
-        gh = (h + step - 1) // step
-        gw = (w + step - 1) // step
-        grid = np.zeros((gh, gw), dtype=np.uint8)
-        for gy in range(gh):
-            y0 = gy * step
-            y1 = min((gy + 1) * step, h)
-            for gx in range(gw):
-                x0 = gx * step
-                x1 = min((gx + 1) * step, w)
-                if np.any(passable[y0:y1, x0:x1] > 0):
-                    grid[gy, gx] = 1
-        return grid
+        return build_grid(passable, step)
 
     def _nearest_passable(self, grid: np.ndarray, cell: Tuple[int, int]) -> Optional[Tuple[int, int]]:
-        gx, gy = cell
-        if 0 <= gy < grid.shape[0] and 0 <= gx < grid.shape[1] and grid[gy, gx] > 0:
-            return cell
-        for radius in range(1, 20):
-            for dy in range(-radius, radius + 1):
-                for dx in range(-radius, radius + 1):
-                    nx, ny = gx + dx, gy + dy
-                    if 0 <= ny < grid.shape[0] and 0 <= nx < grid.shape[1] and grid[ny, nx] > 0:
-                        return (nx, ny)
-        return None
+        return GridPathfinder(grid).nearest_passable(cell)
 
     def _astar(
         self,
@@ -461,54 +408,7 @@ class NavigationService:
         start: Tuple[int, int],
         goal: Tuple[int, int],
     ) -> List[Tuple[int, int]]:
-        import heapq
-
-        def heuristic(a: Tuple[int, int], b: Tuple[int, int]) -> float:
-            return math.hypot(a[0] - b[0], a[1] - b[1])
-
-        neighbors = [
-            (-1, 0), (1, 0), (0, -1), (0, 1),
-            (-1, -1), (-1, 1), (1, -1), (1, 1),
-        ]
-        open_set = []
-        heapq.heappush(open_set, (0.0, start))
-        came_from: Dict[Tuple[int, int], Tuple[int, int]] = {}
-        g_score = {start: 0.0}
-
-        max_iters = grid.shape[0] * grid.shape[1] * 2
-        iters = 0
-        while open_set and iters < max_iters:
-            iters += 1
-            _, current = heapq.heappop(open_set)
-            if current == goal:
-                return self._reconstruct_path(came_from, current)
-
-            for dx, dy in neighbors:
-                nx, ny = current[0] + dx, current[1] + dy
-                if not (0 <= ny < grid.shape[0] and 0 <= nx < grid.shape[1]):
-                    continue
-                if grid[ny, nx] == 0:
-                    continue
-                neighbor = (nx, ny)
-                tentative = g_score[current] + (1.4142 if dx != 0 and dy != 0 else 1.0)
-                if tentative < g_score.get(neighbor, float("inf")):
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative
-                    f_score = tentative + heuristic(neighbor, goal)
-                    heapq.heappush(open_set, (f_score, neighbor))
-        return []
-
-    def _reconstruct_path(
-        self,
-        came_from: Dict[Tuple[int, int], Tuple[int, int]],
-        current: Tuple[int, int],
-    ) -> List[Tuple[int, int]]:
-        path = [current]
-        while current in came_from:
-            current = came_from[current]
-            path.append(current)
-        path.reverse()
-        return path
+        return GridPathfinder(grid).astar(start, goal)
 
     def _ensure_heading_detector(self, template_dir: Path, match_threshold: float):
         if self._heading_detector is None or self._heading_template_dir != template_dir:
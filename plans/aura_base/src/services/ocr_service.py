@@ -1,10 +1,14 @@
 # packages/aura_base/services/ocr_service.py (最终稳定版 - 异步核心)
 
 import asyncio
+import hashlib
 import re
 import threading
-from dataclasses import dataclass, field
-from typing import Any, List, Dict, Optional, TYPE_CHECKING
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from itertools import islice
+from typing import Any, List, Dict, Optional, Sequence, Tuple, TYPE_CHECKING
 
 import cv2
 import numpy as np
@@ -31,6 +35,83 @@ class MultiOcrResult:
     results: list[OcrResult] = field(default_factory=list)
 
 
+def image_fingerprint(image: np.ndarray) -> Tuple[str, tuple, str]:
+    """像素内容指纹：blake2b(原始字节) + 形状 + dtype；裁剪视图会先转成连续内存。"""
+    data = np.ascontiguousarray(image)
+    digest = hashlib.blake2b(memoryview(data).cast("B"), digest_size=16).hexdigest()
+    return digest, tuple(data.shape), data.dtype.str
+
+
+def _copy_result(result: OcrResult, dx: int = 0, dy: int = 0) -> OcrResult:
+    """复制一个识别结果，并可选地把坐标平移 (dx, dy)。"""
+    center = result.center_point
+    rect = result.rect
+    if dx or dy:
+        center = (center[0] + dx, center[1] + dy) if center else center
+        rect = (rect[0] + dx, rect[1] + dy, rect[2], rect[3]) if rect else rect
+    return replace(result, center_point=center, rect=rect, debug_info=dict(result.debug_info))
+
+
+class OcrResultCache:
+    """
+    已解析 OCR 结果的 LRU + TTL 缓存。
+
+    键为 (像素指纹, OCR 参数)。命中时返回结果的副本，调用方修改坐标等字段不会污染缓存。
+    """
+
+    def __init__(self, maxsize: int = 64, ttl_sec: float = 5.0):
+        self.maxsize = max(0, int(maxsize))
+        self.ttl_sec = float(ttl_sec)
+        self._entries: "OrderedDict[tuple, Tuple[float, Tuple[OcrResult, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def get(self, key: tuple) -> Optional[List[OcrResult]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] > self.ttl_sec:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            results = entry[1]
+        return [_copy_result(result) for result in results]
+
+    def put(self, key: tuple, results: List[OcrResult]):
+        if self.maxsize <= 0:
+            return
+        frozen = tuple(_copy_result(result) for result in results)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), frozen)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_sec": self.ttl_sec,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
 @service_info(alias="ocr", public=True)
 class OcrService:
     """
@@ -38,8 +119,17 @@ class OcrService:
     - 对外保持100%兼容的同步接口。
     - 内部使用异步核心和单一共享引擎，从根本上解决内存爆炸和启动风暴问题。
     - 通过信号量控制并发，保护GPU资源，确保高负载下系统稳定。
+    - 解析后的结果按像素指纹缓存，同一画面/区域重复识别只需计算一次哈希。
+    - 并发请求（以及同一请求中的多个区域）在短窗口内合并，一次 predict 批量识别。
     """
 
+    OCR_CACHE_SIZE = 64
+    OCR_CACHE_TTL_SEC = 5.0
+    OCR_BATCH_SIZE = 16
+    OCR_BATCH_WINDOW_SEC = 0.003  # 等待同时到达的请求进入同一批次
+    # 影响识别结果的推理参数，同时作为缓存键的一部分。
+    PREDICT_KWARGS = (("use_doc_orientation_classify", False),)
+
     def __init__(self):
         # --- 异步核心组件 ---
         self._engine: Optional["PaddleOCR"] = None
@@ -51,6 +141,15 @@ class OcrService:
         # --- 同步接口组件 ---
         self._loop_lock = threading.Lock()  # 用于安全地获取事件循环
 
+        # --- 结果缓存 ---
+        self.result_cache = OcrResultCache(maxsize=self.OCR_CACHE_SIZE, ttl_sec=self.OCR_CACHE_TTL_SEC)
+
+        # --- 批量识别（只在事件循环线程中访问）---
+        self._pending: "OrderedDict[tuple, Tuple[np.ndarray, List[asyncio.Future]]]" = OrderedDict()
+        self._inflight: Dict[tuple, List[asyncio.Future]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._batch_stats = {"batches": 0, "images": 0, "coalesced": 0}
+
     # =========================================================================
     # Section 1: 公共同步接口 (保持100%向后兼容)
     # =========================================================================
@@ -107,6 +206,36 @@ class OcrService:
         """【保持同步】识别所有文本。"""
         return self._submit_to_loop_and_wait(self._recognize_all_async(source_image))
 
+    def recognize_regions(self, source_image: np.ndarray,
+                          regions: Sequence[Tuple[int, int, int, int]]) -> List[MultiOcrResult]:
+        """
+        【同步】在同一张图上识别多个 (x, y, w, h) 区域，所有区域合并为一次批量推理。
+        返回列表与 regions 一一对应，坐标已换算回 source_image 坐标系。
+        """
+        return self._submit_to_loop_and_wait(self._recognize_regions_async(source_image, regions))
+
+    def set_engine(self, engine: Any, device: str = "external"):
+        """
+        注入一个已创建的识别引擎（需提供与 PaddleOCR 相同的 predict(images, **kwargs) 接口），
+        主要用于测试或复用外部初始化的引擎。
+        """
+        self._engine = engine
+        self._engine_device = device
+        self.result_cache.clear()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """返回 OCR 结果缓存的命中率等统计。"""
+        return self.result_cache.stats()
+
+    def get_batch_stats(self) -> Dict[str, Any]:
+        """返回批量识别的统计：批次数、送检图像数、被合并的重复请求数。"""
+        stats = dict(self._batch_stats)
+        stats["avg_batch_size"] = stats["images"] / stats["batches"] if stats["batches"] else 0.0
+        return stats
+
+    def clear_cache(self):
+        self.result_cache.clear()
+
     # =========================================================================
     # Section 2: 内部异步核心实现
     # =========================================================================
@@ -212,39 +341,156 @@ class OcrService:
         all_parsed_results = await self._recognize_all_and_parse_async(source_image)
         return MultiOcrResult(count=len(all_parsed_results), results=all_parsed_results)
 
+    async def _recognize_regions_async(self, source_image: np.ndarray,
+                                       regions: Sequence[Tuple[int, int, int, int]]) -> List[MultiOcrResult]:
+        """【异步内核】裁剪各区域后批量识别，再把结果平移回原图坐标。"""
+        crops: List[np.ndarray] = []
+        offsets: List[Optional[Tuple[int, int]]] = []
+        for region in regions:
+            clipped = self._clip_region(source_image.shape, region)
+            if clipped is None:
+                logger.warning("OCR区域 %s 超出图像范围 %s，已跳过。", region, source_image.shape[:2])
+                offsets.append(None)
+                continue
+            x, y, w, h = clipped
+            crops.append(source_image[y:y + h, x:x + w])
+            offsets.append((x, y))
+
+        parsed_per_crop = iter(await self._recognize_batch_async(crops))
+        outputs = []
+        for offset in offsets:
+            if offset is None:
+                outputs.append(MultiOcrResult())
+                continue
+            results = [_copy_result(r, offset[0], offset[1]) for r in next(parsed_per_crop)]
+            outputs.append(MultiOcrResult(count=len(results), results=results))
+        return outputs
+
     # =========================================================================
     # Section 3: 核心辅助工具
     # =========================================================================
 
     async def _recognize_all_and_parse_async(self, source_image: np.ndarray) -> List[OcrResult]:
-        """【异步内核】这是所有识别功能的核心，它处理并发控制和OCR执行。"""
-        engine = await self._get_engine_async()
+        """【异步内核】这是所有识别功能的核心，单张图同样走缓存和批量通道。"""
+        return (await self._recognize_batch_async([source_image]))[0]
 
-        async with self._ocr_semaphore:
-            # 使用 asyncio.to_thread 在后台线程中执行阻塞的OCR预测
-            raw_results = await asyncio.to_thread(
-                self._run_ocr_sync, engine, source_image
-            )
+    async def _recognize_batch_async(self, images: Sequence[np.ndarray]) -> List[List[OcrResult]]:
+        """
+        【异步内核】识别一组图像：先查缓存，未命中的进入待处理队列，
+        与同一窗口内其他请求的图像合并成一次 predict 调用。
+        """
+        if not images:
+            return []
+        # 大图哈希也要几毫秒，放到线程里算，不占用事件循环。
+        fingerprints = await asyncio.to_thread(lambda: [image_fingerprint(image) for image in images])
+        loop = asyncio.get_running_loop()
+        futures = []
+        for image, fingerprint in zip(images, fingerprints):
+            cache_key = (fingerprint, self.PREDICT_KWARGS)
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                future = loop.create_future()
+                future.set_result(cached)
+            else:
+                future = self._enqueue_for_batch(loop, cache_key, image)
+            futures.append(future)
+        return list(await asyncio.gather(*futures))
+
+    def _enqueue_for_batch(self, loop: asyncio.AbstractEventLoop, cache_key: tuple,
+                           image: np.ndarray) -> asyncio.Future:
+        future = loop.create_future()
+        waiters = self._inflight.get(cache_key)
+        if waiters is None and cache_key in self._pending:
+            waiters = self._pending[cache_key][1]
+        if waiters is not None:
+            # 相同像素的请求已在排队或识别中，直接共享结果。
+            waiters.append(future)
+            self._batch_stats["coalesced"] += 1
+        else:
+            self._pending[cache_key] = (image, [future])
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_batches_async())
+        return future
+
+    async def _flush_batches_async(self):
+        """【异步内核】把待处理队列按 OCR_BATCH_SIZE 切批，逐批执行并分发结果。"""
+        await asyncio.sleep(self.OCR_BATCH_WINDOW_SEC)
+        while self._pending:
+            batch_keys = list(islice(self._pending, self.OCR_BATCH_SIZE))
+            batch_images = []
+            for cache_key in batch_keys:
+                image, waiters = self._pending.pop(cache_key)
+                self._inflight[cache_key] = waiters
+                batch_images.append(image)
+            try:
+                engine = await self._get_engine_async()
+                async with self._ocr_semaphore:
+                    # 使用 asyncio.to_thread 在后台线程中执行阻塞的OCR预测
+                    raw_results = await asyncio.to_thread(self._run_ocr_batch_sync, engine, batch_images)
+                # 解析是纯CPU计算，可以在主线程快速完成
+                parsed_batch = self._parse_batch_results(raw_results, len(batch_images))
+            except BaseException as exc:
+                for cache_key in batch_keys:
+                    for future in self._inflight.pop(cache_key, []):
+                        if future.done():
+                            continue
+                        if isinstance(exc, Exception):
+                            future.set_exception(exc)
+                        else:
+                            future.cancel()
+                if not isinstance(exc, Exception):
+                    raise
+                continue
 
-        # 解析是纯CPU计算，可以在主线程快速完成
-        return self._parse_results(raw_results)
+            self._batch_stats["batches"] += 1
+            self._batch_stats["images"] += len(batch_images)
+            for cache_key, parsed in zip(batch_keys, parsed_batch):
+                self.result_cache.put(cache_key, parsed)
+                for future in self._inflight.pop(cache_key, []):
+                    if not future.done():
+                        future.set_result([_copy_result(result) for result in parsed])
 
     def _run_ocr_sync(self, engine: "PaddleOCR", image: np.ndarray) -> List[Dict]:
-        """【内部同步】这是一个纯粹的、阻塞的同步函数，用于在线程池中执行。"""
-        if len(image.shape) == 2:
-            image_bgr = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
-        else:
-            image_bgr = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-
-        result = engine.predict(image_bgr, use_doc_orientation_classify=False)
-        return result
+        """【内部同步】识别单张图像（预热等场景），返回与批量调用相同格式的原始结果。"""
+        return self._run_ocr_batch_sync(engine, [image])
+
+    def _run_ocr_batch_sync(self, engine: "PaddleOCR", images: Sequence[np.ndarray]) -> List[Dict]:
+        """【内部同步】颜色转换只作用于实际送检的图像/裁剪区域，然后一次 predict 识别整批。"""
+        images_bgr = []
+        for image in images:
+            if len(image.shape) == 2:
+                images_bgr.append(cv2.cvtColor(image, cv2.COLOR_GRAY2BGR))
+            else:
+                images_bgr.append(cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
+        return engine.predict(images_bgr, **dict(self.PREDICT_KWARGS))
+
+    @staticmethod
+    def _clip_region(shape: Tuple[int, ...], region: Tuple[int, int, int, int]) -> Optional[Tuple[int, int, int, int]]:
+        x, y, w, h = (int(v) for v in region)
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(shape[1], x + w), min(shape[0], y + h)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return x0, y0, x1 - x0, y1 - y0
+
+    def _parse_batch_results(self, ocr_raw_results: List[Dict], expected: int) -> List[List[OcrResult]]:
+        """【内部同步】批量 predict 对每张输入图返回一项结果，按顺序逐项解析。"""
+        raw_items = list(ocr_raw_results or [])
+        if len(raw_items) != expected:
+            raise RuntimeError(f"OCR引擎对 {expected} 张图像返回了 {len(raw_items)} 个结果。")
+        return [self._parse_result_item(item) for item in raw_items]
 
     def _parse_results(self, ocr_raw_results: List[Dict]) -> List[OcrResult]:
         """【内部同步】纯数据处理，无需修改。"""
+        if not ocr_raw_results:
+            return []
+        return self._parse_result_item(ocr_raw_results[0])
+
+    def _parse_result_item(self, data: Dict) -> List[OcrResult]:
+        """【内部同步】解析单张图像的原始识别结果。"""
         parsed_list = []
-        if not ocr_raw_results or not ocr_raw_results[0]:
+        if not data:
             return []
-        data = ocr_raw_results[0]
         texts = data.get('rec_texts', [])
         scores = data.get('rec_scores', [])
         boxes = data.get('rec_polys', [])
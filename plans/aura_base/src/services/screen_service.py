@@ -3,19 +3,30 @@
 import asyncio
 import threading
 import time
-from ctypes import windll
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
-import win32con
-import win32gui
-import win32ui
+
+try:
+    from ctypes import windll
+    import win32con
+    import win32gui
+    import win32ui
+
+    WIN32_AVAILABLE = True
+except ImportError:
+    windll = None  # type: ignore
+    win32con = None  # type: ignore
+    win32gui = None  # type: ignore
+    win32ui = None  # type: ignore
+    WIN32_AVAILABLE = False
 
 from packages.aura_core.api import service_info
 from packages.aura_core.observability.logging.core_logger import logger
 from .config_service import ConfigService
+from .frame_bus import FileFrameSource, Frame, FrameBus, FrameSource, SyntheticFrameSource
 
 
 @dataclass
@@ -51,9 +62,15 @@ class CaptureResult:
 class ScreenService:
     """
     Async screen capture service with sync facade.
+
+    Captures without an explicit backend go through a per-target FrameBus: the
+    whole client frame is grabbed at most once per freshness window and shared
+    (read-only) by every consumer; `rect` requests are cropped from it.
     """
 
-    _ALL_BACKENDS = ("dxgi", "gdi", "mss")
+    _NATIVE_BACKENDS = ("dxgi", "gdi", "mss")
+    _STANDIN_BACKENDS = ("synthetic", "file")
+    _ALL_BACKENDS = _NATIVE_BACKENDS + _STANDIN_BACKENDS
 
     def __init__(self, config: ConfigService):
         """Initialize screen service.
@@ -72,6 +89,10 @@ class ScreenService:
         self._dxgi_lock = threading.Lock()
         self._dxgi_camera = None
 
+        self._frame_buses: Dict[tuple, FrameBus] = {}
+        self._frame_sources: Dict[str, FrameSource] = {}
+        self._frame_lock = threading.Lock()
+
     # =========================================================================
     # Configuration properties (dynamic access via ConfigService)
     # =========================================================================
@@ -81,10 +102,16 @@ class ScreenService:
         """Get enabled backends from current plan's config."""
         configured = self.config.get('screen.capture.enabled_backends', None)
         if not isinstance(configured, list):
-            return list(self._ALL_BACKENDS)
+            return self._default_backends()
         normalized = [str(item).lower() for item in configured]
         filtered = [item for item in normalized if item in self._ALL_BACKENDS]
-        return filtered or list(self._ALL_BACKENDS)
+        return filtered or self._default_backends()
+
+    def _default_backends(self) -> list[str]:
+        # Stand-in sources are never picked implicitly; without pywin32 only mss can work.
+        if WIN32_AVAILABLE:
+            return list(self._NATIVE_BACKENDS)
+        return ["mss"]
 
     @property
     def default_backend(self) -> str:
@@ -116,6 +143,11 @@ class ScreenService:
         """Get min edge ratio threshold from config."""
         return float(self.config.get('screen.capture.min_edge_ratio', 0.001))
 
+    @property
+    def frame_freshness_ms(self) -> float:
+        """Max age of a shared frame; 0 disables sharing (concurrent requests still coalesce)."""
+        return float(self.config.get('screen.capture.frame_bus.freshness_ms', 33))
+
     # =========================================================================
     # Section 1: Public sync APIs
     # =========================================================================
@@ -142,9 +174,14 @@ class ScreenService:
 
     def self_check(self) -> Dict[str, Any]:
         results: Dict[str, Any] = {}
-        context = self._build_capture_context_sync(rect=None)
+        context = None
         for backend in self.enabled_backends:
-            result = self._capture_backend_sync(backend, context)
+            if backend in self._STANDIN_BACKENDS:
+                result = self._capture_standin_sync(backend, None)
+            else:
+                if context is None:
+                    context = self._build_capture_context_sync(rect=None)
+                result = self._capture_backend_sync(backend, context)
             results[backend] = {
                 "success": result.success,
                 "error": result.error_message,
@@ -158,6 +195,8 @@ class ScreenService:
         }
 
     def get_client_rect(self) -> tuple[int, int, int, int] | None:
+        if not WIN32_AVAILABLE:
+            return None
         if not self.hwnd or not win32gui.IsWindow(self.hwnd):
             self._update_hwnd()
         if self.hwnd:
@@ -184,11 +223,51 @@ class ScreenService:
                 backend: Optional[str] = None) -> CaptureResult:
         return self._submit_to_loop_and_wait(self.capture_async(rect, backend))
 
+    def set_frame_source(self, source: FrameSource):
+        """Install a stand-in frame source for the backend named `source.name`."""
+        if source.name not in self._STANDIN_BACKENDS:
+            raise ValueError(f"Unsupported frame source backend '{source.name}'.")
+        with self._frame_lock:
+            previous = self._frame_sources.get(source.name)
+            self._frame_sources[source.name] = source
+            self._frame_buses.clear()
+        if previous is not None and previous is not source:
+            previous.close()
+
+    def invalidate_frames(self):
+        """Drop shared frames so the next capture is taken after this call."""
+        with self._frame_lock:
+            buses = list(self._frame_buses.values())
+        for bus in buses:
+            bus.invalidate()
+
+    def get_frame_bus(self) -> FrameBus:
+        """Frame bus of the current capture target (window title + backend order)."""
+        key = (self.target_title, tuple(self._get_backend_order()))
+        with self._frame_lock:
+            bus = self._frame_buses.get(key)
+            if bus is None:
+                bus = FrameBus(self._capture_frame_sync, freshness_ms=self.frame_freshness_ms)
+                self._frame_buses[key] = bus
+            return bus
+
+    def frame_bus_stats(self) -> Dict[str, int]:
+        with self._frame_lock:
+            buses = list(self._frame_buses.values())
+        totals = {"captures": 0, "shared": 0, "coalesced": 0, "failures": 0}
+        for bus in buses:
+            for name, value in bus.stats().items():
+                totals[name] += value
+        return totals
+
     # =========================================================================
     # Section 2: Async core
     # =========================================================================
 
     async def focus_async(self) -> bool:
+        if not WIN32_AVAILABLE:
+            logger.warning("Window focus requires pywin32; skipped.")
+            return False
         await asyncio.to_thread(self._update_hwnd)
         if self.hwnd:
             try:
@@ -250,14 +329,131 @@ class ScreenService:
 
     async def capture_async(self, rect: tuple[int, int, int, int] | None = None,
                             backend: Optional[str] = None) -> CaptureResult:
-        return await asyncio.to_thread(self._capture_with_fallback_sync, rect, backend)
+        if backend:
+            # An explicit backend is a diagnostic request: always grab directly.
+            return await asyncio.to_thread(self._capture_with_fallback_sync, rect, backend)
+        return await asyncio.to_thread(self._capture_shared_sync, rect)
+
+    async def get_frame_async(self, max_age_ms: Optional[float] = None) -> Frame | CaptureResult:
+        """Shared full frame (read-only) or the failed CaptureResult."""
+        bus = self.get_frame_bus()
+        return await asyncio.to_thread(bus.get, self._max_age(max_age_ms))
 
     # =========================================================================
     # Section 3: Sync capture implementations
     # =========================================================================
 
+    def _max_age(self, max_age_ms: Optional[float]) -> float:
+        return self.frame_freshness_ms if max_age_ms is None else float(max_age_ms)
+
+    def _capture_shared_sync(self, rect: tuple[int, int, int, int] | None) -> CaptureResult:
+        outcome = self.get_frame_bus().get(self._max_age(None))
+        if not isinstance(outcome, Frame):
+            return outcome
+        return self._crop_frame(outcome, rect)
+
+    def _capture_frame_sync(self) -> Frame | CaptureResult:
+        """FrameBus capture function: grab the whole client area once."""
+        result, supports_sub_rect = self._capture_full_sync()
+        if not result.success or result.image is None:
+            return result
+        return Frame(
+            image=result.image,
+            backend=result.backend,
+            window_rect=result.window_rect,
+            relative_rect=result.relative_rect,
+            quality_flags=tuple(result.quality_flags),
+            supports_sub_rect=supports_sub_rect,
+        )
+
+    def _capture_full_sync(self) -> Tuple[CaptureResult, bool]:
+        last_result: Optional[CaptureResult] = None
+        context: Optional[Dict[str, Any]] = None
+        for name in self._get_backend_order():
+            if name in self._STANDIN_BACKENDS:
+                result = self._capture_standin_sync(name, None)
+                supports_sub_rect = True
+            else:
+                if context is None:
+                    context = self._build_capture_context_sync(None)
+                result = self._capture_backend_sync(name, context)
+                supports_sub_rect = context.get("mode") == "window"
+            last_result = result
+            if result.success:
+                self._runtime_default_backend = name
+                return result, supports_sub_rect
+        if last_result:
+            return last_result, False
+        return CaptureResult(success=False, error_message="No capture backends available."), False
+
+    def _crop_frame(self, frame: Frame, rect: tuple[int, int, int, int] | None) -> CaptureResult:
+        base_rect = frame.relative_rect or (0, 0, frame.image.shape[1], frame.image.shape[0])
+        if rect and not frame.supports_sub_rect:
+            logger.warning("Capture rect ignored in fullscreen mode.")
+            rect = None
+        if not rect:
+            return CaptureResult(success=True, image=frame.image, window_rect=frame.window_rect,
+                                 relative_rect=base_rect, backend=frame.backend,
+                                 quality_flags=list(frame.quality_flags))
+        try:
+            image, relative_rect = self._apply_sub_rect(frame.image, rect, (0, 0, base_rect[2], base_rect[3]))
+        except ValueError as e:
+            return CaptureResult(success=False, backend=frame.backend, window_rect=frame.window_rect,
+                                 error_message=str(e))
+        result = CaptureResult(success=True, image=image, window_rect=frame.window_rect,
+                               relative_rect=relative_rect, backend=frame.backend)
+        return self._finalize_capture_result(result, (rect[2], rect[3]))
+
+    def _get_frame_source(self, backend: str) -> Optional[FrameSource]:
+        with self._frame_lock:
+            source = self._frame_sources.get(backend)
+            if source is not None:
+                return source
+            if backend == "synthetic":
+                size = self.config.get('screen.capture.synthetic.size', None) or [1280, 720]
+                source = SyntheticFrameSource(
+                    width=int(size[0]),
+                    height=int(size[1]),
+                    seed=int(self.config.get('screen.capture.synthetic.seed', 0)),
+                    change_every=int(self.config.get('screen.capture.synthetic.change_every', 1)),
+                )
+            elif backend == "file":
+                path = self.config.get('screen.capture.file.path', None)
+                if not path:
+                    return None
+                source = FileFrameSource(str(path), loop=bool(self.config.get('screen.capture.file.loop', True)))
+            else:
+                return None
+            self._frame_sources[backend] = source
+            return source
+
+    def _capture_standin_sync(self, backend: str,
+                              sub_rect: tuple[int, int, int, int] | None) -> CaptureResult:
+        try:
+            source = self._get_frame_source(backend)
+        except (OSError, ValueError) as e:
+            return CaptureResult(success=False, backend=backend, error_message=str(e))
+        if source is None:
+            return CaptureResult(success=False, backend=backend, error_message=f"No '{backend}' frame source configured.")
+        image = source.grab()
+        if image is None:
+            return CaptureResult(success=False, backend=backend, error_message=f"'{backend}' source has no frame.")
+        base_rect = (0, 0, image.shape[1], image.shape[0])
+        try:
+            image, relative_rect = self._apply_sub_rect(image, sub_rect, base_rect)
+        except ValueError as e:
+            return CaptureResult(success=False, backend=backend, window_rect=base_rect, error_message=str(e))
+        result = CaptureResult(success=True, image=image, window_rect=base_rect,
+                               relative_rect=relative_rect, backend=backend)
+        expected_size = (sub_rect[2], sub_rect[3]) if sub_rect else (base_rect[2], base_rect[3])
+        return self._finalize_capture_result(result, expected_size)
+
     def _capture_with_fallback_sync(self, rect: tuple[int, int, int, int] | None,
                                     backend: Optional[str]) -> CaptureResult:
+        if backend and backend.lower() in self._STANDIN_BACKENDS:
+            if backend.lower() not in self.enabled_backends:
+                return CaptureResult(success=False, backend=backend.lower(), error_message="Backend not enabled.")
+            return self._capture_standin_sync(backend.lower(), rect)
         context = self._build_capture_context_sync(rect)
         if backend:
             return self._capture_backend_sync(backend.lower(), context)
@@ -265,7 +461,10 @@ class ScreenService:
         backends = self._get_backend_order()
         last_result: Optional[CaptureResult] = None
         for name in backends:
-            result = self._capture_backend_sync(name, context)
+            if name in self._STANDIN_BACKENDS:
+                result = self._capture_standin_sync(name, rect)
+            else:
+                result = self._capture_backend_sync(name, context)
             last_result = result
             if result.success:
                 self._runtime_default_backend = name  # ✅ Set runtime preference
@@ -342,7 +541,7 @@ class ScreenService:
         return CaptureResult(success=False, backend=backend, error_message="Unknown backend.")
 
     def _build_capture_context_sync(self, rect: tuple[int, int, int, int] | None) -> Dict[str, Any]:
-        if self.target_title:
+        if self.target_title and WIN32_AVAILABLE:
             if not self.hwnd or not win32gui.IsWindow(self.hwnd):
                 self._update_hwnd()
 
@@ -616,7 +815,7 @@ class ScreenService:
             return CaptureResult(success=False, window_rect=window_rect, error_message=str(e))
 
     def _update_hwnd(self):
-        if self.target_title:
+        if self.target_title and WIN32_AVAILABLE:
             try:
                 self.hwnd = win32gui.FindWindow(None, self.target_title)
                 if not self.hwnd:
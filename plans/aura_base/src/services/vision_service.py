@@ -1,8 +1,14 @@
 # src/notifier_services/vision_service.py (异步升级版)
 
 import asyncio
+import functools
 import glob
+import os
 import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Tuple, Optional, Dict, List, Iterable
@@ -11,6 +17,7 @@ import cv2
 import numpy as np
 
 from packages.aura_core.api import service_info
+from packages.aura_core.config.loader import get_config_value
 from packages.aura_core.observability.logging.core_logger import logger
 
 
@@ -39,14 +46,160 @@ class TemplateLibrary:
     extensions: tuple[str, ...]
 
 
+class TemplateImageCache:
+    """
+    已解码并预处理的模板图像 LRU 缓存。
+
+    键为 (绝对路径, mtime_ns, 文件大小, 灰度, 预处理方式)；文件被改写后 mtime 变化，
+    旧条目自然失效并最终被淘汰。缓存的数组设为只读，防止调用方意外修改共享数据。
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = max(0, int(maxsize))
+        self._entries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, path: str, use_grayscale: bool, preprocess: str, loader) -> np.ndarray:
+        try:
+            st = os.stat(path)
+        except OSError:
+            raise FileNotFoundError(f"无法从路径加载图像: {path}")
+        key = (os.path.abspath(path), st.st_mtime_ns, st.st_size, bool(use_grayscale), (preprocess or "none").lower())
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return image
+            self.misses += 1
+
+        image = loader()
+        image.setflags(write=False)
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[key] = image
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return image
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+@dataclass(frozen=True)
+class _TemplateListing:
+    """一次模板展开的结果及其依赖的目录 mtime，用于判断结果是否仍然有效。"""
+    paths: tuple[Path, ...]
+    dir_mtimes: tuple[tuple[str, int], ...]
+
+    def is_current(self) -> bool:
+        for dir_path, mtime_ns in self.dir_mtimes:
+            try:
+                if os.stat(dir_path).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+
+def extract_match_candidates(score_map: np.ndarray,
+                             threshold: float,
+                             min_distance: int = 1,
+                             top_k: Optional[int] = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    从匹配得分图中向量化地提取候选点（得分越高越好）。
+
+    Args:
+        score_map: 已归一化的得分图。
+        threshold: 得分下限。
+        min_distance: 局部极大值抑制半径；只保留在 (2r+1)x(2r+1) 邻域内得分最高的点，0 表示不抑制。
+        top_k: 最多保留的候选数，超出时只保留得分最高的。
+
+    Returns:
+        (xs, ys, scores)，按得分降序排列，得分相同时按行优先顺序。
+    """
+    score_map = np.asarray(score_map, dtype=np.float32)
+    keep = score_map >= threshold
+    if min_distance > 0 and keep.any():
+        size = 2 * int(min_distance) + 1
+        neighbourhood_max = cv2.dilate(score_map, np.ones((size, size), dtype=np.uint8))
+        keep &= score_map >= neighbourhood_max
+    ys, xs = np.nonzero(keep)
+    scores = score_map[ys, xs]
+    if top_k is not None and 0 <= top_k < scores.size:
+        # argpartition 先取出前 k 个，再只对这 k 个排序。
+        picked = np.sort(np.argpartition(-scores, top_k - 1)[:top_k]) if top_k else np.empty(0, dtype=np.intp)
+        xs, ys, scores = xs[picked], ys[picked], scores[picked]
+    order = np.argsort(-scores, kind="stable")
+    return xs[order], ys[order], scores[order]
+
+
+def nms_boxes(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float,
+              top_k: Optional[int] = None) -> np.ndarray:
+    """
+    向量化的贪心非极大值抑制。
+
+    Args:
+        boxes: (N, 4) 的 [x1, y1, x2, y2] 数组（x2/y2 不含）。
+        scores: (N,) 得分。
+        iou_threshold: 与已保留框的 IoU 大于该值的框被抑制。
+        top_k: 最多保留的框数。
+
+    Returns:
+        被保留的框下标，按得分降序排列。
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+    if boxes.shape[0] == 0:
+        return np.empty(0, dtype=np.intp)
+
+    x1, y1, x2, y2 = boxes.T
+    areas = np.maximum(x2 - x1, 0) * np.maximum(y2 - y1, 0)
+    order = np.argsort(-scores, kind="stable")
+    kept = []
+    while order.size:
+        i = order[0]
+        kept.append(i)
+        if top_k is not None and len(kept) >= top_k:
+            break
+        rest = order[1:]
+        inter_w = np.maximum(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0)
+        inter_h = np.maximum(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0)
+        inter = inter_w * inter_h
+        union = areas[i] + areas[rest] - inter
+        iou = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(kept, dtype=np.intp)
+
+
 @service_info(alias="vision", public=True)
 class VisionService:
     """
     【异步升级版】一个无状态的视觉服务。
     - 对外保持100%兼容的同步接口。
-    - 内部将CPU密集型的图像计算移至后台线程执行，避免阻塞事件循环。
+    - 图像读取/预处理、匹配与后处理整体在专用视觉线程池中执行，事件循环线程不做任何图像计算。
+    - 各阶段耗时记录在结果的 debug_info["timings_ms"] 中，并可通过 get_pipeline_stats() 汇总查看。
     """
 
+    TEMPLATE_CACHE_SIZE = 256
+    TEMPLATE_INDEX_SIZE = 512
+    MAX_MATCH_CANDIDATES = 4096  # 多目标匹配在 NMS 前保留的候选上限
+    # --- 金字塔匹配参数 ---
+    PYRAMID_MAX_LEVELS = 2  # 最多降采样两层（1/4 分辨率）
+    PYRAMID_MIN_TEMPLATE_SIDE = 12  # 降采样后模板短边的下限，过小则细节丢失
+    PYRAMID_CANDIDATES = 5  # 单目标匹配时在粗层保留的候选峰值数
+    PYRAMID_COARSE_MARGIN = 0.2  # 多目标匹配时粗层阈值相对 threshold 的放宽量
+    LAST_HIT_RADIUS = 16  # 上次命中位置附近的搜索半径（像素）
+    VISION_WORKERS = max(2, min(4, os.cpu_count() or 1))  # 未配置 vision.workers 时的线程数
+
     def __init__(self):
         logger.info("视觉服务 (异步核心版) 已初始化。")
         # --- 桥接器组件 ---
@@ -54,6 +207,17 @@ class VisionService:
         self._loop_lock = threading.Lock()
         self._template_libraries: Dict[str, Dict[str, TemplateLibrary]] = {}
         self._template_lock = threading.RLock()
+        # --- 模板缓存：解码结果 + 目录展开索引 ---
+        self.template_cache = TemplateImageCache(maxsize=self.TEMPLATE_CACHE_SIZE)
+        self._template_index: "OrderedDict[tuple, _TemplateListing]" = OrderedDict()
+        # --- 金字塔模式记忆的上次命中位置：(template_key, 帧尺寸) -> 左上角 ---
+        self._last_hits: "OrderedDict[tuple, tuple[int, int]]" = OrderedDict()
+        self._last_hits_lock = threading.Lock()
+        # --- 视觉线程池与阶段耗时统计 ---
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._stage_stats: Dict[str, Dict[str, float]] = {}
+        self._stats_lock = threading.Lock()
 
     # =========================================================================
     # Section 0: Template Library
@@ -75,12 +239,16 @@ class VisionService:
             logger.warning("Template library '%s' root not found: %s", name, root_path)
         with self._template_lock:
             plan_libs = self._template_libraries.setdefault(plan_key, {})
-            plan_libs[name] = TemplateLibrary(
+            library = TemplateLibrary(
                 name=name,
                 root=root_path,
                 recursive=bool(recursive),
                 extensions=normalized_exts,
             )
+            plan_libs[name] = library
+        if root_path.is_dir():
+            # 预先建立库根目录的索引，首次匹配时无需再扫描磁盘。
+            self._list_templates(root_path, library.recursive, library.extensions)
 
     def unregister_template_library(self, plan_key: str, name: str):
         if not plan_key or not name:
@@ -116,16 +284,8 @@ class VisionService:
         recursive = library.recursive if library else False
         extensions = library.extensions if library else self._normalize_extensions(None)
 
-        if self._contains_glob(str(target)):
-            matches = [
-                Path(p) for p in glob.glob(str(target), recursive=recursive)
-                if Path(p).is_file()
-            ]
-            return self._filter_by_extensions(matches, extensions)
-
-        if target.is_dir():
-            files = target.rglob("*") if recursive else target.iterdir()
-            return self._filter_by_extensions([p for p in files if p.is_file()], extensions)
+        if self._contains_glob(str(target)) or target.is_dir():
+            return self._list_templates(target, recursive, extensions)
 
         if not target.is_file():
             if expect_single:
@@ -133,6 +293,72 @@ class VisionService:
             return []
         return [target]
 
+    def _list_templates(self, target: Path, recursive: bool, extensions: tuple[str, ...]) -> List[Path]:
+        """展开目录或 glob 形式的模板引用，结果按目录 mtime 校验后复用。"""
+        key = (str(target), bool(recursive), tuple(extensions))
+        with self._template_lock:
+            listing = self._template_index.get(key)
+            if listing is not None:
+                self._template_index.move_to_end(key)
+        if listing is not None and listing.is_current():
+            return list(listing.paths)
+
+        # 先记录目录 mtime 再扫描：扫描期间发生的变更会让下次校验失败，而不是被遗漏。
+        dir_mtimes = self._snapshot_dirs(target, recursive)
+        if self._contains_glob(str(target)):
+            matches = [
+                Path(p) for p in glob.glob(str(target), recursive=recursive)
+                if Path(p).is_file()
+            ]
+        else:
+            files = target.rglob("*") if recursive else target.iterdir()
+            matches = [p for p in files if p.is_file()]
+        listing = _TemplateListing(
+            paths=tuple(self._filter_by_extensions(matches, extensions)),
+            dir_mtimes=dir_mtimes,
+        )
+        with self._template_lock:
+            self._template_index[key] = listing
+            self._template_index.move_to_end(key)
+            while len(self._template_index) > self.TEMPLATE_INDEX_SIZE:
+                self._template_index.popitem(last=False)
+        return list(listing.paths)
+
+    def _snapshot_dirs(self, target: Path, recursive: bool) -> tuple[tuple[str, int], ...]:
+        """收集展开结果所依赖的目录：glob 取首个通配符之前的静态前缀目录。"""
+        root = target
+        walk_subdirs = recursive
+        if self._contains_glob(str(target)):
+            static_parts = []
+            for part in target.parts:
+                if self._contains_glob(part):
+                    break
+                static_parts.append(part)
+            root = Path(*static_parts) if static_parts else Path(".")
+            # 通配符只出现在文件名时，只依赖其父目录。
+            wildcard_depth = len(target.parts) - len(static_parts)
+            walk_subdirs = recursive or wildcard_depth > 1
+
+        snapshot = []
+        if walk_subdirs:
+            for dir_path, _, _ in os.walk(root):
+                try:
+                    snapshot.append((dir_path, os.stat(dir_path).st_mtime_ns))
+                except OSError:
+                    continue
+        else:
+            try:
+                snapshot.append((str(root), os.stat(root).st_mtime_ns))
+            except OSError:
+                pass
+        return tuple(snapshot)
+
+    def clear_template_cache(self):
+        """清空已解码模板与目录索引缓存。"""
+        self.template_cache.clear()
+        with self._template_lock:
+            self._template_index.clear()
+
     def _resolve_template_base(self, plan_key: str, ref: str, plan_path: Path) -> tuple[Path, Path, Optional[TemplateLibrary]]:
         ref = ref.strip()
         if not ref:
@@ -203,7 +429,10 @@ class VisionService:
                       threshold: float = 0.8,
                       use_grayscale: bool = True,
                       match_method: int = cv2.TM_CCOEFF_NORMED,
-                      preprocess: str = "none") -> MatchResult:
+                      preprocess: str = "none",
+                      search: str = "exhaustive",
+                      roi: Optional[Tuple[int, int, int, int]] = None,
+                      template_key: Optional[str] = None) -> MatchResult:
         """【同步接口】在源图像中查找最匹配的单个模板。"""
         return self._submit_to_loop_and_wait(
             self.find_template_async(
@@ -214,6 +443,9 @@ class VisionService:
                 use_grayscale,
                 match_method,
                 preprocess,
+                search,
+                roi,
+                template_key,
             )
         )
 
@@ -225,7 +457,8 @@ class VisionService:
                            nms_threshold: float = 0.5,
                            use_grayscale: bool = True,
                            match_method: int = cv2.TM_CCOEFF_NORMED,
-                           preprocess: str = "none") -> MultiMatchResult:
+                           preprocess: str = "none",
+                           search: str = "exhaustive") -> MultiMatchResult:
         """【同步接口】在源图像中查找所有匹配的模板实例。"""
         return self._submit_to_loop_and_wait(
             self.find_all_templates_async(
@@ -237,6 +470,7 @@ class VisionService:
                 use_grayscale,
                 match_method,
                 preprocess,
+                search,
             )
         )
 
@@ -247,7 +481,9 @@ class VisionService:
                              threshold: float = 0.8,
                              use_grayscale: bool = True,
                              match_method: int = cv2.TM_CCOEFF_NORMED,
-                             preprocess: str = "none") -> List[MatchResult]:
+                             preprocess: str = "none",
+                             early_exit: str = "none",
+                             early_exit_confidence: float = 0.98) -> List[MatchResult]:
         """【同步接口】在源图像中批量查找多个模板的最佳匹配。"""
         return self._submit_to_loop_and_wait(
             self.find_templates_batch_async(
@@ -258,6 +494,8 @@ class VisionService:
                 use_grayscale,
                 match_method,
                 preprocess,
+                early_exit,
+                early_exit_confidence,
             )
         )
 
@@ -305,40 +543,36 @@ class VisionService:
                                   threshold: float = 0.8,
                                   use_grayscale: bool = True,
                                   match_method: int = cv2.TM_CCOEFF_NORMED,
-                                  preprocess: str = "none") -> MatchResult:
-        """【异步内核】将模板匹配计算调度到后台线程。"""
+                                  preprocess: str = "none",
+                                  search: str = "exhaustive",
+                                  roi: Optional[Tuple[int, int, int, int]] = None,
+                                  template_key: Optional[str] = None) -> MatchResult:
+        """
+        【异步内核】将 预处理→匹配→后处理 整条流水线调度到视觉线程池。
+
+        Args:
+            search: 搜索方式。
+                - "exhaustive": 在全分辨率整帧上匹配（默认）。
+                - "pyramid": 先在上次命中位置附近、再在 roi 内搜索，都未命中时
+                  在降采样帧上粗匹配，只在候选邻域内做全分辨率精匹配。
+                  返回的是第一个超过阈值的位置，不保证是整帧的全局最优。
+            roi: (x, y, w, h) 形式的搜索提示区域，仅 "pyramid" 模式使用。
+            template_key: 记忆上次命中位置所用的键；模板为路径时默认使用该路径。
+        """
         try:
-            source_prepared = self._prepare_image(
+            return await self._run_in_vision_pool(
+                functools.partial(
+                    self._find_template_pipeline,
+                    search=search,
+                    roi=roi,
+                    template_key=template_key,
+                ),
                 source_image,
-                use_grayscale=use_grayscale,
-                preprocess=preprocess,
-            )
-            template_prepared = self._prepare_image(
                 template_image,
-                use_grayscale=use_grayscale,
-                preprocess=preprocess,
-            )
-            mask = None
-            if mask_image is not None:
-                mask = self._prepare_image(
-                    mask_image,
-                    use_grayscale=True,
-                    preprocess="none",
-                )
-
-            if mask is not None and mask.shape[:2] != template_prepared.shape[:2]:
-                raise ValueError(
-                    f"蒙版尺寸 {mask.shape} 必须与模板尺寸 {template_prepared.shape} 完全一致。"
-                )
-
-            return await asyncio.to_thread(
-                self._match_template_prepared,
-                source_prepared,
-                template_prepared,
-                mask,
+                mask_image,
                 threshold,
-                match_method,
                 use_grayscale,
+                match_method,
                 preprocess,
             )
         except (FileNotFoundError, TypeError, ValueError) as e:
@@ -353,41 +587,23 @@ class VisionService:
                                        nms_threshold: float = 0.5,
                                        use_grayscale: bool = True,
                                        match_method: int = cv2.TM_CCOEFF_NORMED,
-                                       preprocess: str = "none") -> MultiMatchResult:
-        """【异步内核】将查找所有模板的计算调度到后台线程。"""
+                                       preprocess: str = "none",
+                                       search: str = "exhaustive") -> MultiMatchResult:
+        """
+        【异步内核】将查找所有模板的整条流水线调度到视觉线程池。
+
+        search 为 "pyramid" 时先在降采样帧上筛出候选区域，只在这些区域内做全分辨率匹配。
+        """
         try:
-            source_prepared = self._prepare_image(
+            matches = await self._run_in_vision_pool(
+                functools.partial(self._find_all_templates_pipeline, search=search),
                 source_image,
-                use_grayscale=use_grayscale,
-                preprocess=preprocess,
-            )
-            template_prepared = self._prepare_image(
                 template_image,
-                use_grayscale=use_grayscale,
-                preprocess=preprocess,
-            )
-            mask = None
-            if mask_image is not None:
-                mask = self._prepare_image(
-                    mask_image,
-                    use_grayscale=True,
-                    preprocess="none",
-                )
-
-            if mask is not None and mask.shape[:2] != template_prepared.shape[:2]:
-                raise ValueError(
-                    f"蒙版尺寸 {mask.shape} 必须与模板尺寸 {template_prepared.shape} 完全一致。"
-                )
-
-            matches = await asyncio.to_thread(
-                self._match_all_templates_prepared,
-                source_prepared,
-                template_prepared,
-                mask,
+                mask_image,
                 threshold,
                 nms_threshold,
-                match_method,
                 use_grayscale,
+                match_method,
                 preprocess,
             )
             return MultiMatchResult(count=len(matches), matches=matches)
@@ -403,45 +619,90 @@ class VisionService:
                                          threshold: float = 0.8,
                                          use_grayscale: bool = True,
                                          match_method: int = cv2.TM_CCOEFF_NORMED,
-                                         preprocess: str = "none") -> List[MatchResult]:
-        """【异步内核】批量查找多个模板的最佳匹配。"""
+                                         preprocess: str = "none",
+                                         early_exit: str = "none",
+                                         early_exit_confidence: float = 0.98) -> List[MatchResult]:
+        """
+        【异步内核】批量查找多个模板的最佳匹配。
+
+        源图只预处理一次，各模板在视觉线程池中并行匹配；结果顺序始终与 template_images 一致。
+
+        Args:
+            early_exit: 提前结束策略。
+                - "none": 匹配全部模板。
+                - "first": 某个模板命中 (confidence >= threshold) 后，不再匹配排在它之后的模板。
+                - "best": 某个模板的置信度达到 early_exit_confidence 后，不再匹配排在它之后的模板。
+              排在决定性模板之前的模板总会完成匹配，因此结果与线程调度无关；
+              被跳过的模板返回 found=False 且 debug_info["skipped"] 为 True。
+            early_exit_confidence: "best" 策略的置信度门槛。
+        """
         if mask_images is not None and len(mask_images) != len(template_images):
             raise ValueError("mask_images length must match template_images length.")
+        early_exit = (early_exit or "none").lower()
+        if early_exit not in ("none", "first", "best"):
+            raise ValueError(f"Unsupported early_exit policy: {early_exit}")
+        if not template_images:
+            return []
+
+        def _is_decisive(result: MatchResult) -> bool:
+            if early_exit == "first":
+                return result.found
+            if early_exit == "best":
+                return result.found and result.confidence >= early_exit_confidence
+            return False
+
+        pending: set = set()
         try:
-            source_prepared = self._prepare_image(
-                source_image,
-                use_grayscale=use_grayscale,
-                preprocess=preprocess,
+            source_prepared = await self._run_in_vision_pool(
+                self._prepare_source_timed, source_image, use_grayscale, preprocess
             )
-            results: List[MatchResult] = []
+            loop = asyncio.get_running_loop()
+            executor = self._get_vision_executor()
+            index_of: Dict[asyncio.Future, int] = {}
             for index, template_image in enumerate(template_images):
-                template_prepared = self._prepare_image(
-                    template_image,
-                    use_grayscale=use_grayscale,
-                    preprocess=preprocess,
-                )
-                mask = None
-                if mask_images is not None:
-                    mask = self._prepare_image(
-                        mask_images[index],
-                        use_grayscale=True,
-                        preprocess="none",
-                    )
-                result = await asyncio.to_thread(
-                    self._match_template_prepared,
+                future = loop.run_in_executor(executor, functools.partial(
+                    self._find_template_pipeline,
                     source_prepared,
-                    template_prepared,
-                    mask,
+                    template_image,
+                    mask_images[index] if mask_images is not None else None,
                     threshold,
-                    match_method,
                     use_grayscale,
+                    match_method,
                     preprocess,
-                )
-                results.append(result)
-            return results
+                    True,
+                ))
+                index_of[future] = index
+                pending.add(future)
+
+            results: List[Optional[MatchResult]] = [None] * len(template_images)
+            cutoff = len(template_images)  # 下标 >= cutoff 的模板被提前结束策略跳过
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in sorted(done, key=index_of.__getitem__):
+                    index = index_of[future]
+                    if index >= cutoff:
+                        if not future.cancelled():
+                            future.exception()  # 结果被丢弃，但要取走异常以免告警
+                        continue
+                    results[index] = future.result()
+                    if _is_decisive(results[index]):
+                        cutoff = index
+                if cutoff < len(template_images):
+                    for future in [f for f in pending if index_of[f] > cutoff]:
+                        future.cancel()
+                        pending.discard(future)
+
+            skipped = {"skipped": True, "reason": f"early_exit:{early_exit}"}
+            return [
+                result if result is not None and index <= cutoff else MatchResult(found=False, debug_info=dict(skipped))
+                for index, result in enumerate(results)
+            ]
         except (FileNotFoundError, TypeError, ValueError) as e:
             logger.error(f"批量模板匹配预处理失败: {e}")
             return [MatchResult(found=False, debug_info={"error": str(e)}) for _ in template_images]
+        finally:
+            for future in pending:
+                future.cancel()
 
     async def find_all_templates_batch_async(self,
                                              source_image: np.ndarray,
@@ -456,35 +717,22 @@ class VisionService:
         if mask_images is not None and len(mask_images) != len(template_images):
             raise ValueError("mask_images length must match template_images length.")
         try:
-            source_prepared = self._prepare_image(
-                source_image,
-                use_grayscale=use_grayscale,
-                preprocess=preprocess,
+            source_prepared = await self._run_in_vision_pool(
+                self._prepare_source_timed, source_image, use_grayscale, preprocess
             )
             results: List[MultiMatchResult] = []
             for index, template_image in enumerate(template_images):
-                template_prepared = self._prepare_image(
-                    template_image,
-                    use_grayscale=use_grayscale,
-                    preprocess=preprocess,
-                )
-                mask = None
-                if mask_images is not None:
-                    mask = self._prepare_image(
-                        mask_images[index],
-                        use_grayscale=True,
-                        preprocess="none",
-                    )
-                matches = await asyncio.to_thread(
-                    self._match_all_templates_prepared,
+                matches = await self._run_in_vision_pool(
+                    self._find_all_templates_pipeline,
                     source_prepared,
-                    template_prepared,
-                    mask,
+                    template_image,
+                    mask_images[index] if mask_images is not None else None,
                     threshold,
                     nms_threshold,
-                    match_method,
                     use_grayscale,
+                    match_method,
                     preprocess,
+                    True,
                 )
                 results.append(MultiMatchResult(count=len(matches), matches=matches))
             return results
@@ -497,14 +745,18 @@ class VisionService:
                                lower_hsv: Tuple[int, int, int],
                                upper_hsv: Tuple[int, int, int],
                                min_area: int = 50) -> MatchResult:
-        """【异步内核】将颜色查找计算调度到后台线程。"""
+        """【异步内核】将颜色查找计算调度到视觉线程池。"""
         if not isinstance(source_image, np.ndarray) or len(source_image.shape) != 3:
             return MatchResult(found=False, debug_info={"error": "输入图像必须是BGR或RGB格式的NumPy数组。"})
 
         def _find_largest_contour():
-            hsv_image = cv2.cvtColor(source_image, cv2.COLOR_BGR2HSV)
-            mask = cv2.inRange(hsv_image, np.array(lower_hsv), np.array(upper_hsv))
-            contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            timings: Dict[str, float] = {}
+            with self._timed_stage(timings, "prepare"):
+                hsv_image = cv2.cvtColor(source_image, cv2.COLOR_BGR2HSV)
+                mask = cv2.inRange(hsv_image, np.array(lower_hsv), np.array(upper_hsv))
+            with self._timed_stage(timings, "match"):
+                contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            self._record_stage_timings(timings)
 
             if not contours:
                 return None, 0
@@ -512,7 +764,7 @@ class VisionService:
             best_contour = max(contours, key=cv2.contourArea)
             return best_contour, cv2.contourArea(best_contour)
 
-        best_contour, area = await asyncio.to_thread(_find_largest_contour)
+        best_contour, area = await self._run_in_vision_pool(_find_largest_contour)
 
         if best_contour is not None and area >= min_area:
             x, y, w, h = cv2.boundingRect(best_contour)
@@ -526,6 +778,179 @@ class VisionService:
 
         return MatchResult(found=False, confidence=area)
 
+    # =========================================================================
+    # Section 2.5: 视觉线程池与流水线（以下方法均在视觉线程池中执行）
+    # =========================================================================
+
+    async def _run_in_vision_pool(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_vision_executor(), functools.partial(func, *args))
+
+    def _get_vision_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # OpenCV/NumPy 在计算期间释放 GIL，线程池即可获得真实并行。
+                workers = max(1, int(get_config_value("vision.workers", self.VISION_WORKERS)))
+                self._executor = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix="aura-vision",
+                )
+            return self._executor
+
+    def shutdown(self):
+        """关闭视觉线程池（已提交的任务会执行完毕）。"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    @contextmanager
+    def _timed_stage(self, timings: Dict[str, float], stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings[stage] = timings.get(stage, 0.0) + (time.perf_counter() - start) * 1000.0
+
+    def _record_stage_timings(self, timings: Dict[str, float]):
+        with self._stats_lock:
+            for stage, elapsed_ms in timings.items():
+                stat = self._stage_stats.setdefault(stage, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+                stat["count"] += 1
+                stat["total_ms"] += elapsed_ms
+                stat["max_ms"] = max(stat["max_ms"], elapsed_ms)
+
+    def get_pipeline_stats(self) -> Dict[str, Dict[str, float]]:
+        """返回各流水线阶段 (prepare/match/postprocess) 的累计耗时统计。"""
+        with self._stats_lock:
+            return {
+                stage: {**stat, "avg_ms": stat["total_ms"] / stat["count"] if stat["count"] else 0.0}
+                for stage, stat in self._stage_stats.items()
+            }
+
+    def _prepare_source_timed(self, source_image, use_grayscale: bool, preprocess: str) -> np.ndarray:
+        timings: Dict[str, float] = {}
+        with self._timed_stage(timings, "prepare"):
+            prepared = self._prepare_image(source_image, use_grayscale=use_grayscale, preprocess=preprocess)
+        self._record_stage_timings(timings)
+        return prepared
+
+    def _prepare_template_and_mask(self,
+                                   template_image: np.ndarray | str,
+                                   mask_image: Optional[np.ndarray | str],
+                                   use_grayscale: bool,
+                                   preprocess: str) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        template_prepared = self._prepare_image(
+            template_image,
+            use_grayscale=use_grayscale,
+            preprocess=preprocess,
+        )
+        mask = None
+        if mask_image is not None:
+            mask = self._prepare_image(
+                mask_image,
+                use_grayscale=True,
+                preprocess="none",
+            )
+        if mask is not None and mask.shape[:2] != template_prepared.shape[:2]:
+            raise ValueError(
+                f"蒙版尺寸 {mask.shape} 必须与模板尺寸 {template_prepared.shape} 完全一致。"
+            )
+        return template_prepared, mask
+
+    def _find_template_pipeline(self,
+                                source_image: np.ndarray | str,
+                                template_image: np.ndarray | str,
+                                mask_image: Optional[np.ndarray | str],
+                                threshold: float,
+                                use_grayscale: bool,
+                                match_method: int,
+                                preprocess: str,
+                                source_is_prepared: bool = False,
+                                search: str = "exhaustive",
+                                roi: Optional[Tuple[int, int, int, int]] = None,
+                                template_key: Optional[str] = None) -> MatchResult:
+        timings: Dict[str, float] = {}
+        with self._timed_stage(timings, "prepare"):
+            source_prepared = source_image if source_is_prepared else self._prepare_image(
+                source_image,
+                use_grayscale=use_grayscale,
+                preprocess=preprocess,
+            )
+            template_prepared, mask = self._prepare_template_and_mask(
+                template_image, mask_image, use_grayscale, preprocess
+            )
+        if self._resolve_search_mode(search) == "pyramid":
+            if template_key is None and isinstance(template_image, str):
+                template_key = template_image
+            return self._match_template_pyramid(
+                source_prepared,
+                template_prepared,
+                mask,
+                threshold,
+                match_method,
+                use_grayscale,
+                preprocess,
+                roi=roi,
+                template_key=template_key,
+                timings=timings,
+            )
+        return self._match_template_prepared(
+            source_prepared,
+            template_prepared,
+            mask,
+            threshold,
+            match_method,
+            use_grayscale,
+            preprocess,
+            timings=timings,
+        )
+
+    def _find_all_templates_pipeline(self,
+                                     source_image: np.ndarray | str,
+                                     template_image: np.ndarray | str,
+                                     mask_image: Optional[np.ndarray | str],
+                                     threshold: float,
+                                     nms_threshold: float,
+                                     use_grayscale: bool,
+                                     match_method: int,
+                                     preprocess: str,
+                                     source_is_prepared: bool = False,
+                                     search: str = "exhaustive") -> List[MatchResult]:
+        timings: Dict[str, float] = {}
+        with self._timed_stage(timings, "prepare"):
+            source_prepared = source_image if source_is_prepared else self._prepare_image(
+                source_image,
+                use_grayscale=use_grayscale,
+                preprocess=preprocess,
+            )
+            template_prepared, mask = self._prepare_template_and_mask(
+                template_image, mask_image, use_grayscale, preprocess
+            )
+        if self._resolve_search_mode(search) == "pyramid":
+            return self._match_all_templates_pyramid(
+                source_prepared,
+                template_prepared,
+                mask,
+                threshold,
+                nms_threshold,
+                match_method,
+                use_grayscale,
+                preprocess,
+                timings=timings,
+            )
+        return self._match_all_templates_prepared(
+            source_prepared,
+            template_prepared,
+            mask,
+            threshold,
+            nms_threshold,
+            match_method,
+            use_grayscale,
+            preprocess,
+            timings=timings,
+        )
+
     # =========================================================================
     # Section 3: 内部辅助工具 (同步)
     # =========================================================================
@@ -538,20 +963,33 @@ class VisionService:
         Prepare image for template matching.
         - File inputs are converted from BGR/BGRA to RGB.
         - ndarray inputs are assumed to be RGB.
+        - Prepared file inputs are cached by path + mtime and returned read-only.
         """
         if image is None:
             return None
 
-        input_is_bgr = isinstance(image, str)
         if isinstance(image, str):
-            img = cv2.imread(image, cv2.IMREAD_UNCHANGED)
-            if img is None:
-                raise FileNotFoundError(f"无法从路径加载图像: {image}")
-        elif isinstance(image, np.ndarray):
-            img = image
-        else:
+            return self.template_cache.get_or_load(
+                image,
+                use_grayscale,
+                preprocess,
+                lambda: self._load_image_file(image, use_grayscale, preprocess),
+            )
+        if not isinstance(image, np.ndarray):
             raise TypeError(f"不支持的图像类型，需要str(路径)或np.ndarray。实际类型为{type(image)}")
-
+        return self._prepare_array(image, input_is_bgr=False, use_grayscale=use_grayscale, preprocess=preprocess)
+
+    def _load_image_file(self, path: str, use_grayscale: bool, preprocess: str) -> np.ndarray:
+        img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        if img is None:
+            raise FileNotFoundError(f"无法从路径加载图像: {path}")
+        return self._prepare_array(img, input_is_bgr=True, use_grayscale=use_grayscale, preprocess=preprocess)
+
+    def _prepare_array(self,
+                       img: np.ndarray,
+                       input_is_bgr: bool,
+                       use_grayscale: bool,
+                       preprocess: str) -> np.ndarray:
         img = self._normalize_color_space(img, input_is_bgr=input_is_bgr)
 
         if use_grayscale:
@@ -619,21 +1057,27 @@ class VisionService:
                                  threshold: float,
                                  match_method: int,
                                  use_grayscale: bool,
-                                 preprocess: str) -> MatchResult:
+                                 preprocess: str,
+                                 timings: Optional[Dict[str, float]] = None) -> MatchResult:
         if mask is not None and mask.shape[:2] != template_prepared.shape[:2]:
             raise ValueError(
                 f"蒙版尺寸 {mask.shape} 必须与模板尺寸 {template_prepared.shape} 完全一致。"
             )
-        result = cv2.matchTemplate(source_prepared, template_prepared, match_method, mask=mask)
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-        best_val, best_loc = self._select_best_match(match_method, min_val, max_val, min_loc, max_loc)
-        best_confidence = self._normalize_match_score(best_val, match_method)
-        h, w = template_prepared.shape[:2]
+        timings = {} if timings is None else timings
+        with self._timed_stage(timings, "match"):
+            result = cv2.matchTemplate(source_prepared, template_prepared, match_method, mask=mask)
+        with self._timed_stage(timings, "postprocess"):
+            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+            best_val, best_loc = self._select_best_match(match_method, min_val, max_val, min_loc, max_loc)
+            best_confidence = self._normalize_match_score(best_val, match_method)
+            h, w = template_prepared.shape[:2]
+        self._record_stage_timings(timings)
 
         debug_info = {
             "match_method": match_method,
             "use_grayscale": use_grayscale,
             "preprocess": preprocess,
+            "timings_ms": dict(timings),
         }
 
         if best_confidence >= threshold:
@@ -660,41 +1104,314 @@ class VisionService:
                                       nms_threshold: float,
                                       match_method: int,
                                       use_grayscale: bool,
-                                      preprocess: str) -> List[MatchResult]:
+                                      preprocess: str,
+                                      timings: Optional[Dict[str, float]] = None) -> List[MatchResult]:
         if mask is not None and mask.shape[:2] != template_prepared.shape[:2]:
             raise ValueError(
                 f"蒙版尺寸 {mask.shape} 必须与模板尺寸 {template_prepared.shape} 完全一致。"
             )
-        result = cv2.matchTemplate(source_prepared, template_prepared, match_method, mask=mask)
-        score_map = self._normalize_match_map(result, match_method)
-        locations = np.where(score_map >= threshold)
+        timings = {} if timings is None else timings
+        with self._timed_stage(timings, "match"):
+            result = cv2.matchTemplate(source_prepared, template_prepared, match_method, mask=mask)
+
+        with self._timed_stage(timings, "postprocess"):
+            score_map = self._normalize_match_map(result, match_method)
+            xs, ys, scores = extract_match_candidates(score_map, threshold, top_k=self.MAX_MATCH_CANDIDATES)
+            h, w = template_prepared.shape[:2]
+            final_matches = self._nms_matches(
+                xs, ys, scores, w, h, nms_threshold,
+                {"match_method": match_method, "use_grayscale": use_grayscale, "preprocess": preprocess},
+            )
+        self._record_stage_timings(timings)
+        for match in final_matches:
+            match.debug_info["timings_ms"] = dict(timings)
+        return final_matches
 
-        h, w = template_prepared.shape[:2]
-        rects = [[pt[0], pt[1], pt[0] + w, pt[1] + h] for pt in zip(*locations[::-1])]
-        scores = [score_map[pt[1], pt[0]] for pt in zip(*locations[::-1])]
+    def _nms_matches(self,
+                     xs: np.ndarray,
+                     ys: np.ndarray,
+                     scores: np.ndarray,
+                     w: int,
+                     h: int,
+                     nms_threshold: float,
+                     debug_info: Dict[str, Any]) -> List[MatchResult]:
+        boxes = np.stack([xs, ys, xs + w, ys + h], axis=1)
+        final_matches = []
+        for i in nms_boxes(boxes, scores, nms_threshold):
+            top_left = (int(xs[i]), int(ys[i]))
+            final_matches.append(MatchResult(
+                found=True,
+                top_left=top_left,
+                center_point=(top_left[0] + w // 2, top_left[1] + h // 2),
+                rect=(top_left[0], top_left[1], w, h),
+                confidence=float(scores[i]),
+                debug_info=dict(debug_info),
+            ))
+        return final_matches
 
-        if not rects:
-            return []
+    # =========================================================================
+    # Section 3.5: 金字塔（由粗到精）匹配
+    # =========================================================================
 
-        indices = cv2.dnn.NMSBoxes(rects, np.array(scores, dtype=np.float32), threshold, nms_threshold)
+    def _resolve_search_mode(self, search: str) -> str:
+        search = (search or "exhaustive").lower()
+        if search not in ("exhaustive", "pyramid"):
+            raise ValueError(f"Unsupported search mode: {search}")
+        return search
+
+    def _pyramid_scale(self, template_shape: tuple) -> int:
+        """降采样倍数：每层缩小一半，且降采样后的模板短边不小于 PYRAMID_MIN_TEMPLATE_SIDE。"""
+        side = min(template_shape[:2])
+        scale = 1
+        for _ in range(self.PYRAMID_MAX_LEVELS):
+            if side // (scale * 2) < self.PYRAMID_MIN_TEMPLATE_SIDE:
+                break
+            scale *= 2
+        return scale
+
+    def _downscale(self, image: np.ndarray, scale: int, interpolation: int = cv2.INTER_AREA) -> np.ndarray:
+        h, w = image.shape[:2]
+        return cv2.resize(image, (max(1, w // scale), max(1, h // scale)), interpolation=interpolation)
+
+    def _match_in_window(self,
+                         source: np.ndarray,
+                         template: np.ndarray,
+                         mask: Optional[np.ndarray],
+                         match_method: int,
+                         window: tuple[int, int, int, int]) -> Optional[tuple[float, tuple[int, int]]]:
+        """
+        在左上角落在 window=(x0, y0, x1, y1)（闭区间）内的位置上做全分辨率匹配。
+        归一化方法的得分只取决于模板覆盖的像素，因此与整帧匹配在同一位置的得分完全相同。
+        """
+        x0, y0, x1, y1 = self._clip_window(window, source.shape, template.shape)
+        if x1 < x0 or y1 < y0:
+            return None
+        h, w = template.shape[:2]
+        patch = source[y0:y1 + h, x0:x1 + w]
+        result = cv2.matchTemplate(patch, template, match_method, mask=mask)
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        best_val, best_loc = self._select_best_match(match_method, min_val, max_val, min_loc, max_loc)
+        return self._normalize_match_score(best_val, match_method), (best_loc[0] + x0, best_loc[1] + y0)
+
+    def _clip_window(self, window: tuple[int, int, int, int], source_shape: tuple,
+                     template_shape: tuple) -> tuple[int, int, int, int]:
+        x0, y0, x1, y1 = window
+        max_x = source_shape[1] - template_shape[1]
+        max_y = source_shape[0] - template_shape[0]
+        return max(0, int(x0)), max(0, int(y0)), min(max_x, int(x1)), min(max_y, int(y1))
+
+    def _hint_windows(self,
+                      source_shape: tuple,
+                      template_shape: tuple,
+                      roi: Optional[Tuple[int, int, int, int]],
+                      hit_key: Optional[tuple]) -> List[tuple[str, tuple[int, int, int, int]]]:
+        """按优先级返回提示窗口：上次命中位置附近，其次是调用方给出的 roi。"""
+        h, w = template_shape[:2]
+        windows = []
+        if hit_key is not None:
+            with self._last_hits_lock:
+                last_hit = self._last_hits.get(hit_key)
+            if last_hit is not None:
+                radius = max(self.LAST_HIT_RADIUS, min(w, h) // 2)
+                x, y = last_hit
+                windows.append(("last_hit", (x - radius, y - radius, x + radius, y + radius)))
+        if roi is not None:
+            rx, ry, rw, rh = (int(v) for v in roi)
+            # roi 比模板小时以 roi 中心为准扩展到能容纳模板。
+            if rw < w:
+                rx, rw = rx - (w - rw) // 2, w
+            if rh < h:
+                ry, rh = ry - (h - rh) // 2, h
+            windows.append(("roi", (rx, ry, rx + rw - w, ry + rh - h)))
+        return windows
+
+    def _remember_hit(self, hit_key: Optional[tuple], top_left: tuple[int, int]):
+        if hit_key is None:
+            return
+        with self._last_hits_lock:
+            self._last_hits[hit_key] = top_left
+            self._last_hits.move_to_end(hit_key)
+            while len(self._last_hits) > self.TEMPLATE_CACHE_SIZE:
+                self._last_hits.popitem(last=False)
+
+    def forget_last_hits(self, template_key: Optional[str] = None):
+        """清除金字塔模式记忆的上次命中位置；template_key 为空时全部清除。"""
+        with self._last_hits_lock:
+            if template_key is None:
+                self._last_hits.clear()
+                return
+            for key in [k for k in self._last_hits if k[0] == template_key]:
+                del self._last_hits[key]
+
+    def _coarse_peaks(self,
+                      source: np.ndarray,
+                      template: np.ndarray,
+                      mask: Optional[np.ndarray],
+                      match_method: int,
+                      scale: int) -> List[tuple[int, int]]:
+        """在降采样帧上取得分最高的若干个互不重叠的峰值，返回其全分辨率坐标。"""
+        small_template = self._downscale(template, scale)
+        small_mask = self._downscale(mask, scale, cv2.INTER_NEAREST) if mask is not None else None
+        score_map = self._normalize_match_map(
+            cv2.matchTemplate(self._downscale(source, scale), small_template, match_method, mask=small_mask),
+            match_method,
+        ).astype(np.float32, copy=True)
+        th, tw = small_template.shape[:2]
+        peaks = []
+        for _ in range(self.PYRAMID_CANDIDATES):
+            _, max_val, _, max_loc = cv2.minMaxLoc(score_map)
+            if not np.isfinite(max_val):
+                break
+            x, y = max_loc
+            peaks.append((x * scale, y * scale))
+            score_map[max(0, y - th // 2):y + th // 2 + 1, max(0, x - tw // 2):x + tw // 2 + 1] = -np.inf
+        return peaks
+
+    def _match_template_pyramid(self,
+                                source_prepared: np.ndarray,
+                                template_prepared: np.ndarray,
+                                mask: Optional[np.ndarray],
+                                threshold: float,
+                                match_method: int,
+                                use_grayscale: bool,
+                                preprocess: str,
+                                roi: Optional[Tuple[int, int, int, int]] = None,
+                                template_key: Optional[str] = None,
+                                timings: Optional[Dict[str, float]] = None) -> MatchResult:
+        if mask is not None and mask.shape[:2] != template_prepared.shape[:2]:
+            raise ValueError(
+                f"蒙版尺寸 {mask.shape} 必须与模板尺寸 {template_prepared.shape} 完全一致。"
+            )
+        h, w = template_prepared.shape[:2]
+        if source_prepared.shape[0] < h or source_prepared.shape[1] < w:
+            raise ValueError(f"模板尺寸 {template_prepared.shape} 大于源图像尺寸 {source_prepared.shape}。")
+        # 命中位置只对同尺寸的帧有意义。
+        memory_key = (template_key, source_prepared.shape[:2]) if template_key is not None else None
+        timings = {} if timings is None else timings
+        scale = self._pyramid_scale(template_prepared.shape)
+        best: Optional[tuple[float, tuple[int, int]]] = None
+        stage = "pyramid"
+        with self._timed_stage(timings, "match"):
+            for hint_stage, window in self._hint_windows(source_prepared.shape, template_prepared.shape, roi, memory_key):
+                candidate = self._match_in_window(source_prepared, template_prepared, mask, match_method, window)
+                if candidate is not None and candidate[0] >= threshold:
+                    best, stage = candidate, hint_stage
+                    break
+
+            if best is None:
+                if scale == 1:
+                    # 模板太小无法降采样，直接整帧匹配。
+                    stage = "exhaustive"
+                    windows = [(0, 0, source_prepared.shape[1], source_prepared.shape[0])]
+                else:
+                    pad = 2 * scale
+                    windows = [
+                        (x - pad, y - pad, x + pad, y + pad)
+                        for x, y in self._coarse_peaks(source_prepared, template_prepared, mask, match_method, scale)
+                    ]
+                for window in windows:
+                    candidate = self._match_in_window(source_prepared, template_prepared, mask, match_method, window)
+                    if candidate is not None and (best is None or candidate[0] > best[0]):
+                        best = candidate
+
+        with self._timed_stage(timings, "postprocess"):
+            best_confidence, best_loc = best if best is not None else (0.0, (0, 0))
+            found = best is not None and best_confidence >= threshold
+            if found:
+                self._remember_hit(memory_key, best_loc)
+        self._record_stage_timings(timings)
 
-        final_matches = []
-        if len(indices) > 0:
-            for i in indices.flatten():
-                box = rects[i]
-                top_left = (box[0], box[1])
-                final_matches.append(MatchResult(
-                    found=True,
-                    top_left=top_left,
-                    center_point=(top_left[0] + w // 2, top_left[1] + h // 2),
-                    rect=(top_left[0], top_left[1], w, h),
-                    confidence=float(scores[i]),
-                    debug_info={
-                        "match_method": match_method,
-                        "use_grayscale": use_grayscale,
-                        "preprocess": preprocess,
-                    },
-                ))
+        debug_info = {
+            "match_method": match_method,
+            "use_grayscale": use_grayscale,
+            "preprocess": preprocess,
+            "search": "pyramid",
+            "search_stage": stage,
+            "pyramid_scale": scale,
+            "timings_ms": dict(timings),
+        }
+        if found:
+            return MatchResult(
+                found=True,
+                top_left=best_loc,
+                center_point=(best_loc[0] + w // 2, best_loc[1] + h // 2),
+                rect=(best_loc[0], best_loc[1], w, h),
+                confidence=best_confidence,
+                debug_info=debug_info,
+            )
+        debug_info["best_match_rect_on_fail"] = (best_loc[0], best_loc[1], w, h)
+        return MatchResult(found=False, confidence=best_confidence, debug_info=debug_info)
+
+    def _match_all_templates_pyramid(self,
+                                     source_prepared: np.ndarray,
+                                     template_prepared: np.ndarray,
+                                     mask: Optional[np.ndarray],
+                                     threshold: float,
+                                     nms_threshold: float,
+                                     match_method: int,
+                                     use_grayscale: bool,
+                                     preprocess: str,
+                                     timings: Optional[Dict[str, float]] = None) -> List[MatchResult]:
+        scale = self._pyramid_scale(template_prepared.shape)
+        if scale == 1 or match_method not in (cv2.TM_CCOEFF_NORMED, cv2.TM_CCORR_NORMED, cv2.TM_SQDIFF_NORMED):
+            # 非归一化得分在不同尺度间不可比，无法用阈值筛选候选区域。
+            return self._match_all_templates_prepared(
+                source_prepared, template_prepared, mask, threshold, nms_threshold,
+                match_method, use_grayscale, preprocess, timings=timings,
+            )
+        if mask is not None and mask.shape[:2] != template_prepared.shape[:2]:
+            raise ValueError(
+                f"蒙版尺寸 {mask.shape} 必须与模板尺寸 {template_prepared.shape} 完全一致。"
+            )
+        timings = {} if timings is None else timings
+        h, w = template_prepared.shape[:2]
+        # 只有精匹配过的区域写入得分，其余位置保持 -inf，再按整帧的方式提取候选。
+        full_map = np.full(
+            (source_prepared.shape[0] - h + 1, source_prepared.shape[1] - w + 1), -np.inf, dtype=np.float32
+        )
+        with self._timed_stage(timings, "match"):
+            small_mask = self._downscale(mask, scale, cv2.INTER_NEAREST) if mask is not None else None
+            coarse = self._normalize_match_map(
+                cv2.matchTemplate(
+                    self._downscale(source_prepared, scale),
+                    self._downscale(template_prepared, scale),
+                    match_method,
+                    mask=small_mask,
+                ),
+                match_method,
+            )
+            candidates = (coarse >= threshold - self.PYRAMID_COARSE_MARGIN).astype(np.uint8)
+            count, _, stats, _ = cv2.connectedComponentsWithStats(candidates, connectivity=8)
+            pad = 2 * scale
+            # 按连通域包围盒在全分辨率上精匹配，每个区域只调用一次 matchTemplate。
+            for cx, cy, cw, ch, _ in stats[1:count]:
+                x0, y0, x1, y1 = self._clip_window(
+                    (cx * scale - pad, cy * scale - pad, (cx + cw - 1) * scale + pad, (cy + ch - 1) * scale + pad),
+                    source_prepared.shape,
+                    template_prepared.shape,
+                )
+                if x1 < x0 or y1 < y0:
+                    continue
+                patch = source_prepared[y0:y1 + h, x0:x1 + w]
+                full_map[y0:y1 + 1, x0:x1 + 1] = self._normalize_match_map(
+                    cv2.matchTemplate(patch, template_prepared, match_method, mask=mask), match_method
+                )
+
+        with self._timed_stage(timings, "postprocess"):
+            xs, ys, scores = extract_match_candidates(full_map, threshold, top_k=self.MAX_MATCH_CANDIDATES)
+            final_matches = self._nms_matches(
+                xs, ys, scores, w, h, nms_threshold,
+                {
+                    "match_method": match_method,
+                    "use_grayscale": use_grayscale,
+                    "preprocess": preprocess,
+                    "search": "pyramid",
+                    "pyramid_scale": scale,
+                },
+            )
+        self._record_stage_timings(timings)
+        for match in final_matches:
+            match.debug_info["timings_ms"] = dict(timings)
         return final_matches
 
     # =========================================================================
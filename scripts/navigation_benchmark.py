@@ -0,0 +1,268 @@
+"""CPU-only benchmark: NavigationService skeletonization, grid building and path search.
+
+Synthetic minimap masks (thick random corridors plus open rooms) are thinned
+and downsampled with the vectorized helpers in ``navigation_grid`` and with
+the original per-pixel loops, and the outputs are compared bit for bit. The
+legacy loops take seconds on large masks, so they only run up to
+``--legacy-max-side``.
+
+The path section searches corner-to-corner on 1024x1024 masks (raw pixels,
+skeleton, 4px grid) with the legacy dict/heapq A*, the array-backed A*
+(expected identical paths) and jump point search, and times nearest-passable
+lookups against the legacy ring scan.
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import math
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from plans.aura_base.src.services.navigation_grid import GridPathfinder, build_grid, zhang_suen_thinning
+
+
+SIZES = [256, 512, 1024]
+GRID_STEP = 4
+PATH_SIDE = 1024
+NEAREST_QUERIES = 2000
+
+
+def _synthetic_minimap(side: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    mask = np.zeros((side, side), dtype=np.uint8)
+    for _ in range(max(6, side // 32)):
+        p0 = tuple(int(v) for v in rng.integers(0, side, size=2))
+        p1 = tuple(int(v) for v in rng.integers(0, side, size=2))
+        cv2.line(mask, p0, p1, 255, int(rng.integers(side // 64 + 2, side // 24 + 4)))
+    for _ in range(max(2, side // 128)):
+        x, y = (int(v) for v in rng.integers(0, side - side // 8, size=2))
+        cv2.rectangle(mask, (x, y), (x + side // 10, y + side // 12), 255, -1)
+    return mask
+
+
+def _legacy_thinning(bin_img: np.ndarray) -> np.ndarray:
+    img = (bin_img > 0).astype(np.uint8)
+    h, w = img.shape
+    changed = True
+    while changed:
+        changed = False
+        for step in (0, 1):
+            to_del = []
+            for y in range(1, h - 1):
+                for x in range(1, w - 1):
+                    if img[y, x] == 0:
+                        continue
+                    p2, p3, p4, p5 = img[y - 1, x], img[y - 1, x + 1], img[y, x + 1], img[y + 1, x + 1]
+                    p6, p7, p8, p9 = img[y + 1, x], img[y + 1, x - 1], img[y, x - 1], img[y - 1, x - 1]
+                    neighbors = [p2, p3, p4, p5, p6, p7, p8, p9]
+                    c = sum((neighbors[i] == 0 and neighbors[(i + 1) % 8] == 1) for i in range(8))
+                    n = sum(neighbors)
+                    if step == 0:
+                        ok = p2 * p4 * p6 == 0 and p4 * p6 * p8 == 0
+                    else:
+                        ok = p2 * p4 * p8 == 0 and p2 * p6 * p8 == 0
+                    if 2 <= n <= 6 and c == 1 and ok:
+                        to_del.append((y, x))
+            if to_del:
+                changed = True
+                for y, x in to_del:
+                    img[y, x] = 0
+    return img
+
+
+def _legacy_grid(passable: np.ndarray, step: int) -> np.ndarray:
+    h, w = passable.shape[:2]
+    gh, gw = (h + step - 1) // step, (w + step - 1) // step
+    grid = np.zeros((gh, gw), dtype=np.uint8)
+    for gy in range(gh):
+        y0, y1 = gy * step, min((gy + 1) * step, h)
+        for gx in range(gw):
+            x0, x1 = gx * step, min((gx + 1) * step, w)
+            if np.any(passable[y0:y1, x0:x1] > 0):
+                grid[gy, gx] = 1
+    return grid
+
+
+def _legacy_astar(grid: np.ndarray, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+    neighbors = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+    open_set = [(0.0, start)]
+    came_from: Dict[Tuple[int, int], Tuple[int, int]] = {}
+    g_score = {start: 0.0}
+    max_iters = grid.shape[0] * grid.shape[1] * 2
+    iters = 0
+    while open_set and iters < max_iters:
+        iters += 1
+        _, current = heapq.heappop(open_set)
+        if current == goal:
+            path = [current]
+            while current in came_from:
+                current = came_from[current]
+                path.append(current)
+            return path[::-1]
+        for dx, dy in neighbors:
+            nx, ny = current[0] + dx, current[1] + dy
+            if not (0 <= ny < grid.shape[0] and 0 <= nx < grid.shape[1]):
+                continue
+            if grid[ny, nx] == 0:
+                continue
+            tentative = g_score[current] + (1.4142 if dx != 0 and dy != 0 else 1.0)
+            if tentative < g_score.get((nx, ny), float("inf")):
+                came_from[(nx, ny)] = current
+                g_score[(nx, ny)] = tentative
+                heapq.heappush(open_set, (tentative + math.hypot(nx - goal[0], ny - goal[1]), (nx, ny)))
+    return []
+
+
+def _legacy_nearest(grid: np.ndarray, cell: Tuple[int, int]) -> Any:
+    gx, gy = cell
+    if 0 <= gy < grid.shape[0] and 0 <= gx < grid.shape[1] and grid[gy, gx] > 0:
+        return cell
+    for radius in range(1, 20):
+        for dy in range(-radius, radius + 1):
+            for dx in range(-radius, radius + 1):
+                nx, ny = gx + dx, gy + dy
+                if 0 <= ny < grid.shape[0] and 0 <= nx < grid.shape[1] and grid[ny, nx] > 0:
+                    return (nx, ny)
+    return None
+
+
+def _far_apart_cells(mask: np.ndarray) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    _, labels = cv2.connectedComponents((mask > 0).astype(np.uint8), connectivity=8)
+    sizes = np.bincount(labels.ravel())
+    sizes[0] = 0
+    ys, xs = np.nonzero(labels == int(np.argmax(sizes)))
+    diagonal = xs + ys
+    first, last = int(np.argmin(diagonal)), int(np.argmax(diagonal))
+    return (int(xs[first]), int(ys[first])), (int(xs[last]), int(ys[last]))
+
+
+def _time_ms(func: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples), result
+
+
+def run(repeat: int, seed: int, legacy_max_side: int) -> List[Dict[str, Any]]:
+    rows = []
+    for side in SIZES:
+        mask = _synthetic_minimap(side, seed)
+        thin_ms, skeleton = _time_ms(lambda: zhang_suen_thinning(mask), repeat)
+        grid_ms, grid = _time_ms(lambda: build_grid(mask, GRID_STEP), repeat)
+        row = {
+            "size": f"{side}x{side}",
+            "thinning_ms": round(thin_ms, 3),
+            "grid_ms": round(grid_ms, 3),
+            "legacy_thinning_ms": None,
+            "legacy_grid_ms": None,
+            "identical": None,
+        }
+        if side <= legacy_max_side:
+            legacy_thin_ms, legacy_skeleton = _time_ms(lambda: _legacy_thinning(mask), 1)
+            legacy_grid_ms, legacy_grid = _time_ms(lambda: _legacy_grid(mask, GRID_STEP), 1)
+            row.update({
+                "legacy_thinning_ms": round(legacy_thin_ms, 3),
+                "legacy_grid_ms": round(legacy_grid_ms, 3),
+                "identical": bool(np.array_equal(skeleton, legacy_skeleton) and np.array_equal(grid, legacy_grid)),
+            })
+        rows.append(row)
+    return rows
+
+
+def run_paths(seed: int) -> List[Dict[str, Any]]:
+    passable = _synthetic_minimap(PATH_SIDE, seed)
+    rng = np.random.default_rng(seed)
+    rows = []
+    for label, mask in (
+        ("pixels", (passable > 0).astype(np.uint8)),
+        ("skeleton", zhang_suen_thinning(passable)),
+        (f"grid/{GRID_STEP}", build_grid(passable, GRID_STEP)),
+    ):
+        start, goal = _far_apart_cells(mask)
+        build_ms, finder = _time_ms(lambda: GridPathfinder(mask), 1)
+        legacy_ms, legacy = _time_ms(lambda: _legacy_astar(mask, start, goal), 1)
+        astar_ms, astar = _time_ms(lambda: finder.astar(start, goal), 1)
+        jps_ms, jps = _time_ms(lambda: finder.jump_point_search(start, goal), 1)
+
+        h, w = mask.shape
+        queries = [(int(x), int(y)) for x, y in zip(rng.integers(0, w, NEAREST_QUERIES), rng.integers(0, h, NEAREST_QUERIES))]
+        legacy_nearest_ms, legacy_nearest = _time_ms(lambda: [_legacy_nearest(mask, q) for q in queries], 1)
+        finder.nearest_passable((0, 0))  # builds the distance transform once
+        nearest_ms, nearest = _time_ms(lambda: [finder.nearest_passable(q) for q in queries], 1)
+        rows.append({
+            "mask": f"{label} {w}x{h}",
+            "path_len": len(legacy),
+            "build_ms": round(build_ms, 3),
+            "legacy_astar_ms": round(legacy_ms, 3),
+            "astar_ms": round(astar_ms, 3),
+            "jps_ms": round(jps_ms, 3),
+            "astar_identical": astar == legacy,
+            "jps_cost_delta": round(finder.path_cost(jps) - finder.path_cost(legacy), 4) if jps and legacy else None,
+            "legacy_nearest_us": round(legacy_nearest_ms * 1000.0 / NEAREST_QUERIES, 2),
+            "nearest_us": round(nearest_ms * 1000.0 / NEAREST_QUERIES, 2),
+            "nearest_identical": nearest == legacy_nearest,
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs of the vectorized path (median is reported)")
+    parser.add_argument("--seed", type=int, default=5)
+    parser.add_argument("--legacy-max-side", type=int, default=512, help="largest mask the per-pixel loops run on")
+    parser.add_argument("--skip-paths", action="store_true", help="only benchmark thinning and grid building")
+    parser.add_argument("--json", action="store_true", help="print raw JSON instead of a table")
+    args = parser.parse_args()
+
+    rows = run(args.repeat, args.seed, args.legacy_max_side)
+    path_rows = [] if args.skip_paths else run_paths(args.seed)
+    if args.json:
+        print(json.dumps({"thinning": rows, "paths": path_rows}, indent=2))
+        return
+
+    def _fmt(value):
+        return f"{value:>10.1f}ms" if value is not None else f"{'-':>12}"
+
+    header = f"{'size':<10} {'thin(loop)':>12} {'thin(vec)':>12} {'grid(loop)':>12} {'grid(vec)':>12}  identical"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['size']:<10} {_fmt(row['legacy_thinning_ms'])} {_fmt(row['thinning_ms'])} "
+            f"{_fmt(row['legacy_grid_ms'])} {_fmt(row['grid_ms'])}  {row['identical']}"
+        )
+    if not path_rows:
+        return
+    print()
+    header = (
+        f"{'mask':<20} {'len':>5} {'A*(dict)':>12} {'A*(array)':>12} {'JPS':>12} {'same':>5} {'jps dcost':>9} "
+        f"{'nearest(scan)':>14} {'nearest(dt)':>12}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in path_rows:
+        print(
+            f"{row['mask']:<20} {row['path_len']:>5} {_fmt(row['legacy_astar_ms'])} {_fmt(row['astar_ms'])} "
+            f"{_fmt(row['jps_ms'])} {str(row['astar_identical']):>5} {str(row['jps_cost_delta']):>9} "
+            f"{row['legacy_nearest_us']:>12.1f}us {row['nearest_us']:>10.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
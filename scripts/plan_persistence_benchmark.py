@@ -0,0 +1,144 @@
+"""Benchmark: PlanContext persistence write latency, whole-file JSON vs SQLite.
+
+Each case seeds a plan with N keys (small dict values) through the strategy's
+own ``save``, then times sequential single-key ``set`` calls, a burst of
+concurrent writers and single-key ``get`` lookups. The SQLite strategy is also
+timed on migrating the seeded JSON file. The state reloaded by a fresh
+strategy instance is checked against the expected state at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from packages.aura_core.context.persistence.strategy import (
+    DatabasePersistence,
+    IPersistenceStrategy,
+    StateStorePersistence,
+)
+
+PLAN = "bench"
+
+
+def _make_strategy(tmp: Path, backend: str, **kwargs) -> IPersistenceStrategy:
+    if backend == "json":
+        return StateStorePersistence(str(tmp / "plan_state.json"))
+    return DatabasePersistence(str(tmp / "plan_state.db"), **kwargs)
+
+
+def _seed_state(keys: int) -> Dict[str, Any]:
+    return {f"key_{i}": {"count": i, "label": f"item-{i}", "tags": ["a", "b"]} for i in range(keys)}
+
+
+async def _close(strategy: IPersistenceStrategy):
+    if isinstance(strategy, DatabasePersistence):
+        await strategy.close()
+
+
+async def _bench_backend(tmp: Path, backend: str, keys: int, updates: int, concurrency: int) -> Dict[str, Any]:
+    state = _seed_state(keys)
+    strategy = _make_strategy(tmp, backend)
+    start = time.perf_counter()
+    await strategy.save(PLAN, state)
+    seed_ms = (time.perf_counter() - start) * 1000.0
+
+    samples = []
+    for i in range(updates):
+        start = time.perf_counter()
+        await strategy.set(PLAN, "counter", i)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    state["counter"] = updates - 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(strategy.set(PLAN, f"burst_{i}", i) for i in range(concurrency)))
+    burst_ms = (time.perf_counter() - start) * 1000.0
+    state.update({f"burst_{i}": i for i in range(concurrency)})
+
+    lookups = [f"key_{(i * 7919) % keys}" for i in range(updates)]
+    start = time.perf_counter()
+    for key in lookups:
+        await strategy.get(PLAN, key)
+    get_us = (time.perf_counter() - start) * 1e6 / len(lookups)
+    await _close(strategy)
+
+    reopened = _make_strategy(tmp, backend)
+    recovered = await reopened.load(PLAN)
+    await _close(reopened)
+
+    migrate_ms = None
+    if backend == "sqlite":
+        json_path = tmp / "legacy_state.json"
+        json_path.write_text(json.dumps({PLAN: state}, ensure_ascii=False), encoding="utf-8")
+        migrated = DatabasePersistence(str(tmp / "migrated.db"), migrate_from=str(json_path))
+        start = time.perf_counter()
+        await migrated.keys(PLAN)  # first access runs the migration
+        migrate_ms = (time.perf_counter() - start) * 1000.0
+        await migrated.close()
+
+    return {
+        "seed_ms": seed_ms,
+        "median_ms": statistics.median(samples),
+        "p95_ms": sorted(samples)[int(0.95 * (len(samples) - 1))],
+        "burst_ms": burst_ms,
+        "get_us": get_us,
+        "migrate_ms": migrate_ms,
+        "recovered_ok": recovered == state,
+    }
+
+
+def run(key_counts: List[int], backends: List[str], updates: int, concurrency: int) -> List[Dict[str, Any]]:
+    rows = []
+    for keys in key_counts:
+        for backend in backends:
+            with tempfile.TemporaryDirectory() as tmp:
+                result = asyncio.run(_bench_backend(Path(tmp), backend, keys, updates, concurrency))
+            rows.append({"keys": keys, "backend": backend, **{k: round(v, 3) if isinstance(v, float) else v
+                                                               for k, v in result.items()}})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--backends", nargs="+", default=["json", "sqlite"], choices=["json", "sqlite"])
+    parser.add_argument("--updates", type=int, default=50, help="sequential single-key sets per case")
+    parser.add_argument("--concurrency", type=int, default=50, help="writers in the concurrent burst")
+    parser.add_argument("--json", action="store_true", help="print raw JSON instead of a table")
+    args = parser.parse_args()
+
+    rows = run(args.keys, args.backends, args.updates, args.concurrency)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    def _fmt(value):
+        return f"{value:>9.1f}ms" if value is not None else f"{'-':>11}"
+
+    header = (
+        f"{'keys':>7} {'backend':<8} {'seed':>11} {'median':>10} {'p95':>10} {'burst':>11} "
+        f"{'get':>9} {'migrate':>11}  recovered"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['keys']:>7} {row['backend']:<8} {_fmt(row['seed_ms'])} {row['median_ms']:>8.3f}ms "
+            f"{row['p95_ms']:>8.3f}ms {_fmt(row['burst_ms'])} {row['get_us']:>7.1f}us "
+            f"{_fmt(row['migrate_ms'])}  {row['recovered_ok']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark: StateStoreService write latency, full-file JSON rewrite vs append-only log.
+
+The store is pre-populated with N keys (small dict values), then timed on
+sequential single-key "counter" updates and on a burst of concurrent writers.
+Each backend runs in its own temp directory; the state recovered by a fresh
+store instance is checked against the in-memory state at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from packages.aura_core.context.persistence.store_service import StateStoreService
+
+
+class _Config:
+    def __init__(self, values: Dict[str, Any]):
+        self._values = values
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._values.get(key, default)
+
+
+def _make_store(path: Path, backend: str) -> StateStoreService:
+    store_cfg: Dict[str, Any] = {"type": "file", "path": str(path)}
+    store_cfg["wal"] = {"enabled": backend == "wal"}
+    return StateStoreService(_Config({"state_store": store_cfg}))
+
+
+def _seed_file(path: Path, keys: int):
+    data = {f"key_{i}": {"count": i, "label": f"item-{i}", "tags": ["a", "b"]} for i in range(keys)}
+    path.write_text(json.dumps(data, indent=4, ensure_ascii=False), encoding="utf-8")
+
+
+async def _bench_backend(path: Path, backend: str, updates: int, concurrency: int) -> Dict[str, Any]:
+    store = _make_store(path, backend)
+    await store.initialize()
+
+    samples = []
+    for i in range(updates):
+        start = time.perf_counter()
+        await store.set("counter", i)
+        samples.append((time.perf_counter() - start) * 1000.0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(store.set(f"burst_{i}", i) for i in range(concurrency)))
+    burst_ms = (time.perf_counter() - start) * 1000.0
+
+    expected = await store.get_all_data()
+    recovered = await _make_store(path, backend).get_all_data()
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": sorted(samples)[int(0.95 * (len(samples) - 1))],
+        "burst_ms": burst_ms,
+        "file_kb": sum(p.stat().st_size for p in path.parent.iterdir()) / 1024.0,
+        "recovered_ok": recovered == expected,
+    }
+
+
+def run(key_counts: List[int], backends: List[str], updates: int, concurrency: int) -> List[Dict[str, Any]]:
+    rows = []
+    for keys in key_counts:
+        for backend in backends:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = Path(tmp) / "project_state.json"
+                _seed_file(path, keys)
+                result = asyncio.run(_bench_backend(path, backend, updates, concurrency))
+            rows.append({"keys": keys, "backend": backend, **{k: round(v, 3) if isinstance(v, float) else v
+                                                               for k, v in result.items()}})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--backends", nargs="+", default=["json", "wal"], choices=["json", "wal"])
+    parser.add_argument("--updates", type=int, default=200, help="sequential counter updates per case")
+    parser.add_argument("--concurrency", type=int, default=200, help="writers in the concurrent burst")
+    parser.add_argument("--json", action="store_true", help="print raw JSON instead of a table")
+    args = parser.parse_args()
+
+    rows = run(args.keys, args.backends, args.updates, args.concurrency)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    header = f"{'keys':>7} {'backend':<8} {'median':>10} {'p95':>10} {'burst':>11} {'on disk':>10}  recovered"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['keys']:>7} {row['backend']:<8} {row['median_ms']:>8.3f}ms {row['p95_ms']:>8.3f}ms "
+            f"{row['burst_ms']:>9.1f}ms {row['file_kb']:>8.0f}KB  {row['recovered_ok']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
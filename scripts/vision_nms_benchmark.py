@@ -0,0 +1,122 @@
+"""CPU-only benchmark: vectorized candidate extraction + NMS vs the list-based path.
+
+A synthetic inventory grid (one icon repeated in every cell) produces a dense
+score map in which tens of thousands of positions pass the threshold. The
+legacy path (``np.where`` -> Python lists -> ``cv2.dnn.NMSBoxes``) is timed
+against ``extract_match_candidates`` + ``nms_boxes`` on the same score map.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from plans.aura_base.src.services.vision_service import extract_match_candidates, nms_boxes
+
+
+# (label, frame size, cell size, threshold)
+SCENARIOS = [
+    ("grid-1080p", (1920, 1080), 48, 0.6),
+    ("grid-1440p", (2560, 1440), 64, 0.6),
+    ("grid-1080p-loose", (1920, 1080), 48, 0.3),
+]
+
+
+def _inventory_grid(width: int, height: int, cell: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    icon = cv2.GaussianBlur(rng.integers(0, 256, size=(cell, cell), dtype=np.uint8), (0, 0), cell / 6)
+    icon = cv2.normalize(icon, None, 0, 255, cv2.NORM_MINMAX)
+    frame = np.tile(icon, (height // cell + 1, width // cell + 1))[:height, :width]
+    noise = rng.normal(0, 6, frame.shape)
+    frame = np.clip(frame.astype(np.float32) + noise, 0, 255).astype(np.uint8)
+    template = icon[cell // 8:cell - cell // 8, cell // 8:cell - cell // 8].copy()
+    return frame, template
+
+
+def _legacy(score_map: np.ndarray, w: int, h: int, threshold: float, nms_threshold: float) -> List[Tuple[int, int]]:
+    locations = np.where(score_map >= threshold)
+    rects = [[pt[0], pt[1], pt[0] + w, pt[1] + h] for pt in zip(*locations[::-1])]
+    scores = [score_map[pt[1], pt[0]] for pt in zip(*locations[::-1])]
+    indices = []
+    if rects:
+        indices = cv2.dnn.NMSBoxes(rects, np.array(scores, dtype=np.float32), threshold, nms_threshold)
+    return [(rects[i][0], rects[i][1]) for i in np.asarray(indices).flatten()]
+
+
+def _vectorized(score_map: np.ndarray, w: int, h: int, threshold: float, nms_threshold: float) -> List[Tuple[int, int]]:
+    xs, ys, scores = extract_match_candidates(score_map, threshold, top_k=4096)
+    keep = nms_boxes(np.stack([xs, ys, xs + w, ys + h], axis=1), scores, nms_threshold)
+    return [(int(xs[i]), int(ys[i])) for i in keep]
+
+
+def _time_ms(func: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples), result
+
+
+def run(repeat: int, seed: int, nms_threshold: float) -> List[Dict[str, Any]]:
+    rows = []
+    for label, (width, height), cell, threshold in SCENARIOS:
+        frame, template = _inventory_grid(width, height, cell, seed)
+        score_map = cv2.matchTemplate(frame, template, cv2.TM_CCOEFF_NORMED)
+        h, w = template.shape[:2]
+        raw_candidates = int(np.count_nonzero(score_map >= threshold))
+        legacy_ms, legacy = _time_ms(lambda: _legacy(score_map, w, h, threshold, nms_threshold), repeat)
+        vector_ms, vector = _time_ms(lambda: _vectorized(score_map, w, h, threshold, nms_threshold), repeat)
+        cells = (width // cell) * (height // cell)
+        rows.append({
+            "scenario": label,
+            "candidates": raw_candidates,
+            "grid_cells": cells,
+            "legacy_ms": round(legacy_ms, 3),
+            "vectorized_ms": round(vector_ms, 3),
+            "speedup": round(legacy_ms / vector_ms, 2) if vector_ms else None,
+            "legacy_matches": len(legacy),
+            "vectorized_matches": len(vector),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case (median is reported)")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--nms-threshold", type=float, default=0.5)
+    parser.add_argument("--json", action="store_true", help="print raw JSON instead of a table")
+    args = parser.parse_args()
+
+    cv2.setNumThreads(1)
+    rows = run(args.repeat, args.seed, args.nms_threshold)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    header = f"{'scenario':<18} {'candidates':>10} {'cells':>6} {'legacy':>11} {'vectorized':>11} {'x':>7} {'matches':>13}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['scenario']:<18} {row['candidates']:>10} {row['grid_cells']:>6} "
+            f"{row['legacy_ms']:>9.2f}ms {row['vectorized_ms']:>9.2f}ms {row['speedup']:>7.1f} "
+            f"{row['legacy_matches']:>6}/{row['vectorized_matches']:<6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
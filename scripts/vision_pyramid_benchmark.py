@@ -0,0 +1,128 @@
+"""CPU-only benchmark: pyramid (coarse-to-fine) vs exhaustive template matching.
+
+Synthetic UI-like frames are rendered at 1080p and 1440p, templates are cropped
+from them, and both search modes are timed on the vision service's internal
+matching functions (no event loop or screen capture involved).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from plans.aura_base.src.services.vision_service import VisionService
+
+
+RESOLUTIONS = {"1080p": (1920, 1080), "1440p": (2560, 1440)}
+TEMPLATE_SIZES = [(96, 48), (64, 64), (160, 40)]
+
+
+def _synthetic_frame(width: int, height: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(30, 90, width, dtype=np.float32)[None, :].repeat(height, axis=0)
+    frame = np.dstack([gradient, gradient * 0.8, gradient * 0.6]).astype(np.uint8)
+    for _ in range(400):
+        x, y = int(rng.integers(0, width - 40)), int(rng.integers(0, height - 20))
+        w, h = int(rng.integers(20, 240)), int(rng.integers(12, 120))
+        color = tuple(int(c) for c in rng.integers(0, 256, size=3))
+        cv2.rectangle(frame, (x, y), (x + w, y + h), color, -1 if rng.random() < 0.6 else 2)
+    for _ in range(300):
+        x, y = int(rng.integers(0, width - 80)), int(rng.integers(20, height))
+        text = "".join(chr(int(c)) for c in rng.integers(65, 91, size=int(rng.integers(3, 10))))
+        cv2.putText(frame, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX, float(rng.uniform(0.4, 1.2)),
+                    tuple(int(c) for c in rng.integers(0, 256, size=3)), 1, cv2.LINE_AA)
+    noise = rng.normal(0, 4, frame.shape)
+    return np.clip(frame.astype(np.float32) + noise, 0, 255).astype(np.uint8)
+
+
+def _time_ms(func: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples), result
+
+
+def run(repeat: int, seed: int) -> List[Dict[str, Any]]:
+    vision = VisionService()
+    rng = np.random.default_rng(seed)
+    rows = []
+    for label, (width, height) in RESOLUTIONS.items():
+        frame = vision._prepare_image(_synthetic_frame(width, height, seed))
+        for tw, th in TEMPLATE_SIZES:
+            x, y = int(rng.integers(0, width - tw)), int(rng.integers(0, height - th))
+            template = np.ascontiguousarray(frame[y:y + th, x:x + tw])
+            key = f"bench-{label}-{tw}x{th}"
+
+            def exhaustive():
+                return vision._match_template_prepared(
+                    frame, template, None, 0.9, cv2.TM_CCOEFF_NORMED, True, "none"
+                )
+
+            def pyramid_cold():
+                vision.forget_last_hits(key)
+                return vision._match_template_pyramid(
+                    frame, template, None, 0.9, cv2.TM_CCOEFF_NORMED, True, "none", template_key=key
+                )
+
+            def pyramid_warm():
+                return vision._match_template_pyramid(
+                    frame, template, None, 0.9, cv2.TM_CCOEFF_NORMED, True, "none", template_key=key
+                )
+
+            exhaustive_ms, expected = _time_ms(exhaustive, repeat)
+            cold_ms, cold = _time_ms(pyramid_cold, repeat)
+            warm_ms, warm = _time_ms(pyramid_warm, repeat)
+            rows.append({
+                "resolution": label,
+                "template": f"{tw}x{th}",
+                "exhaustive_ms": round(exhaustive_ms, 3),
+                "pyramid_ms": round(cold_ms, 3),
+                "pyramid_last_hit_ms": round(warm_ms, 3),
+                "speedup": round(exhaustive_ms / cold_ms, 2) if cold_ms else None,
+                "speedup_last_hit": round(exhaustive_ms / warm_ms, 2) if warm_ms else None,
+                "same_location": cold.top_left == expected.top_left == warm.top_left,
+            })
+    vision.shutdown()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per case (median is reported)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="print raw JSON instead of a table")
+    args = parser.parse_args()
+
+    cv2.setNumThreads(1)  # time the algorithm, not OpenCV's internal threading
+    rows = run(args.repeat, args.seed)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    header = f"{'res':<6} {'template':<8} {'exhaustive':>11} {'pyramid':>9} {'last_hit':>9} {'x':>6} {'x(hit)':>7}  same"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['resolution']:<6} {row['template']:<8} {row['exhaustive_ms']:>9.2f}ms "
+            f"{row['pyramid_ms']:>7.2f}ms {row['pyramid_last_hit_ms']:>7.2f}ms "
+            f"{row['speedup']:>6.1f} {row['speedup_last_hit']:>7.1f}  {row['same_location']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -76,6 +77,32 @@ class _FakeModel:
         return [_FakePrediction()]
 
 
+class _FakeSizedPrediction:
+    """Prediction whose box width encodes the (fake) image it was produced from."""
+
+    def __init__(self, image):
+        width = float(image.shape[1])
+        self.boxes = type("Boxes", (), {
+            "xyxy": _FakeTensor([[0, 0, width, 10]]),
+            "conf": _FakeTensor([0.5]),
+            "cls": _FakeTensor([0]),
+        })()
+        self.orig_shape = image.shape
+
+
+class _FakeBatchModel:
+    def __init__(self):
+        self.names = {0: "person"}
+        self.batch_sizes = []
+        self.threads = set()
+
+    def predict(self, source, **kwargs):
+        self.threads.add(threading.current_thread().name)
+        images = source if isinstance(source, list) else [source]
+        self.batch_sizes.append(len(images))
+        return [_FakeSizedPrediction(image) for image in images]
+
+
 class _FakeYoloFactory:
     def __init__(self):
         self.created = []
@@ -154,6 +181,43 @@ class TestCoreYoloService(unittest.TestCase):
         self.assertEqual(fake_app.capture_calls, [(1, 2, 3, 4)])
         self.assertEqual(result["detections"][0]["bbox_global"], [25, 46, 100, 200])
 
+    def test_concurrent_detects_are_micro_batched_per_model_and_settings(self):
+        import numpy as np
+
+        service = YoloService(config=_FakeConfig({
+            "yolo.batch.max_size": 4,
+            "yolo.batch.max_wait_ms": 300,
+        }))
+        model = _FakeBatchModel()
+        with patch.object(service, "_load_yolo_class", return_value=lambda source: model):
+            service.preload_model("yolo11")
+
+        results = {}
+
+        def _detect(width, options=None):
+            image = np.zeros((8, width, 3), dtype=np.uint8)
+            results[width] = service.detect(image, model_name="yolo11", options=options)
+
+        workers = [threading.Thread(target=_detect, args=(width,)) for width in (11, 12, 13, 14)]
+        workers.append(threading.Thread(target=_detect, args=(15, {"conf": 0.9})))
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=5)
+        service.shutdown()
+
+        self.assertEqual(sorted(model.batch_sizes), [1, 4])  # different settings never share a batch
+        self.assertEqual(model.threads, {"yolo-inference"})
+        for width, result in results.items():
+            self.assertEqual(result["detections"][0]["bbox_xywh"][2], float(width))
+            self.assertEqual(result["image_size"], [width, 8])
+        stats = service.get_batch_stats()
+        self.assertTrue(stats["enabled"])
+        self.assertEqual((stats["batches"], stats["requests"], stats["max_batch_size"]), (2, 5, 4))
+        self.assertGreater(stats["avg_inference_ms"], 0)
+        self.assertGreater(stats["avg_queue_wait_ms"], 0)
+        self.assertGreater(stats["p95_queue_wait_ms"], 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,6 +3,7 @@ from __future__ import annotations
 import unittest
 from enum import Enum
 
+from packages.aura_core.engine.execution_plan import ExecutionPlanCache, compile_execution_plan
 from packages.aura_core.engine.graph_builder import GraphBuilder
 
 
@@ -45,5 +46,53 @@ class TestGraphBuilderDependencySyntax(unittest.TestCase):
         self.assertIn("List dependency shorthand has been removed", str(cm.exception))
 
 
+class _State(Enum):
+    PENDING = "PENDING"
+    SUCCESS = "SUCCESS"
+    FAILED = "FAILED"
+
+
+class TestExecutionPlan(unittest.TestCase):
+    STEPS = {
+        "prepare": {},
+        "fetch": {"depends_on": "prepare"},
+        "fallback": {"depends_on": {"none": "prepare"}},
+        "finish": {"depends_on": {"all": ["prepare", {"fetch": "success|failed"}]}},
+    }
+
+    def test_compiles_topology_and_lowered_predicates(self):
+        plan = compile_execution_plan(self.STEPS)
+
+        self.assertEqual(plan.topological_order, ("prepare", "fetch", "fallback", "finish"))
+        self.assertEqual(plan.initial_ready, ("prepare", "fallback"))
+        self.assertEqual(plan.in_degree["finish"], 2)
+        self.assertEqual(plan.reverse_dependencies["prepare"], {"fetch", "fallback", "finish"})
+        self.assertIn("fetch", plan.conjunctive_nodes)
+        self.assertNotIn("finish", plan.conjunctive_nodes)
+
+        states = {"prepare": _State.SUCCESS, "fetch": _State.FAILED}
+        self.assertTrue(plan.is_ready("finish", states))
+        self.assertFalse(plan.is_ready("fallback", states))
+
+    def test_cache_reuses_plan_for_same_topology(self):
+        cache = ExecutionPlanCache(maxsize=4)
+
+        first = cache.get_or_compile(self.STEPS)
+        second = cache.get_or_compile({key: dict(value) for key, value in self.STEPS.items()})
+        changed = cache.get_or_compile({**self.STEPS, "fetch": {}})
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, changed)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_rejects_cycles_and_unknown_statuses(self):
+        with self.assertRaises(ValueError) as cm:
+            compile_execution_plan({"a": {"depends_on": "b"}, "b": {"depends_on": "a"}})
+        self.assertIn("Detected circular dependency", str(cm.exception))
+
+        with self.assertRaises(ValueError):
+            compile_execution_plan({"a": {}, "b": {"depends_on": {"a": "done"}}})
+
+
 if __name__ == "__main__":
     unittest.main()
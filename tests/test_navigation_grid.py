@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import heapq
+import math
+
+import cv2
+import numpy as np
+
+from plans.aura_base.src.services.navigation_grid import GridPathfinder, build_grid, zhang_suen_thinning
+
+
+def _reference_thinning(bin_img):
+    """The original per-pixel Zhang-Suen loop from NavigationService."""
+    img = (bin_img > 0).astype(np.uint8)
+    h, w = img.shape
+    changed = True
+    while changed:
+        changed = False
+        for step in (0, 1):
+            to_del = []
+            for y in range(1, h - 1):
+                for x in range(1, w - 1):
+                    if img[y, x] == 0:
+                        continue
+                    p2, p3, p4, p5 = img[y - 1, x], img[y - 1, x + 1], img[y, x + 1], img[y + 1, x + 1]
+                    p6, p7, p8, p9 = img[y + 1, x], img[y + 1, x - 1], img[y, x - 1], img[y - 1, x - 1]
+                    neighbors = [p2, p3, p4, p5, p6, p7, p8, p9]
+                    c = sum((neighbors[i] == 0 and neighbors[(i + 1) % 8] == 1) for i in range(8))
+                    n = sum(neighbors)
+                    if step == 0:
+                        ok = p2 * p4 * p6 == 0 and p4 * p6 * p8 == 0
+                    else:
+                        ok = p2 * p4 * p8 == 0 and p2 * p6 * p8 == 0
+                    if 2 <= n <= 6 and c == 1 and ok:
+                        to_del.append((y, x))
+            if to_del:
+                changed = True
+                for y, x in to_del:
+                    img[y, x] = 0
+    return img
+
+
+def _reference_grid(passable, step):
+    h, w = passable.shape[:2]
+    gh, gw = (h + step - 1) // step, (w + step - 1) // step
+    grid = np.zeros((gh, gw), dtype=np.uint8)
+    for gy in range(gh):
+        for gx in range(gw):
+            if np.any(passable[gy * step:min((gy + 1) * step, h), gx * step:min((gx + 1) * step, w)] > 0):
+                grid[gy, gx] = 1
+    return grid
+
+
+def _reference_astar(grid, start, goal):
+    """The original dict/heapq A* from NavigationService."""
+    neighbors = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+    open_set = [(0.0, start)]
+    came_from = {}
+    g_score = {start: 0.0}
+    iters = 0
+    while open_set and iters < grid.shape[0] * grid.shape[1] * 2:
+        iters += 1
+        _, current = heapq.heappop(open_set)
+        if current == goal:
+            path = [current]
+            while current in came_from:
+                current = came_from[current]
+                path.append(current)
+            return path[::-1]
+        for dx, dy in neighbors:
+            nx, ny = current[0] + dx, current[1] + dy
+            if not (0 <= ny < grid.shape[0] and 0 <= nx < grid.shape[1]) or grid[ny, nx] == 0:
+                continue
+            tentative = g_score[current] + (1.4142 if dx != 0 and dy != 0 else 1.0)
+            if tentative < g_score.get((nx, ny), float("inf")):
+                came_from[(nx, ny)] = current
+                g_score[(nx, ny)] = tentative
+                heapq.heappush(open_set, (tentative + math.hypot(nx - goal[0], ny - goal[1]), (nx, ny)))
+    return []
+
+
+def _reference_nearest(grid, cell):
+    gx, gy = cell
+    if 0 <= gy < grid.shape[0] and 0 <= gx < grid.shape[1] and grid[gy, gx] > 0:
+        return cell
+    for radius in range(1, 20):
+        for dy in range(-radius, radius + 1):
+            for dx in range(-radius, radius + 1):
+                nx, ny = gx + dx, gy + dy
+                if 0 <= ny < grid.shape[0] and 0 <= nx < grid.shape[1] and grid[ny, nx] > 0:
+                    return (nx, ny)
+    return None
+
+
+def _corridor_mask(h, w, seed):
+    rng = np.random.default_rng(seed)
+    mask = np.zeros((h, w), dtype=np.uint8)
+    for _ in range(8):
+        p0 = tuple(int(v) for v in rng.integers(0, [w, h]))
+        p1 = tuple(int(v) for v in rng.integers(0, [w, h]))
+        cv2.line(mask, p0, p1, 255, int(rng.integers(2, 9)))
+    mask[rng.random((h, w)) < 0.02] = 255  # speckle exercises the isolated-pixel cases
+    return mask
+
+
+def test_vectorized_thinning_and_grid_match_reference_loops():
+    for seed, (h, w) in enumerate([(48, 64), (61, 37), (3, 9), (2, 5)]):
+        mask = _corridor_mask(h, w, seed)
+        np.testing.assert_array_equal(zhang_suen_thinning(mask), _reference_thinning(mask))
+        for step in (1, 4, 7):
+            np.testing.assert_array_equal(build_grid(mask, step), _reference_grid(mask, step))
+
+    full = np.full((20, 20), 255, dtype=np.uint8)
+    np.testing.assert_array_equal(zhang_suen_thinning(full), _reference_thinning(full))
+    assert zhang_suen_thinning(full).dtype == np.uint8
+
+
+def test_array_astar_and_nearest_passable_match_reference_search():
+    rng = np.random.default_rng(3)
+    for seed in range(6):
+        passable = _corridor_mask(90, 120, seed)
+        for mask in (build_grid(passable, 4), zhang_suen_thinning(passable), build_grid(passable, 2)):
+            finder = GridPathfinder(mask)
+            cells = list(zip(*np.nonzero(mask)[::-1]))
+            for _ in range(8):
+                start = cells[int(rng.integers(len(cells)))]
+                goal = cells[int(rng.integers(len(cells)))]
+                start, goal = (int(start[0]), int(start[1])), (int(goal[0]), int(goal[1]))
+                expected = _reference_astar(mask, start, goal)
+                assert finder.astar(start, goal) == expected
+
+                jps = finder.jump_point_search(start, goal)
+                assert bool(jps) == bool(expected)
+                if jps:
+                    assert jps[0] == start and jps[-1] == goal
+                    assert all(mask[y, x] for x, y in jps)
+                    assert all(max(abs(a[0] - b[0]), abs(a[1] - b[1])) == 1 for a, b in zip(jps, jps[1:]))
+                    assert finder.path_cost(jps) <= finder.path_cost(expected) + 1e-6
+
+            h, w = mask.shape
+            for _ in range(40):
+                query = (int(rng.integers(-25, w + 25)), int(rng.integers(-25, h + 25)))
+                assert finder.nearest_passable(query) == _reference_nearest(mask, query)
+
+    empty = GridPathfinder(np.zeros((5, 5), dtype=np.uint8))
+    assert empty.nearest_passable((2, 2)) is None and empty.astar((0, 0), (4, 4)) == []
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import numpy as np
+
+from plans.aura_base.src.services.ocr_service import OcrService
+
+
+class _StubRecognizer:
+    """Batch recognizer stand-in: one "word" per image, boxed around its bright pixels."""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, images, **kwargs):
+        self.batches.append(len(images))
+        results = []
+        for image in images:
+            ys, xs = np.nonzero(image[:, :, 0] > 100)
+            if len(xs) == 0:
+                results.append({"rec_texts": [], "rec_scores": [], "rec_polys": []})
+                continue
+            x0, y0, x1, y1 = xs.min(), ys.min(), xs.max(), ys.max()
+            results.append({
+                "rec_texts": [str(int(image[y0, x0, 0]))],
+                "rec_scores": [0.98],
+                "rec_polys": [np.array([[x0, y0], [x1, y0], [x1, y1], [x0, y1]])],
+            })
+        return results
+
+
+def _service():
+    service = OcrService()
+    recognizer = _StubRecognizer()
+    service.set_engine(recognizer, device="stub")
+    return service, recognizer
+
+
+def test_ocr_results_are_cached_by_pixel_content():
+    service, recognizer = _service()
+    frame = np.zeros((40, 60, 3), dtype=np.uint8)
+    frame[5:15, 5:25] = 255
+
+    async def _scenario():
+        first = await service._find_text_async("255", frame, "exact", None)
+        first.center_point = (999, 999)  # callers offset results in place
+        again = await service._find_text_async("255", frame.copy(), "exact", None)
+        crop = await service._recognize_all_async(frame[0:20, 0:30])
+        crop_again = await service._recognize_all_async(np.ascontiguousarray(frame[0:20, 0:30]))
+        changed = frame.copy()
+        changed[30, 50] = 1
+        await service._recognize_all_async(changed)
+        return first, again, crop, crop_again
+
+    first, again, crop, crop_again = asyncio.run(_scenario())
+
+    assert first.found and again.found
+    assert again.center_point == (14, 9)
+    assert crop.count == crop_again.count == 1
+    assert sum(recognizer.batches) == 3  # full frame, crop, changed frame
+    stats = service.get_cache_stats()
+    assert stats["hits"] == 2 and stats["misses"] == 3 and stats["hit_rate"] == 0.4
+
+    service.result_cache.ttl_sec = 0.01
+    time.sleep(0.02)
+    asyncio.run(service._recognize_all_async(frame))
+    assert sum(recognizer.batches) == 4 and service.get_cache_stats()["expired"] == 1
+
+    service.clear_cache()
+    assert service.get_cache_stats()["size"] == 0
+
+
+def test_regions_from_concurrent_requests_share_one_batch():
+    service, recognizer = _service()
+    frame = np.zeros((120, 200, 3), dtype=np.uint8)
+    regions = []
+    for index in range(6):  # a column of stat fields
+        x, y = 10, 5 + index * 18
+        frame[y + 3:y + 9, x + 4:x + 30] = 110 + index
+        regions.append((x, y, 60, 14))
+    other = np.zeros((30, 30, 3), dtype=np.uint8)
+    other[10:20, 10:20] = 250
+
+    async def _scenario():
+        return await asyncio.gather(
+            service._recognize_regions_async(frame, regions + [regions[0], (500, 500, 10, 10)]),
+            service._find_text_async("250", other, "exact", None),
+            service._recognize_all_async(other.copy()),
+        )
+
+    per_region, found, other_all = asyncio.run(_scenario())
+
+    assert recognizer.batches == [7]  # 6 unique crops + the other frame, in one predict call
+    assert [r.results[0].text for r in per_region[:6]] == [str(110 + i) for i in range(6)]
+    assert per_region[2].results[0].rect == (14, 44, 25, 5)  # translated back to frame coordinates
+    assert per_region[6].results[0].rect == per_region[0].results[0].rect
+    assert per_region[6].results[0] is not per_region[0].results[0]
+    assert per_region[7].count == 0
+    assert found.found and found.center_point == (14, 14) and other_all.count == 1
+    assert service.get_batch_stats()["coalesced"] == 2
+
+    assert asyncio.run(service._recognize_regions_async(frame, regions[:2]))[1].results[0].text == "111"
+    assert recognizer.batches == [7]  # served from the result cache
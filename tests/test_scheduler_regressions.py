@@ -4,23 +4,33 @@ from __future__ import annotations
 
 import asyncio
 import threading
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from types import SimpleNamespace
 
 from packages.aura_core.api.definitions import ActionDefinition, ServiceDefinition
+from packages.aura_core.config import template as template_module
+from packages.aura_core.config.template import TemplateRenderer
 from packages.aura_core.context.execution import ExecutionContext
 from packages.aura_core.engine import action_injector as action_injector_module
 from packages.aura_core.engine import action_resolver as action_resolver_module
 from packages.aura_core.engine.action_injector import ActionInjector
 from packages.aura_core.engine.action_resolver import ActionResolver
+from packages.aura_core.observability.events import Event, EventBus
+from packages.aura_core.observability.run_store import RunStore
+from packages.aura_core.observability.service import ObservabilityService
+from packages.aura_core.packaging.core import task_loader as task_loader_module
+from packages.aura_core.packaging.core.task_loader import TaskLoader, TaskDefinitionCache
 from packages.aura_core.packaging.core.task_validator import TaskDefinitionValidator, TaskValidationError
 from packages.aura_core.packaging.manifest.schema import PackageInfo, PluginManifest
+from packages.aura_core.scheduler.execution import dispatcher as dispatcher_module
 from packages.aura_core.scheduler.execution.dispatcher import DispatchService
 from packages.aura_core.scheduler.execution.manager import ExecutionManager
-from packages.aura_core.scheduler.queues.task_queue import Tasklet
+from packages.aura_core.scheduler.queues.task_queue import TaskQueue, Tasklet
 from packages.aura_core.scheduler.run_query import RunQueryService
 from packages.aura_core.scheduler import scheduling_service as scheduling_module
+from packages.aura_core.scheduler.task_dispatcher import TaskDispatcher
 from packages.aura_core.utils.middleware import Middleware, middleware_manager
 
 
@@ -166,6 +176,101 @@ def test_cron_trigger_check_skips_gracefully_when_croniter_missing(monkeypatch):
     assert service._croniter_missing_logged is True
 
 
+class _DummySchedulerForScheduling:
+    def __init__(self, schedule_items):
+        self.fallback_lock = threading.RLock()
+        self.is_running = threading.Event()
+        self.is_running.set()
+        self.schedule_items = schedule_items
+        self.run_statuses = {item["id"]: {"status": "idle"} for item in schedule_items}
+        self.enqueued = []
+
+    async def _enqueue_schedule_item(self, item, *, source):
+        self.enqueued.append(item["id"])
+        self.run_statuses[item["id"]] = {"status": "queued"}
+        return True
+
+
+def _cron_item(item_id, expression, **extra):
+    item = {
+        "id": item_id,
+        "plan_name": "demo",
+        "enabled": True,
+        "triggers": [{"type": "cron", "expression": expression}],
+    }
+    item.update(extra)
+    return item
+
+
+def test_scheduling_service_arms_exact_deadlines_and_rearms_only_fired_item():
+    now = datetime(2026, 1, 1, 10, 2, 30)
+    scheduler = _DummySchedulerForScheduling(
+        [
+            _cron_item("fresh", "*/5 * * * *"),
+            _cron_item("ran", "*/5 * * * *"),
+            _cron_item("cooldown", "* * * * *", run_options={"cooldown": 600}),
+            _cron_item("disabled", "* * * * *", enabled=False),
+            {"id": "manual", "plan_name": "demo", "enabled": True, "triggers": []},
+        ]
+    )
+    scheduler.run_statuses["ran"] = {"status": "idle", "last_run": datetime(2026, 1, 1, 10, 0, 5)}
+    scheduler.run_statuses["cooldown"] = {"status": "idle", "last_run": datetime(2026, 1, 1, 10, 0, 0)}
+    service = scheduling_module.SchedulingService(scheduler)
+
+    service._rebuild_timers(now)
+
+    deadlines = {item_id: due for due, _, item_id in service._timers}
+    assert deadlines == {
+        "fresh": now,
+        "ran": datetime(2026, 1, 1, 10, 5),
+        "cooldown": datetime(2026, 1, 1, 10, 10),
+    }
+    armed_before = dict(service._armed)
+
+    asyncio.run(service._fire_due_items(now))
+
+    assert scheduler.enqueued == ["fresh"]
+    assert service._armed["ran"] == armed_before["ran"]
+    assert service._armed["cooldown"] == armed_before["cooldown"]
+    assert service._armed["fresh"] != armed_before["fresh"]
+    live = {item_id: due for due, seq, item_id in service._timers if service._armed[item_id] == seq}
+    assert live["fresh"] == datetime(2026, 1, 1, 10, 5)
+    assert service._seconds_until_next_due(now) == 150.0
+
+    # The due time is inclusive: firing exactly on the cron boundary matches.
+    scheduler.run_statuses["ran"] = {"status": "idle", "last_run": datetime(2026, 1, 1, 10, 0, 5)}
+    asyncio.run(service._fire_due_items(datetime(2026, 1, 1, 10, 5)))
+    assert scheduler.enqueued == ["fresh", "ran"]
+
+
+def test_scheduling_service_picks_up_schedule_edits_without_waiting_for_tick():
+    scheduler = _DummySchedulerForScheduling([])
+    service = scheduling_module.SchedulingService(scheduler)
+    service.max_sleep_sec = 3600
+
+    async def _scenario():
+        runner = asyncio.create_task(service.run())
+        await asyncio.sleep(0.05)
+        assert scheduler.enqueued == []
+
+        with scheduler.fallback_lock:
+            scheduler.schedule_items.append(_cron_item("added", "0 0 1 1 *"))
+        notifier = threading.Thread(target=service.notify_schedule_changed)
+        notifier.start()
+        notifier.join()
+
+        deadline = time.monotonic() + 2.0
+        while not scheduler.enqueued and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+
+        service.stop()
+        await asyncio.wait_for(runner, timeout=2.0)
+
+    asyncio.run(_scenario())
+
+    assert scheduler.enqueued == ["added"]
+
+
 def test_resource_tag_parser_accepts_colon_rich_tags():
     manager = ExecutionManager(scheduler=SimpleNamespace())
     tasklet = Tasklet(
@@ -360,3 +465,448 @@ def test_task_validator_rejects_top_level_list_dependency_shorthand():
         assert False, "expected deprecated list shorthand to fail"
     except TaskValidationError as exc:
         assert exc.code == "deprecated_syntax"
+
+
+def test_template_renderer_reuses_compiled_templates_across_renderers(monkeypatch):
+    monkeypatch.setattr(template_module, "_shared_cache", template_module.CompiledTemplateCache(maxsize=2))
+    context = ExecutionContext(initial_data={"value": 3})
+
+    first = TemplateRenderer(context, state_store=None)
+    second = TemplateRenderer(context, state_store=None)
+    assert first.jinja_env is second.jinja_env
+
+    assert asyncio.run(first.render("{{ initial.value + 1 }}")) == 4
+    assert asyncio.run(second.render("{{ initial.value + 1 }}")) == 4
+    stats = TemplateRenderer.get_cache_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+    asyncio.run(first.render("{{ initial.value * 2 }}"))
+    asyncio.run(first.render("{{ initial.value * 3 }}"))
+    assert TemplateRenderer.get_cache_stats()["size"] == 2
+    assert "{{ initial.value + 1 }}" not in template_module.get_template_cache()._templates
+
+
+def test_execution_context_fork_shares_values_but_isolates_writes():
+    big_output = {"boxes": list(range(1000))}
+    parent = ExecutionContext(initial_data={"seed": 1})
+    parent.add_node_result("ocr", {"output": big_output, "metadata": {"execution_count": 1}})
+
+    child = parent.fork()
+    assert child.data["nodes"]["ocr"]["output"] is big_output
+
+    child.data["nodes"]["ocr"]["metadata"] = {"execution_count": 2}
+    child.add_node_result("next", {"output": 1})
+    child.set_loop_variables({"index": 3})
+
+    assert parent.data["nodes"]["ocr"]["metadata"] == {"execution_count": 1}
+    assert "next" not in parent.data["nodes"]
+    assert parent.data["loop"] == {}
+
+    parent.merge([child])
+    assert parent.data["nodes"]["next"] == {"output": 1}
+
+
+def test_event_bus_pattern_index_matches_fnmatch_semantics():
+    received = []
+
+    def _recorder(tag):
+        async def _callback(event):
+            received.append((tag, event.name))
+        return _callback
+
+    async def _scenario():
+        bus = EventBus()
+        await bus.subscribe("state.changed", _recorder("exact"))
+        await bus.subscribe("node.*", _recorder("prefix"))
+        await bus.subscribe("*", _recorder("all"))
+        await bus.subscribe("task.?inished", _recorder("glob"))
+        await bus.subscribe("node.*", _recorder("other_channel"), channel="ui")
+        transient_id = await bus.subscribe("node.started", _recorder("transient"))
+
+        await bus.publish(Event(name="node.started"))
+        await bus.publish(Event(name="state.changed"))
+        await bus.publish(Event(name="task.finished"))
+        await bus.publish(Event(name="node.finished", channel="ui"))
+
+        assert await bus.unsubscribe(transient_id) is True
+        await bus.publish(Event(name="node.started"))
+
+    asyncio.run(_scenario())
+
+    assert sorted(received[:3]) == [("all", "node.started"), ("prefix", "node.started"), ("transient", "node.started")]
+    assert sorted(received[3:5]) == [("all", "state.changed"), ("exact", "state.changed")]
+    assert sorted(received[5:7]) == [("all", "task.finished"), ("glob", "task.finished")]
+    assert sorted(received[7:10]) == [
+        ("all", "node.finished"),
+        ("other_channel", "node.finished"),
+        ("prefix", "node.finished"),
+    ]
+    assert sorted(received[10:]) == [("all", "node.started"), ("prefix", "node.started")]
+
+
+class _FakeFileWatcher:
+    def __init__(self):
+        self.watches = {}
+        self.added = []
+
+    def add_watch(self, watch_id, path, events=None, recursive=False):
+        self.watches[watch_id] = (path, events, recursive)
+        self.added.append(watch_id)
+
+    def remove_watch(self, watch_id):
+        self.watches.pop(watch_id, None)
+
+
+class _DummySchedulerForTriggers:
+    def __init__(self, schedule_items):
+        self.fallback_lock = threading.RLock()
+        self.schedule_items = schedule_items
+        self.event_bus = EventBus()
+        self.file_watcher_service = _FakeFileWatcher()
+        self.enqueued = []
+        self.dispatch = self
+
+    async def enqueue_schedule_item(self, item, *, source, triggering_event=None):
+        self.enqueued.append(item["id"])
+        return True
+
+
+def test_trigger_index_matches_state_task_and_file_events_with_one_handler_each(tmp_path):
+    watched = tmp_path / "inbox"
+    (watched / "sub").mkdir(parents=True)
+    items = [
+        {"id": f"var{i}", "plan_name": "demo", "triggers": [{"type": "variable", "key": f"k{i}"}]}
+        for i in range(300)
+    ]
+    items += [
+        {"id": "hp_low", "plan_name": "demo",
+         "triggers": [{"type": "variable", "key": "hp", "value": 10, "operator": "eq"}]},
+        {"id": "after_login", "plan_name": "demo", "triggers": [{"type": "task", "task": "login"}]},
+        {"id": "png_any_depth", "plan_name": "demo",
+         "triggers": [{"type": "file", "path": str(watched), "pattern": "*.png", "recursive": True}]},
+        {"id": "sub_created", "plan_name": "demo",
+         "triggers": [{"type": "file", "path": str(watched / "sub"), "events": ["created"]}]},
+    ]
+    scheduler = _DummySchedulerForTriggers(items)
+    dispatcher = TaskDispatcher(scheduler)
+
+    async def _scenario():
+        await dispatcher.subscribe_event_triggers()
+        assert scheduler.event_bus.get_stats()["total_subscriptions"] == 3
+        bus = scheduler.event_bus
+        await bus.publish(Event(name="state.changed", payload={"key": "k42", "new_value": 1}))
+        await bus.publish(Event(name="state.changed", payload={"key": "hp", "new_value": 50}))
+        await bus.publish(Event(name="state.changed", payload={"key": "hp", "new_value": "10"}))
+        await bus.publish(Event(name="queue.completed", payload={"plan_name": "demo", "task_name": "login"}))
+        await bus.publish(Event(name="queue.completed", payload={"plan_name": "other", "task_name": "login"}))
+        watch_id = next(iter(scheduler.file_watcher_service.watches))
+        for path, event_type in ((watched / "sub" / "a.png", "created"), (watched / "b.txt", "modified"),
+                                 (watched / "sub" / "c.txt", "modified")):
+            await bus.publish(Event(name="file.changed", channel="file_watcher",
+                                    payload={"watch_id": watch_id, "path": str(path), "event_type": event_type}))
+
+        # Reload with one changed trigger: only that entry is replaced; subscriptions are not duplicated.
+        reloaded = [dict(item) for item in items if item["id"] != "var0"]
+        reloaded[0] = {**reloaded[0], "triggers": [{"type": "variable", "key": "renamed"}]}
+        scheduler.schedule_items = reloaded
+        stats = dispatcher.trigger_index.rebuild(reloaded, scheduler.file_watcher_service)
+        await dispatcher.subscribe_event_triggers()
+        assert scheduler.event_bus.get_stats()["total_subscriptions"] == 3
+        await bus.publish(Event(name="state.changed", payload={"key": "renamed", "new_value": 1}))
+        return stats
+
+    stats = asyncio.run(_scenario())
+    assert scheduler.enqueued[:3] == ["var42", "hp_low", "after_login"]
+    assert sorted(scheduler.enqueued[3:5]) == ["png_any_depth", "sub_created"]  # only the created .png in sub/
+    assert scheduler.enqueued[5:] == ["var1"]
+    # The sub-directory is covered by the recursive watch on its parent: one watch, added once.
+    assert len(scheduler.file_watcher_service.added) == 1
+    assert stats["added"] == 1 and stats["removed"] == 2 and stats["variable"] == 300
+
+
+def _queued(plan: str, cid: str, priority: int = 0) -> Tasklet:
+    return Tasklet(task_name=f"{plan}/task", cid=cid, payload={"plan_name": plan}, priority=priority)
+
+
+def test_task_queue_fair_shares_between_plans_and_honours_priority():
+    async def _scenario():
+        queue = TaskQueue(maxsize=100, plan_weights={"heavy": 2})
+        for i in range(4):
+            await queue.put(_queued("burst", f"b{i}"))
+        await queue.put(_queued("heavy", "h0"))
+        await queue.put(_queued("heavy", "h1"))
+        await queue.put(_queued("other", "o0"))
+        await queue.put(_queued("other", "urgent", priority=-1))
+
+        listed = [item["cid"] for item in await queue.list_all()]
+        drained = [(await queue.get()).cid for _ in range(queue.qsize())]
+        return listed, drained
+
+    listed, drained = asyncio.run(_scenario())
+
+    assert drained == listed
+    assert drained == ["urgent", "b0", "h0", "h1", "o0", "b1", "b2", "b3"]
+
+
+def test_task_queue_positional_ops_and_cancel_use_cid_index():
+    async def _scenario():
+        queue = TaskQueue(maxsize=100)
+        for i in range(5):
+            await queue.put(_queued("demo", f"t{i}"))
+
+        assert await queue.remove_by_cid("t2") is True
+        assert await queue.remove_by_cid("t2") is False
+        assert await queue.move_to_front("t4") is True
+        assert await queue.move_to_position("t0", 2) is True
+        await queue.insert_at(1, _queued("demo", "new"))
+        first_snapshot = await queue.list_all()
+        second_snapshot = await queue.list_all()
+        assert first_snapshot[0] is second_snapshot[0]
+
+        assert await queue.reorder(["t3"]) is True
+        assert await queue.update_priority("t1", -5) is True
+        return [item["cid"] for item in first_snapshot], [item["cid"] for item in await queue.list_all()]
+
+    before, after = asyncio.run(_scenario())
+
+    assert before == ["t4", "new", "t1", "t0", "t3"]
+    assert after == ["t3", "t4", "new", "t0", "t1"]
+
+
+def test_task_queue_cancelling_pinned_entries_is_lazy_and_keeps_positions():
+    async def _scenario():
+        queue = TaskQueue(maxsize=100)
+        for i in range(6):
+            await queue.put(_queued("demo", f"t{i}"))
+        await queue.reorder(["t5", "t4", "t3", "t2"])
+        pinned = queue._pinned
+        assert await queue.remove_by_cid("t4") is True
+        assert await queue.remove_by_cid("t2") is True
+        assert queue._pinned is pinned and len(pinned) == 4  # tombstones stay until popped or compacted
+        await queue.insert_at(1, _queued("demo", "new"))  # position counts live entries only
+        listed = [item["cid"] for item in await queue.list_all()]
+        popped = [(await queue.get()).cid for _ in range(len(listed))]
+        return listed, popped, len(queue._pinned)
+
+    listed, popped, pinned_left = asyncio.run(_scenario())
+
+    assert listed == popped == ["t5", "new", "t3", "t0", "t1"]
+    assert pinned_left == 0
+
+
+class _SlotTrackingManager(ExecutionManager):
+    def __init__(self, scheduler, release_events):
+        super().__init__(scheduler=scheduler, max_concurrent_tasks=1)
+        self.release_events = release_events
+        self.started_at = {}
+
+    async def submit(self, tasklet, is_interrupt_handler=False):
+        self.started_at[tasklet.cid] = time.perf_counter()
+        self.scheduler.running_tasks[tasklet.cid] = asyncio.current_task()
+        try:
+            await self.release_events[tasklet.cid].wait()
+        finally:
+            self.scheduler.running_tasks.pop(tasklet.cid, None)
+            self.notify_capacity_changed()
+
+
+def test_main_queue_consumer_starts_next_task_as_soon_as_slot_frees(monkeypatch):
+    monkeypatch.setattr(
+        dispatcher_module,
+        "get_config_value",
+        lambda key, default=None: 30.0 if key == "scheduler.dispatch.slot_recheck_sec" else default,
+    )
+
+    async def _scenario():
+        release_events = {"first": asyncio.Event(), "second": asyncio.Event()}
+        scheduler = SimpleNamespace(
+            fallback_lock=threading.RLock(),
+            running_tasks={},
+            _running_task_meta={},
+            task_queue=TaskQueue(maxsize=10),
+            event_bus=EventBus(),
+            _ensure_tasklet_identifiers=lambda tasklet, **_kwargs: tasklet,
+        )
+        scheduler.execution_manager = _SlotTrackingManager(scheduler, release_events)
+        await scheduler.task_queue.put(Tasklet(task_name="demo/a", cid="first"))
+        await scheduler.task_queue.put(Tasklet(task_name="demo/b", cid="second"))
+
+        consumer = asyncio.create_task(DispatchService(scheduler).consume_main_task_queue())
+        await asyncio.sleep(0.05)
+        assert "second" not in scheduler.execution_manager.started_at
+
+        released_at = time.perf_counter()
+        release_events["first"].set()
+        await asyncio.sleep(0.05)
+        started = scheduler.execution_manager.started_at.get("second")
+
+        release_events["second"].set()
+        consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+        return released_at, started
+
+    released_at, started = asyncio.run(_scenario())
+
+    assert started is not None
+    assert started - released_at < 0.05
+
+
+def test_run_store_group_commits_events_and_isolates_failed_ones(tmp_path):
+    store = RunStore(tmp_path / "runs.sqlite3", batch_max_events=64, batch_interval_ms=200, durability="off")
+    try:
+        store.apply_event("queue.enqueued", {"cid": "run-1", "plan_name": "demo"}, 1000)
+        store.apply_event("task.started", {"cid": "run-1", "start_time": 2.0}, 2000)
+        for index in range(20):
+            store.apply_event("node.finished", {"cid": "run-1", "node_id": f"n{index}", "status": "success"}, 2100)
+        store.apply_event("task.finished", {"cid": "run-1", "final_status": "success", "end_time": 3.0}, 3000)
+        # Illegal transition out of a terminal status: rejected without poisoning the batch.
+        store.apply_event("task.started", {"cid": "run-1"}, 3500)
+        store.apply_event("queue.enqueued", {"cid": "run-2", "plan_name": "demo"}, 3600)
+
+        assert store.flush(timeout=5.0) is True
+        assert store.stats["batches"] < 10
+        assert store.stats["applied"] == 24
+        assert store.stats["failed"] == 1
+
+        run = store.get_run("run-1")
+        assert run["status"] == "success"
+        assert run["started_at_ms"] == 2000
+        assert len(run["nodes"]) == 20
+        assert [r["cid"] for r in store.list_runs(status="queued")] == ["run-2"]
+    finally:
+        store.close()
+
+    reopened = RunStore(tmp_path / "runs.sqlite3", async_writes=False)
+    try:
+        assert reopened.get_run("run-2")["status"] == "queued"
+    finally:
+        reopened.close()
+
+
+def test_metrics_update_on_ingest_never_flushes_run_store(tmp_path, monkeypatch):
+    published = []
+
+    class _Bus:
+        async def publish(self, event):
+            published.append(event)
+
+    service = ObservabilityService(_Bus(), tmp_path)
+    service.persist_runs = True
+    service.run_store.close()
+    service.run_store = RunStore(tmp_path / "runs.sqlite3", batch_interval_ms=200, durability="off")
+    flushes = []
+    original_flush = service.run_store.flush
+    monkeypatch.setattr(service.run_store, "flush", lambda timeout=None: flushes.append(timeout) or original_flush(timeout))
+    try:
+        asyncio.run(service.ingest_event(Event(name="task.started", payload={"cid": "run-1", "plan_name": "demo"})))
+        assert flushes == []
+        assert published[-1].name == "metrics.update" and published[-1].payload["tasks_started"] == 1
+
+        assert service.get_metrics_snapshot()["tasks_started"] == 1  # query path waits for the writer
+        assert len(flushes) == 1
+    finally:
+        service.run_store.close()
+
+
+def test_ingest_event_is_not_blocked_by_a_run_timeline_query_waiting_on_run_store(tmp_path, monkeypatch):
+    class _Bus:
+        async def publish(self, event):
+            pass
+
+    service = ObservabilityService(_Bus(), tmp_path)
+    reading, release = threading.Event(), threading.Event()
+    original_get_run = service.run_store.get_run
+
+    def _slow_get_run(cid):
+        reading.set()
+        release.wait(timeout=5)
+        return original_get_run(cid)
+
+    monkeypatch.setattr(service.run_store, "get_run", _slow_get_run)
+    query = threading.Thread(target=service.get_run_timeline, args=("run-1",))
+    query.start()
+    try:
+        assert reading.wait(timeout=5)
+        start = time.monotonic()
+        asyncio.run(asyncio.wait_for(
+            service.ingest_event(Event(name="task.started", payload={"cid": "run-1", "plan_name": "demo"})),
+            timeout=2,
+        ))
+        assert time.monotonic() - start < 1.0  # the query holds no service lock while it reads the store
+        release.set()
+        query.join(timeout=5)
+        assert service.get_run_timeline("run-1")["status"] == "running"
+    finally:
+        release.set()
+        service.run_store.close()
+
+
+def test_run_store_overflow_keeps_lifecycle_events_without_blocking_up_to_a_cap(tmp_path):
+    store = RunStore(tmp_path / "runs.sqlite3", queue_maxsize=2, batch_interval_ms=0, durability="off")
+    committing, release = threading.Event(), threading.Event()
+    original_commit = store._commit_batch
+
+    def _slow_commit(batch):
+        committing.set()
+        release.wait(timeout=5)
+        original_commit(batch)
+
+    store._commit_batch = _slow_commit
+    try:
+        store.apply_event("queue.enqueued", {"cid": "run-0", "plan_name": "demo"}, 1000)
+        assert committing.wait(timeout=5)  # the writer is now stuck in its first commit
+        start = time.monotonic()
+        for index in range(1, 11):
+            store.apply_event("queue.enqueued", {"cid": f"run-{index}", "plan_name": "demo"}, 1000 + index)
+            store.apply_event("node.finished", {"cid": f"run-{index}", "node_id": "n"}, 1000 + index)
+        assert time.monotonic() - start < 1.0  # the writer is stuck, the caller is not
+        # run-1's two events fill the queue and run-2/run-3 fill the overflow; run-4..10 and the
+        # remaining node events are shed instead of growing the backlog.
+        assert store.stats["overflowed"] == 2 and len(store._overflow) == 2
+        assert store.stats["dropped"] == 7 + 9
+
+        release.set()
+        assert store.flush(timeout=5.0) is True
+        assert sorted(r["cid"] for r in store.list_runs(limit=20)) == [f"run-{i}" for i in range(4)]
+    finally:
+        release.set()
+        store.close()
+
+
+def test_task_definition_cache_is_shared_and_revalidated_by_file_identity(tmp_path, monkeypatch):
+    cache = TaskDefinitionCache(maxsize=8)
+    monkeypatch.setattr(task_loader_module, "_definition_cache", cache)
+    tasks_dir = tmp_path / "tasks"
+    tasks_dir.mkdir()
+    task_file = tasks_dir / "job.yaml"
+    task_file.write_text("steps:\n  a:\n    action: test.noop\n", encoding="utf-8")
+
+    registry_loader = TaskLoader("demo", tmp_path)
+    orchestrator_loader = TaskLoader("demo", tmp_path)
+
+    first = registry_loader.get_task_data("job")
+    second = orchestrator_loader.load_task_file(task_file)
+    assert second is first
+    assert cache.stats()["misses"] == 1
+    assert orchestrator_loader.get_cached_task_file(task_file) is first  # hit path: one stat, no parse
+
+    task_file.write_text("steps:\n  b:\n    action: test.noop\n", encoding="utf-8")
+    assert orchestrator_loader.get_cached_task_file(task_file) is None  # miss: caller loads off the loop
+    reloaded = orchestrator_loader.load_task_file(task_file)
+    assert list(reloaded["steps"]) == ["b"]
+    assert cache.stats()["misses"] == 2
+
+    task_file.write_text("steps: [\n", encoding="utf-8")
+    try:
+        orchestrator_loader.load_task_file(task_file)
+    except ValueError as exc:
+        assert "Failed to parse YAML" in str(exc)
+    else:  # pragma: no cover
+        raise AssertionError("broken task file should raise")
+    assert registry_loader.get_task_data("job") is None
+    assert registry_loader.get_task_load_errors()[0]["error_code"] == "yaml_parse_failed"
+    assert cache.stats()["misses"] == 3
+
+    TaskLoader.invalidate_all_caches()
+    assert cache.stats() == {"size": 0, "maxsize": 8, "version": 1, "hits": 4, "misses": 3}
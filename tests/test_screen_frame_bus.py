@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from plans.aura_base.src.services.frame_bus import (
+    FileFrameSource,
+    Frame,
+    FrameBus,
+    FrameSource,
+    RegionChangeDetector,
+    SyntheticFrameSource,
+    wait_for_frame_condition,
+)
+from plans.aura_base.src.services.screen_service import CaptureResult, ScreenService
+
+
+class _DictConfig:
+    def __init__(self, values):
+        self.values = dict(values)
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+def test_frame_bus_shares_fresh_frames_and_coalesces_concurrent_requests():
+    release = threading.Event()
+    calls = []
+
+    def _capture():
+        calls.append(threading.current_thread().name)
+        release.wait(timeout=5)
+        return Frame(image=np.zeros((4, 4, 3), dtype=np.uint8))
+
+    bus = FrameBus(_capture, freshness_ms=10_000)
+    results = []
+    workers = [threading.Thread(target=lambda: results.append(bus.get())) for _ in range(6)]
+    for worker in workers:
+        worker.start()
+    time.sleep(0.05)
+    release.set()
+    for worker in workers:
+        worker.join(timeout=5)
+
+    assert len(calls) == 1
+    assert len({id(frame) for frame in results}) == 1
+    frame = results[0]
+    assert frame.seq == 1 and not frame.image.flags.writeable
+    assert bus.get() is frame
+    assert bus.get(max_age_ms=0).seq == 2
+    assert bus.stats() == {"captures": 2, "shared": 1, "coalesced": 5, "failures": 0}
+
+    failing = FrameBus(lambda: CaptureResult(success=False, error_message="boom"))
+    assert failing.get().error_message == "boom"
+    assert failing.latest() is None and failing.stats()["failures"] == 1
+
+
+def test_screen_service_serves_crops_of_one_shared_synthetic_frame(tmp_path):
+    screen = ScreenService(_DictConfig({
+        "screen.capture.enabled_backends": ["synthetic"],
+        "screen.capture.synthetic.size": [320, 200],
+        "screen.capture.frame_bus.freshness_ms": 10_000,
+    }))
+    source = SyntheticFrameSource(320, 200, seed=3)
+    screen.set_frame_source(source)
+
+    async def _scenario():
+        return await asyncio.gather(
+            screen.capture_async(),
+            screen.capture_async(rect=(10, 20, 50, 40)),
+            screen.capture_async(rect=(300, 0, 50, 10)),
+        )
+
+    full, crop, out_of_bounds = asyncio.run(_scenario())
+    assert full.success and full.backend == "synthetic" and full.image.shape == (200, 320, 3)
+    assert crop.success and crop.relative_rect == (10, 20, 50, 40)
+    np.testing.assert_array_equal(crop.image, full.image[20:60, 10:60])
+    assert not out_of_bounds.success and "out of bounds" in out_of_bounds.error_message
+    assert screen.frame_bus_stats()["captures"] == 1
+    assert source.frame_index == 1
+
+    direct = asyncio.run(screen.capture_async(backend="synthetic"))
+    assert direct.success and direct.image.flags.writeable
+    screen.invalidate_frames()
+    assert asyncio.run(screen.capture_async()).image is not full.image
+    assert screen.frame_bus_stats()["captures"] == 2
+
+    frames_dir = tmp_path / "frames"
+    frames_dir.mkdir()
+    for index, value in enumerate((10, 200)):
+        assert cv2.imwrite(str(frames_dir / f"{index:03d}.png"), np.full((8, 8, 3), value, dtype=np.uint8))
+    replay = FileFrameSource(str(frames_dir))
+    assert [int(replay.grab()[0, 0, 0]) for _ in range(3)] == [10, 200, 10]
+    with pytest.raises(FileNotFoundError):
+        FileFrameSource(str(tmp_path / "missing.png"))
+    with pytest.raises(TypeError):
+        FrameSource()  # grab() is abstract
+
+
+def test_frame_condition_wait_skips_unchanged_frames_and_wakes_on_change():
+    idle = np.full((48, 64, 3), 30, dtype=np.uint8)
+    ready = idle.copy()
+    ready[10:16, 20:26] = 220  # a small icon appears
+    screen = {"image": idle}
+    bus = FrameBus(lambda: Frame(image=screen["image"].copy()), freshness_ms=0)
+
+    detector = RegionChangeDetector()
+    assert detector.check(idle) and not detector.check(idle.copy())
+    assert detector.check(ready) and not detector.check(ready)
+
+    probes = []
+    changed_at = {}
+
+    def _probe():
+        probes.append(time.monotonic())
+        return bool((bus.latest().image == 220).any())
+
+    def _change_screen():
+        time.sleep(0.4)
+        screen["image"] = ready
+        changed_at["t"] = time.monotonic()
+        bus.get()  # another consumer grabs the new frame and wakes the waiter
+
+    changer = threading.Thread(target=_change_screen)
+    changer.start()
+    result, ok = wait_for_frame_condition(
+        capture_fn=lambda: SimpleNamespace(success=True, image=bus.get().image),
+        probe=_probe,
+        is_done=bool,
+        timeout=5.0,
+        interval=2.0,
+        frame_bus=bus,
+        min_poll=0.01,
+    )
+    changer.join()
+
+    assert ok and result is True
+    assert len(probes) == 2  # the initial check and the one after the change
+    assert probes[-1] - changed_at["t"] < 0.2
+    assert bus.stats()["captures"] < 20  # backed off while the region was static
+
+    _, timed_out = wait_for_frame_condition(
+        capture_fn=lambda: SimpleNamespace(success=False, image=None),
+        probe=lambda: False,
+        is_done=bool,
+        timeout=0.05,
+        interval=0.01,
+    )
+    assert timed_out is False
+
+
+def test_frame_condition_wait_still_probes_every_interval_below_tolerance():
+    idle = np.full((64, 64, 3), 100, dtype=np.uint8)
+    enabled = idle.copy()
+    enabled[30, 30] = 101  # a faint change the thumbnail diff cannot see
+    detector = RegionChangeDetector(tolerance=2.0)
+    assert detector.check(idle) and not detector.check(enabled)
+    detector.reset()
+
+    screen = {"image": idle}
+    changed_at = {}
+
+    def _change_screen():
+        time.sleep(0.2)
+        screen["image"] = enabled
+        changed_at["t"] = time.monotonic()
+
+    changer = threading.Thread(target=_change_screen)
+    changer.start()
+    result, ok = wait_for_frame_condition(
+        capture_fn=lambda: SimpleNamespace(success=True, image=screen["image"]),
+        probe=lambda: bool(screen["image"][30, 30, 0] == 101),
+        is_done=bool,
+        timeout=3.0,
+        interval=0.3,
+        detector=detector,
+        min_poll=0.01,
+    )
+    changer.join()
+
+    assert ok and result is True
+    assert time.monotonic() - changed_at["t"] < 1.0
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+from packages.aura_core.context.persistence.strategy import DatabasePersistence
+from packages.aura_core.context.plan import PlanContext
+
+
+def test_sqlite_persistence_per_key_writes_group_commit_and_reopen(tmp_path):
+    db_path = tmp_path / "state" / "plans.db"
+    db = DatabasePersistence(f"sqlite:///{db_path}")
+    concurrent_commits = []
+
+    async def _scenario():
+        await db.set("alpha", "warmup", 0)
+        commits_before = db.stats()["commits"]
+        await asyncio.gather(*(db.set("alpha", f"k{i}", {"n": i, "名": "值"}) for i in range(200)))
+        concurrent_commits.append(db.stats()["commits"] - commits_before)
+        await db.set("beta", "k1", "other plan")
+        await db.delete("alpha", "warmup")
+        await db.delete("alpha", "missing")
+        assert await db.get("alpha", "k7") == {"n": 7, "名": "值"}
+        assert await db.get("alpha", "warmup", "gone") == "gone"
+
+        state = await db.load("alpha")
+        state["k0"] = "changed"
+        del state["k1"]
+        written_before = db.stats()["rows_written"]
+        await db.save("alpha", state)
+        assert db.stats()["rows_written"] - written_before == 1  # only the changed key is upserted
+        await db.clear("beta")
+        await db.close()
+        assert await db.get("alpha", "k0") == "changed"  # reopens after close()
+        await db.close()
+
+    asyncio.run(_scenario())
+    assert concurrent_commits[0] <= 2  # the 200 concurrent sets shared one or two transactions
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    async def _reopen():
+        reopened = DatabasePersistence(str(db_path))
+        try:
+            return await reopened.load("alpha"), await reopened.load("beta"), await reopened.keys("alpha")
+        finally:
+            await reopened.close()
+
+    alpha, beta, keys = asyncio.run(_reopen())
+    assert beta == {}
+    assert len(alpha) == 199 and alpha["k0"] == "changed" and "k1" not in alpha
+    assert sorted(keys) == sorted(alpha)
+
+    with pytest.raises(ValueError):
+        DatabasePersistence("postgresql://localhost/aura")
+
+
+def test_sqlite_persistence_migrates_json_file_once_and_backs_plan_context(tmp_path):
+    json_path = tmp_path / "plan_state.json"
+    json_path.write_text(json.dumps({"demo": {"count": 3, "nested": {"a": [1, 2]}}, "other": {"x": 1}}),
+                         encoding="utf-8")
+    db_path = tmp_path / "plan_state.db"
+
+    async def _scenario():
+        db = DatabasePersistence(str(db_path), migrate_from=str(json_path))
+        ctx = PlanContext("demo", {}, persistence_strategy=db)
+        await ctx.initialize()
+        assert await ctx.state.get("count") == 3
+        await ctx.state.set("count", 4)
+        await ctx.state.delete("nested")
+        await db.close()
+
+        # The database is no longer empty, so the JSON file is not imported again.
+        json_path.write_text(json.dumps({"demo": {"count": 100}}), encoding="utf-8")
+        again = DatabasePersistence(str(db_path), migrate_from=str(json_path))
+        try:
+            return await again.load("demo"), await again.get("other", "x"), await again.import_json(str(json_path))
+        finally:
+            await again.close()
+
+    demo, other_x, imported = asyncio.run(_scenario())
+    assert demo == {"count": 4}
+    assert other_x == 1
+    assert imported == 0  # existing keys are kept unless overwrite=True
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+
+from packages.aura_core.context.persistence.store_service import StateStoreService
+
+
+class _FakeConfig:
+    def __init__(self, values):
+        self._values = values
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+
+def _store(path, **wal):
+    return StateStoreService(_FakeConfig({"state_store": {"type": "file", "path": str(path), "wal": wal}}))
+
+
+def _reload(path):
+    async def _read():
+        store = _store(path)
+        return await store.get_all_data()
+
+    return asyncio.run(_read())
+
+
+def test_wal_group_commits_and_recovers_exact_state(tmp_path):
+    path = tmp_path / "state" / "project_state.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps({"legacy": 1, "gone": True}), encoding="utf-8")
+    store = _store(path, compact_threshold=10_000)
+    concurrent_commits = []
+
+    async def _scenario():
+        await store.initialize()
+        await asyncio.gather(*(store.set(f"k{i}", {"n": i, "名": "值"}) for i in range(200)))
+        concurrent_commits.append(store.get_persistence_stats()["commits"])
+        for i in range(50):
+            await store.set("counter", i)
+        await store.delete("gone")
+        await store.delete("missing")
+        return await store.get_all_data()
+
+    expected = asyncio.run(_scenario())
+    stats = store.get_persistence_stats()
+    assert stats["mode"] == "wal" and stats["records"] == 251
+    assert concurrent_commits[0] <= 2  # the 200 concurrent sets shared one or two writes
+    assert json.loads(path.read_text(encoding="utf-8")) == {"legacy": 1, "gone": True}  # snapshot untouched
+    assert _reload(path) == expected and expected["counter"] == 49 and "gone" not in expected
+
+
+def test_wal_compaction_and_torn_tail_recovery(tmp_path):
+    path = tmp_path / "project_state.json"
+    store = _store(path, compact_threshold=20)
+
+    async def _scenario():
+        for i in range(45):
+            await store.set(f"k{i % 7}", i)
+        await store.delete("k0")
+        await store.compact()
+        await store.set("after", [1, 2])
+        return await store.get_all_data()
+
+    expected = asyncio.run(_scenario())
+    assert store.get_persistence_stats()["compactions"] >= 2
+    assert not os.path.exists(f"{path}.wal.old")
+    snapshot = json.loads(path.read_text(encoding="utf-8"))
+    assert snapshot == {k: v for k, v in expected.items() if k != "after"}
+    assert _reload(path) == expected
+
+    with open(f"{path}.wal", "a", encoding="utf-8") as f:
+        f.write('{"op":"set","k":"torn","v":')  # crash mid-append
+    assert _reload(path) == expected
+
+    async def _append_after_crash():
+        reopened = _store(path)
+        await reopened.set("next", 1)
+
+    asyncio.run(_append_after_crash())
+    assert _reload(path) == {**expected, "next": 1}
+
+    os.replace(f"{path}.wal", f"{path}.wal.old")  # crash between log rotation and snapshot write
+    assert _reload(path) == {**expected, "next": 1}
+    assert not os.path.exists(f"{path}.wal.old")
+
+
+def test_read_view_is_versioned_snapshot_without_copying(tmp_path):
+    from packages.aura_core.config.template import TemplateRenderer
+    from packages.aura_core.context.execution import ExecutionContext
+
+    store = _store(tmp_path / "project_state.json")
+
+    async def _scenario():
+        await store.set("hp", 100)
+        await store.set("items", ["sword"])
+        view = await store.get_read_view()
+        assert await store.get_read_view() is view  # unchanged version -> same view
+
+        await store.set("hp", 80)
+        await store.set("hp", 60)
+        await store.delete("items")
+        await store.set("mp", 5)
+        newer = await store.get_read_view()
+        await store.set("mp", 7)
+
+        assert dict(view) == {"hp": 100, "items": ["sword"]}
+        assert "mp" not in view and view.get("mp", "-") == "-"
+        assert dict(newer) == {"hp": 60, "mp": 5} and len(newer) == 2
+        current = await store.get_read_view()
+        assert current is not newer and current["mp"] == 7
+        assert store.get_version() > 0
+
+        renderer = TemplateRenderer(ExecutionContext(), store)
+        rendered = await renderer.render({"text": "{{ state.hp }}/{{ state.mp }}", "n": "{{ state | length }}"})
+        return rendered
+
+    assert asyncio.run(_scenario()) == {"text": "60/7", "n": 2}
+
+
+def test_state_renders_like_a_dict_in_templates(tmp_path):
+    from packages.aura_core.config.template import TemplateRenderer
+    from packages.aura_core.context.execution import ExecutionContext
+
+    store = _store(tmp_path / "project_state.json")
+
+    async def _scenario():
+        await store.set("hp", 100)
+        await store.set("items", ["sword"])
+        renderer = TemplateRenderer(ExecutionContext(), store)
+        return await renderer.render({
+            "whole": "{{ state }}",
+            "json": "{{ state | tojson }}",
+            "attr": "{{ state._store is defined }}",
+            "item": "{{ state['_store'] is defined }}",
+            "data": "{{ state._data is defined }}",
+            "get": "{{ state.get('hp') }}",
+        })
+
+    rendered = asyncio.run(_scenario())
+    assert type(rendered["whole"]) is dict and rendered["whole"] == {"hp": 100, "items": ["sword"]}
+    assert rendered["json"] == {"hp": 100, "items": ["sword"]}  # NativeEnvironment parses the JSON back
+    assert rendered["attr"] is rendered["item"] is rendered["data"] is False  # undefined, as with a plain dict
+    assert rendered["get"] == 100
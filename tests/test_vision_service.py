@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+
+import cv2
+import numpy as np
+
+from plans.aura_base.src.services import vision_service as vision_module
+from plans.aura_base.src.services.vision_service import VisionService, extract_match_candidates, nms_boxes
+
+
+def _write_png(path, value: int, size=(12, 16)) -> None:
+    image = np.full((size[0], size[1], 3), value, dtype=np.uint8)
+    image[2:6, 3:9] = 255 - value
+    assert cv2.imwrite(str(path), image)
+
+
+def _bump_mtime(path, seconds: int = 5) -> None:
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def test_prepared_templates_are_cached_by_path_and_mtime(tmp_path):
+    vision = VisionService()
+    template = tmp_path / "button.png"
+    _write_png(template, 40)
+
+    gray = vision._prepare_image(str(template), use_grayscale=True)
+    assert vision._prepare_image(str(template), use_grayscale=True) is gray
+    color = vision._prepare_image(str(template), use_grayscale=False)
+    assert color.ndim == 3 and gray.ndim == 2
+    assert not gray.flags.writeable
+    assert vision.template_cache.stats()["hits"] == 1
+
+    _write_png(template, 200)
+    _bump_mtime(template)
+    reloaded = vision._prepare_image(str(template), use_grayscale=True)
+    assert reloaded is not gray
+    assert int(reloaded[0, 0]) == 200
+
+    source = np.zeros((40, 40, 3), dtype=np.uint8)
+    source[10:22, 5:21] = cv2.cvtColor(cv2.imread(str(template)), cv2.COLOR_BGR2RGB)
+    result = vision._match_template_prepared(
+        vision._prepare_image(source), reloaded, None, 0.9, cv2.TM_CCOEFF_NORMED, True, "none"
+    )
+    assert result.found and result.top_left == (5, 10)
+
+
+def test_template_library_index_refreshes_when_directory_changes(tmp_path):
+    vision = VisionService()
+    library_root = tmp_path / "icons"
+    (library_root / "nested").mkdir(parents=True)
+    _write_png(library_root / "a.png", 10)
+    _write_png(library_root / "nested" / "b.png", 20)
+    (library_root / "notes.txt").write_text("not an image", encoding="utf-8")
+
+    vision.register_template_library("demo", "icons", library_root, recursive=True)
+    expected = [library_root / "a.png", library_root / "nested" / "b.png"]
+    assert vision.expand_templates("demo", "@icons", tmp_path) == expected
+    assert vision.expand_templates("demo", "@icons/*.png", tmp_path) == [library_root / "a.png"]
+    assert len(vision._template_index) == 2
+
+    _write_png(library_root / "nested" / "c.png", 30)
+    _bump_mtime(library_root / "nested")
+    assert vision.expand_templates("demo", "@icons", tmp_path) == expected + [library_root / "nested" / "c.png"]
+    assert vision.expand_templates("demo", "@icons/*.png", tmp_path) == [library_root / "a.png"]
+
+
+def test_async_find_runs_whole_pipeline_on_vision_pool(tmp_path):
+    vision = VisionService()
+    template = tmp_path / "icon.png"
+    _write_png(template, 60)
+    source = np.zeros((48, 64, 3), dtype=np.uint8)
+    source[20:32, 30:46] = cv2.cvtColor(cv2.imread(str(template)), cv2.COLOR_BGR2RGB)
+
+    prepare_threads = []
+    original_prepare = vision._prepare_image
+
+    def _tracking_prepare(*args, **kwargs):
+        prepare_threads.append(threading.current_thread().name)
+        return original_prepare(*args, **kwargs)
+
+    vision._prepare_image = _tracking_prepare
+
+    async def _scenario():
+        loop_thread = threading.current_thread().name
+        single = await vision.find_template_async(source, str(template), threshold=0.9)
+        batch = await vision.find_templates_batch_async(source, [str(template), str(template)], threshold=0.9)
+        return loop_thread, single, batch
+
+    try:
+        loop_thread, single, batch = asyncio.run(_scenario())
+    finally:
+        vision.shutdown()
+
+    assert single.found and single.top_left == (30, 20)
+    assert [r.top_left for r in batch] == [(30, 20), (30, 20)]
+    assert prepare_threads and loop_thread not in prepare_threads
+    assert all(name.startswith("aura-vision") for name in prepare_threads)
+    assert set(single.debug_info["timings_ms"]) == {"prepare", "match", "postprocess"}
+    stats = vision.get_pipeline_stats()
+    assert stats["match"]["count"] == 3
+    assert stats["prepare"]["count"] == 4  # one single run, one shared batch source, two batch templates
+
+
+def _distinct_template(seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(10, 14, 3), dtype=np.uint8)
+
+
+def test_batch_matching_is_parallel_deterministic_and_exits_early():
+    vision = VisionService()
+    templates = [_distinct_template(seed) for seed in range(8)]
+    source = np.zeros((80, 120, 3), dtype=np.uint8)
+    source[5:15, 7:21] = templates[2]
+    source[40:50, 60:74] = templates[5]
+
+    async def _scenario():
+        full = await vision.find_templates_batch_async(source, templates, threshold=0.95)
+        first = await vision.find_templates_batch_async(source, templates, threshold=0.95, early_exit="first")
+        best = await vision.find_templates_batch_async(
+            source, templates, threshold=0.5, early_exit="best", early_exit_confidence=0.99
+        )
+        return full, first, best
+
+    try:
+        full, first, best = asyncio.run(_scenario())
+    finally:
+        vision.shutdown()
+
+    assert [r.found for r in full] == [False, False, True, False, False, True, False, False]
+    assert full[2].top_left == (7, 5) and full[5].top_left == (60, 40)
+
+    assert [r.found for r in first[:3]] == [False, False, True]
+    assert "skipped" not in first[0].debug_info
+    assert all(r.debug_info.get("skipped") for r in first[3:])
+    assert [bool(r.debug_info.get("skipped")) for r in best] == [False] * 3 + [True] * 5
+
+
+def _textured_frame(height: int, width: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 256, size=(height, width), dtype=np.uint8)
+    return cv2.GaussianBlur(noise, (0, 0), 3)
+
+
+def test_pyramid_search_matches_exhaustive_and_starts_from_hints():
+    vision = VisionService()
+    frame = cv2.normalize(_textured_frame(240, 320, 3), None, 0, 255, cv2.NORM_MINMAX)
+    template = frame[130:170, 201:249].copy()
+    exhaustive = vision._match_template_prepared(frame, template, None, 0.9, cv2.TM_CCOEFF_NORMED, True, "none")
+
+    cold = vision._match_template_pyramid(
+        frame, template, None, 0.9, cv2.TM_CCOEFF_NORMED, True, "none", template_key="icon"
+    )
+    assert cold.found and cold.top_left == exhaustive.top_left == (201, 130)
+    assert cold.debug_info["search_stage"] == "pyramid" and cold.debug_info["pyramid_scale"] == 2
+
+    warm = vision._match_template_pyramid(
+        frame, template, None, 0.9, cv2.TM_CCOEFF_NORMED, True, "none", template_key="icon"
+    )
+    assert warm.top_left == (201, 130) and warm.debug_info["search_stage"] == "last_hit"
+
+    vision.forget_last_hits("icon")
+    hinted = vision._match_template_pyramid(
+        frame, template, None, 0.9, cv2.TM_CCOEFF_NORMED, True, "none", roi=(190, 120, 80, 60), template_key="icon"
+    )
+    assert hinted.top_left == (201, 130) and hinted.debug_info["search_stage"] == "roi"
+
+    # A stale last hit falls through to the coarse search instead of failing.
+    moved = np.roll(frame, (-60, -100), axis=(0, 1))
+    relocated = vision._match_template_pyramid(
+        moved, template, None, 0.9, cv2.TM_CCOEFF_NORMED, True, "none", template_key="icon"
+    )
+    assert relocated.top_left == (101, 70) and relocated.debug_info["search_stage"] == "pyramid"
+
+    source = np.zeros((240, 320), dtype=np.uint8)
+    for x, y in [(10, 20), (150, 30), (60, 170)]:
+        source[y:y + 40, x:x + 48] = template
+    expected = vision._match_all_templates_prepared(
+        source, template, None, 0.9, 0.3, cv2.TM_CCOEFF_NORMED, True, "none"
+    )
+    pyramid_all = vision._match_all_templates_pyramid(
+        source, template, None, 0.9, 0.3, cv2.TM_CCOEFF_NORMED, True, "none"
+    )
+    assert sorted(m.top_left for m in pyramid_all) == sorted(m.top_left for m in expected)
+    assert sorted(m.top_left for m in pyramid_all) == [(10, 20), (60, 170), (150, 30)]
+
+
+def test_vectorized_candidates_and_nms_keep_one_match_per_grid_cell():
+    score_map = np.zeros((20, 30), dtype=np.float32)
+    score_map[5, 5], score_map[5, 6], score_map[6, 5] = 0.95, 0.9, 0.85  # one peak with shoulders
+    score_map[12, 20] = 0.8
+    score_map[2, 25] = 0.7
+
+    xs, ys, scores = extract_match_candidates(score_map, 0.6)
+    assert list(zip(xs.tolist(), ys.tolist())) == [(5, 5), (20, 12), (25, 2)]
+    assert scores.tolist() == sorted(scores.tolist(), reverse=True)
+    xs, ys, _ = extract_match_candidates(score_map, 0.6, min_distance=0, top_k=2)
+    assert list(zip(xs.tolist(), ys.tolist())) == [(5, 5), (6, 5)]
+
+    boxes = np.array([[0, 0, 10, 10], [1, 1, 11, 11], [20, 20, 30, 30], [5, 0, 15, 10]])
+    assert nms_boxes(boxes, np.array([0.9, 0.95, 0.5, 0.8]), 0.5).tolist() == [1, 3, 2]
+    assert nms_boxes(boxes, np.array([0.9, 0.95, 0.5, 0.8]), 0.5, top_k=1).tolist() == [1]
+    assert nms_boxes(np.empty((0, 4)), np.empty(0), 0.5).size == 0
+
+    vision = VisionService()
+    icon = cv2.normalize(_textured_frame(24, 24, 5), None, 0, 255, cv2.NORM_MINMAX)
+    grid = np.tile(icon, (5, 8))
+    matches = vision._match_all_templates_prepared(
+        grid, icon[2:22, 2:22], None, 0.9, 0.3, cv2.TM_CCOEFF_NORMED, True, "none"
+    )
+    assert sorted(m.top_left for m in matches) == sorted(
+        (col * 24 + 2, row * 24 + 2) for row in range(5) for col in range(8)
+    )
+
+
+def test_vision_pool_size_is_read_from_config(monkeypatch):
+    monkeypatch.setattr(
+        vision_module, "get_config_value",
+        lambda key, default=None: 3 if key == "vision.workers" else default,
+    )
+    vision = VisionService()
+    try:
+        assert vision._get_vision_executor()._max_workers == 3
+    finally:
+        vision.shutdown()
+
+    monkeypatch.setattr(vision_module, "get_config_value", lambda key, default=None: default)
+    fallback = VisionService()
+    try:
+        assert fallback._get_vision_executor()._max_workers == VisionService.VISION_WORKERS
+    finally:
+        fallback.shutdown()